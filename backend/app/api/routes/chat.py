@@ -3,6 +3,7 @@ import subprocess
 
 from fastapi import APIRouter, HTTPException
 
+from app.core.timing import json_response
 from app.schemas.chat import ChatRequest, ChatResponse
 from app.services.chat import handle_chat_message
 from app.services.claude import ClaudeError
@@ -15,7 +16,9 @@ logger = logging.getLogger(__name__)
 async def chat(request: ChatRequest):
     """Send a message to the AI chat with video knowledge context."""
     try:
-        return handle_chat_message(request.message, request.conversation_id)
+        response = handle_chat_message(
+            request.message, request.conversation_id, filters=request.filters
+        )
     except ClaudeError as e:
         logger.error(f"Claude error in chat: {e}")
         raise HTTPException(status_code=500, detail="AI service temporarily unavailable")
@@ -25,3 +28,4 @@ async def chat(request: ChatRequest):
     except Exception as e:
         logger.error(f"Unexpected error in chat: {e}")
         raise HTTPException(status_code=500, detail="AI service temporarily unavailable")
+    return json_response(response)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.core.metrics import snapshot
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def get_metrics():
+    """Report in-process metrics such as cache hit/miss counters."""
+    return snapshot()
@@ -1,10 +1,28 @@
 import logging
+from datetime import date
+from typing import Literal
 
 from fastapi import APIRouter, HTTPException, Query
 from opensearchpy import ConnectionError as OSConnectionError
+from pydantic import ValidationError
 
-from app.schemas.search import SearchResponse
-from app.services.search import search as search_service
+from app.core.timing import json_response
+from app.schemas.search import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    SearchFilters,
+    SearchPageResponse,
+    SearchResponse,
+    SuggestResponse,
+)
+from app.services.search import search_async as search_service
+from app.services.search import search_batch as search_batch_service
+from app.services.search_pagination import (
+    CursorExpiredError,
+    InvalidCursorError,
+)
+from app.services.search_pagination import search_page as search_page_service
+from app.services.suggest import suggest as suggest_service
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +30,96 @@ router = APIRouter(prefix="/search", tags=["search"])
 
 
 @router.get("", response_model=SearchResponse)
-def search(
+async def search(
     q: str = Query("", description="Search query"),
     limit: int = Query(10, ge=1, le=50),
+    video_id: list[str] | None = Query(None, description="Restrict to these videos"),
+    speaker: list[str] | None = Query(None, description="Restrict to these speakers"),
+    date_from: date | None = Query(None, description="Earliest recording date"),
+    date_to: date | None = Query(None, description="Latest recording date"),
+    per_video: int | None = Query(None, ge=1, le=10, description="Max results per video"),
+    facets: bool = Query(False, description="Include video/speaker/date match counts"),
 ):
     """Search indexed video segments with hybrid BM25 + semantic search."""
     if not q or not q.strip():
         return SearchResponse(count=0, results=[])
 
     try:
-        return search_service(q, limit=limit)
+        filters = SearchFilters(
+            video_ids=video_id, speakers=speaker, date_from=date_from, date_to=date_to
+        )
+    except ValidationError:
+        raise HTTPException(status_code=422, detail="date_from must not be after date_to")
+
+    try:
+        response = await search_service(
+            q, limit=limit, filters=filters, per_video=per_video, facets=facets
+        )
+    except OSConnectionError:
+        raise HTTPException(status_code=503, detail="Search service unavailable")
+    return json_response(response)
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query("", description="Partial query typed so far"),
+    limit: int = Query(5, ge=1, le=20),
+):
+    """Complete a partial query from video titles, speakers and frequent phrases.
+
+    Uses the completion suggester only (no embedding), for per-keystroke use.
+    """
+    if not q or not q.strip():
+        return SuggestResponse()
+
+    try:
+        suggestions = await suggest_service(q, limit=limit)
+    except OSConnectionError:
+        raise HTTPException(status_code=503, detail="Search service unavailable")
+    return SuggestResponse(suggestions=suggestions)
+
+
+@router.post("/batch", response_model=BatchSearchResponse)
+def search_batch(request: BatchSearchRequest):
+    """Run several hybrid searches in one call (one embedding batch, one _msearch)."""
+    try:
+        responses = search_batch_service(
+            request.queries, limit=request.limit, filters=request.filters
+        )
+    except OSConnectionError:
+        raise HTTPException(status_code=503, detail="Search service unavailable")
+    return BatchSearchResponse(responses=responses)
+
+
+@router.get("/page", response_model=SearchPageResponse)
+def search_page(
+    q: str = Query("", description="Search query"),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    mode: Literal["hybrid", "keyword"] = Query("hybrid"),
+    video_id: list[str] | None = Query(None, description="Restrict to these videos"),
+    speaker: list[str] | None = Query(None, description="Restrict to these speakers"),
+    date_from: date | None = Query(None, description="Earliest recording date"),
+    date_to: date | None = Query(None, description="Latest recording date"),
+):
+    """Page through search results with a stable cursor."""
+    if not q or not q.strip():
+        return SearchPageResponse(count=0, results=[])
+
+    try:
+        filters = SearchFilters(
+            video_ids=video_id, speakers=speaker, date_from=date_from, date_to=date_to
+        )
+    except ValidationError:
+        raise HTTPException(status_code=422, detail="date_from must not be after date_to")
+
+    try:
+        return search_page_service(
+            q, limit=limit, cursor=cursor, filters=filters, mode=mode
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CursorExpiredError:
+        raise HTTPException(status_code=410, detail="Search cursor has expired")
     except OSConnectionError:
         raise HTTPException(status_code=503, detail="Search service unavailable")
@@ -11,11 +11,68 @@ class Settings(BaseSettings):
 
     # OpenSearch
     OPENSEARCH_URL: str = "http://opensearch:9200"
+    OPENSEARCH_POOL_MAXSIZE: int = 20  # Connections kept alive per host
+    OPENSEARCH_TIMEOUT: float = 10.0  # Seconds per request
+    OPENSEARCH_MAX_RETRIES: int = 2
+    SEGMENTS_VECTOR_PROFILE: str = "float32"  # "float32" or "byte" (int8 + exact rescoring)
+    SEARCH_RESCORE_OVERSAMPLE: int = 4  # byte profile: kNN candidates fetched per result for rescoring
+
+    # Hybrid ranking
+    SEARCH_CANDIDATE_K: int = 50  # Hits fetched per leg before fusion (at least limit)
+    SEARCH_RRF_K: int = 60
+    SEARCH_BM25_WEIGHT: float = 1.0
+    SEARCH_KNN_WEIGHT: float = 1.0
+    SEARCH_FACET_SIZE: int = 20  # Buckets returned per terms facet
+    SEARCH_HIGHLIGHT_FRAGMENTS: int = 2  # ~200-char highlight fragments per hit; 0 marks up the whole text
+    SUGGEST_PHRASES_PER_VIDEO: int = 20  # Frequent phrases added to the completion field per video
+
+    # Cursor pagination
+    SEARCH_PIT_KEEP_ALIVE: str = "2m"  # Point-in-time lifetime, renewed on each page
+    SEARCH_PAGE_WINDOW: int = 200  # Fused candidates per leg reachable by hybrid paging
+
+    # Async search path
+    SEARCH_EMBEDDING_WORKERS: int = 16  # Threads running query embedding off the event loop; mostly waiting on the batcher
+
+    # Local memory-mapped vector index, shared by the API and worker
+    LOCAL_VECTOR_INDEX_PATH: str = ""  # Directory of per-video shards; empty disables
+    LOCAL_VECTOR_INDEX_DTYPE: str = "float32"  # "float32" or "int8"
+    LOCAL_VECTOR_INDEX_SERVE_KNN: bool = False  # Serve the kNN leg locally, not only when OpenSearch is down
+
+    # Cross-encoder reranking of fused results
+    RERANK_MODEL: str = ""  # e.g. cross-encoder/ms-marco-MiniLM-L-6-v2; empty disables
+    RERANK_TOP_N: int = 20  # Fused results scored by the cross-encoder
+    RERANK_BUDGET_MS: float = 150.0  # Skip reranking when the expected batch time exceeds this
+    RERANK_CACHE_SIZE: int = 8192  # (query, segment) scores kept in process
+
+    # Chat context
+    CHAT_CONTEXT_WINDOW: int = 0  # Neighbouring segments added on each side of a hit; 0 disables
+
+    # Instrumentation
+    SLOW_QUERY_LOG_MS: float = 1000.0  # Log search/chat calls slower than this with stage timings; 0 disables
 
     # Redis / Celery
     REDIS_URL: str = "redis://redis:6379/0"
     CELERY_BROKER_URL: str = "redis://redis:6379/0"
 
+    # Query embedding cache
+    QUERY_EMBEDDING_CACHE_SIZE: int = 2048
+    QUERY_EMBEDDING_CACHE_TTL: float = 3600.0  # Seconds; 0 disables expiry
+    QUERY_EMBEDDING_CACHE_REDIS: bool = False  # Share cached vectors across API replicas
+    QUERY_EMBEDDING_BATCH_SIZE: int = 32  # Cache misses encoded together by the micro-batcher; 1 disables
+    QUERY_EMBEDDING_BATCH_WINDOW_MS: float = 2.0  # How long the batcher waits for more queries
+
+    # Embedding model runtime, set per process (e.g. onnx-int8 on the API, torch on workers)
+    EMBEDDING_BACKEND: str = "torch"  # torch, onnx or onnx-int8
+    EMBEDDING_ONNX_DIR: str = "/root/.cache/onnx"  # Exported ONNX models (model_cache volume)
+
+    # Persistent document embedding store shared by chunking and indexing workers
+    EMBEDDING_STORE_PATH: str = ""  # SQLite file, e.g. /data/embeddings/store.db; empty disables
+    EMBEDDING_STORE_MAX_ENTRIES: int = 500_000  # ~1.5 GB of 768-d float32 vectors
+
+    # Search result cache, invalidated by the index generation counter
+    SEARCH_CACHE_SIZE: int = 1024  # 0 disables the cache
+    SEARCH_CACHE_TTL: float = 600.0  # Seconds; upper bound on staleness if a bump is lost
+
     # Storage paths
     VIDEO_STORAGE_PATH: str = "/data/videos"
     TRANSCRIPT_STORAGE_PATH: str = "/data/transcripts"
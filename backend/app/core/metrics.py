@@ -0,0 +1,62 @@
+import bisect
+import logging
+import threading
+from collections.abc import Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Named callables returning a dict of current values, e.g. cache counters
+_collectors: dict[str, Callable[[], dict]] = {}
+_lock = threading.Lock()
+
+
+def register_collector(name: str, collector: Callable[[], dict]) -> None:
+    """Register a callable whose output is reported under name."""
+    with _lock:
+        _collectors[name] = collector
+
+
+def snapshot() -> dict:
+    """Collect the current value of every registered metric."""
+    with _lock:
+        collectors = dict(_collectors)
+
+    result = {}
+    for name, collector in sorted(collectors.items()):
+        try:
+            result[name] = collector()
+        except Exception as exc:
+            logger.warning("Metrics collector %s failed: %s", name, exc)
+            result[name] = {"error": str(exc)}
+    return result
+
+
+# Upper bounds (ms) of latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Thread-safe histogram with cumulative buckets, Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def stats(self) -> dict:
+        """Return count, sum and cumulative bucket counts keyed by upper bound."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            running += count
+            cumulative[bound] = running
+        return {"count": running, "sum": round(total, 3), "buckets": cumulative}
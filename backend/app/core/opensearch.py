@@ -1,12 +1,31 @@
+import base64
+import copy
 import logging
+import threading
 
+import numpy as np
 from opensearchpy import OpenSearch
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-SEGMENTS_INDEX = "segments_index"
+# Readers and writers address segments through this alias; it points at
+# one versioned physical index (segments_v1, segments_v2, ...) so mapping
+# changes can be rolled out by reindexing and swapping the alias.
+SEGMENTS_INDEX = "segments"
+SEGMENTS_INDEX_PREFIX = "segments_v"
+
+# Concrete index used before the alias existed; adopted as-is on startup
+LEGACY_SEGMENTS_INDEX = "segments_index"
+
+# Completion field backing search-as-you-type suggestions
+SUGGEST_FIELD = "suggest"
+SUGGEST_MAPPING = {
+    "type": "completion",
+    "analyzer": "simple",
+    "max_input_length": 50,
+}
 
 SEGMENTS_INDEX_BODY = {
     "settings": {
@@ -22,7 +41,8 @@ SEGMENTS_INDEX_BODY = {
             "video_id": {"type": "keyword"},
             "video_title": {"type": "text"},
             "transcript_id": {"type": "keyword"},
-            "text": {"type": "text", "analyzer": "english"},
+            # Offsets let the unified highlighter skip re-analyzing text
+            "text": {"type": "text", "analyzer": "english", "index_options": "offsets"},
             "embedding": {
                 "type": "knn_vector",
                 "dimension": 768,
@@ -41,35 +61,248 @@ SEGMENTS_INDEX_BODY = {
             "speaker": {"type": "keyword"},
             "recording_date": {"type": "date"},
             "created_at": {"type": "date"},
+            SUGGEST_FIELD: SUGGEST_MAPPING,
         }
     },
 }
 
+# Vector storage profiles for the embedding field:
+#   float32 - full-precision HNSW vectors (SEGMENTS_INDEX_BODY as is)
+#   byte    - int8-quantized HNSW vectors (4x less vector memory) plus the
+#             full-precision vector as a compact binary field with doc
+#             values, which a rescore script reads to rank oversampled
+#             kNN candidates exactly on the server
+VECTOR_PROFILES = ("float32", "byte")
 
-def get_opensearch_client() -> OpenSearch:
-    """Create and return an OpenSearch client."""
-    # Parse URL to extract host and port
-    url = settings.OPENSEARCH_URL
+# Binary (base64 float32) copy of the embedding kept by the byte profile
+EMBEDDING_F32_FIELD = "embedding_f32"
+
+
+def build_segments_index_body(profile: str = "float32") -> dict:
+    """Return the segments index body for a vector storage profile."""
+    if profile not in VECTOR_PROFILES:
+        raise ValueError(f"Unknown vector profile: {profile}")
+
+    body = copy.deepcopy(SEGMENTS_INDEX_BODY)
+    if profile == "byte":
+        props = body["mappings"]["properties"]
+        props["embedding"]["data_type"] = "byte"
+        props[EMBEDDING_F32_FIELD] = {"type": "binary", "doc_values": True}
+    return body
+
+
+def segments_index_body() -> dict:
+    """Index body for the configured SEGMENTS_VECTOR_PROFILE."""
+    return build_segments_index_body(settings.SEGMENTS_VECTOR_PROFILE)
+
+
+def quantize_int8(embedding) -> list[int]:
+    """Scale a unit-norm vector to signed bytes for a byte knn_vector."""
+    vec = np.asarray(embedding, dtype=np.float32)
+    return np.clip(np.rint(vec * 127.0), -127, 127).astype(np.int8).tolist()
+
+
+def encode_f32(embedding) -> str:
+    """Pack a vector as base64 float32 bytes for the binary field."""
+    return base64.b64encode(np.asarray(embedding, dtype=np.float32).tobytes()).decode()
+
+
+def decode_f32(value: str) -> np.ndarray:
+    """Unpack a vector stored by encode_f32."""
+    return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+
+
+def vector_fields(embedding, profile: str | None = None) -> dict:
+    """Document fields holding an embedding under the given vector profile."""
+    profile = profile or settings.SEGMENTS_VECTOR_PROFILE
+    if profile == "byte":
+        return {
+            "embedding": quantize_int8(embedding),
+            EMBEDDING_F32_FIELD: encode_f32(embedding),
+        }
+    if isinstance(embedding, np.ndarray):
+        embedding = embedding.tolist()
+    return {"embedding": embedding}
+
+
+# Fields needed to build a SearchResult. Readers request only these via
+# _source includes so the 768-float embedding never crosses the wire.
+SEARCH_RESULT_FIELDS = [
+    "id",
+    "video_id",
+    "video_title",
+    "text",
+    "start_time",
+    "end_time",
+    "speaker",
+    "recording_date",
+]
+
+
+def project_source(body: dict, fields: list[str] = SEARCH_RESULT_FIELDS) -> dict:
+    """Restrict a search body's returned _source to the given fields."""
+    body["_source"] = {"includes": list(fields)}
+    return body
+
+
+# Process-wide client, created lazily (after any worker fork)
+_client: OpenSearch | None = None
+_client_lock = threading.Lock()
+_index_ready = False
+
+# Async client for the API event loop, created on first use
+_async_client = None
+
+
+def _parse_host(url: str) -> dict:
+    """Split OPENSEARCH_URL into the host dict expected by the client."""
     if url.startswith("http://"):
         url = url[7:]
     elif url.startswith("https://"):
         url = url[8:]
 
     host, port = url.split(":") if ":" in url else (url, 9200)
+    return {"host": host, "port": int(port)}
 
-    client = OpenSearch(
-        hosts=[{"host": host, "port": int(port)}],
-        http_compress=True,
-        use_ssl=False,
-        verify_certs=False,
-        ssl_show_warn=False,
-    )
 
-    return client
+def get_opensearch_client() -> OpenSearch:
+    """Return the shared OpenSearch client for this process.
+
+    The client owns a urllib3 connection pool whose connections are kept
+    alive between requests, so callers must not close it.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            _client = OpenSearch(
+                hosts=[_parse_host(settings.OPENSEARCH_URL)],
+                http_compress=True,
+                use_ssl=False,
+                verify_certs=False,
+                ssl_show_warn=False,
+                pool_maxsize=settings.OPENSEARCH_POOL_MAXSIZE,
+                timeout=settings.OPENSEARCH_TIMEOUT,
+                max_retries=settings.OPENSEARCH_MAX_RETRIES,
+                retry_on_timeout=True,
+            )
+    return _client
+
+
+def set_opensearch_client(client) -> None:
+    """Install client as the shared client, e.g. a benchmark's stand-in.
+
+    Any client created earlier is closed first.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
+
+
+def close_opensearch_client() -> None:
+    """Close the shared client and release its connection pool."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def get_async_opensearch_client():
+    """Return the shared AsyncOpenSearch client for this process.
+
+    Bound to the running event loop; only used from the API's async routes.
+    Requires the aiohttp extra of opensearch-py.
+    """
+    global _async_client
+    if _async_client is None:
+        from opensearchpy import AsyncOpenSearch
+
+        _async_client = AsyncOpenSearch(
+            hosts=[_parse_host(settings.OPENSEARCH_URL)],
+            http_compress=True,
+            use_ssl=False,
+            verify_certs=False,
+            ssl_show_warn=False,
+            maxsize=settings.OPENSEARCH_POOL_MAXSIZE,
+            timeout=settings.OPENSEARCH_TIMEOUT,
+            max_retries=settings.OPENSEARCH_MAX_RETRIES,
+            retry_on_timeout=True,
+        )
+    return _async_client
+
+
+async def close_async_opensearch_client() -> None:
+    """Close the shared async client and its aiohttp session."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def segments_index_name(version: int) -> str:
+    """Physical index name for a segments index version."""
+    return f"{SEGMENTS_INDEX_PREFIX}{version}"
+
+
+def _ensure_suggest_mapping(client: OpenSearch) -> None:
+    """Add the completion field to an index created before it existed.
+
+    New fields can be added to a live mapping, so older indexes get
+    suggestions for videos indexed from now on without a reindex. Without
+    the mapping, indexing would dynamically map suggest as an object and
+    the completion suggester could never use it.
+    """
+    try:
+        client.indices.put_mapping(
+            index=SEGMENTS_INDEX, body={"properties": {SUGGEST_FIELD: SUGGEST_MAPPING}}
+        )
+    except Exception as exc:
+        logger.warning("Could not add %s mapping to %s: %s", SUGGEST_FIELD, SEGMENTS_INDEX, exc)
 
 
 def ensure_segments_index(client: OpenSearch) -> None:
-    """Create the segments index if it does not exist."""
-    if not client.indices.exists(index=SEGMENTS_INDEX):
-        client.indices.create(index=SEGMENTS_INDEX, body=SEGMENTS_INDEX_BODY)
-        logger.info("Created OpenSearch index: %s", SEGMENTS_INDEX)
+    """Create the segments alias and its first index if they do not exist.
+
+    A pre-alias segments_index is adopted by pointing the alias at it, so
+    existing data stays searchable until the next reindex.
+    """
+    if client.indices.exists(index=SEGMENTS_INDEX):
+        _ensure_suggest_mapping(client)
+        return
+
+    if client.indices.exists(index=LEGACY_SEGMENTS_INDEX):
+        client.indices.put_alias(index=LEGACY_SEGMENTS_INDEX, name=SEGMENTS_INDEX)
+        logger.info("Aliased %s to legacy index %s", SEGMENTS_INDEX, LEGACY_SEGMENTS_INDEX)
+        _ensure_suggest_mapping(client)
+        return
+
+    index = segments_index_name(1)
+    body = {**segments_index_body(), "aliases": {SEGMENTS_INDEX: {}}}
+    client.indices.create(index=index, body=body)
+    logger.info("Created OpenSearch index %s with alias %s", index, SEGMENTS_INDEX)
+
+
+def bootstrap_segments_index(client: OpenSearch | None = None) -> bool:
+    """Ensure the segments index exists, once per process.
+
+    Called at API startup and worker init so the query path never pays for
+    an existence check. Failures are logged rather than raised so a process
+    can start while OpenSearch is still coming up; the next call retries.
+    """
+    global _index_ready
+    if _index_ready:
+        return True
+
+    try:
+        ensure_segments_index(client or get_opensearch_client())
+    except Exception as exc:
+        logger.warning("Could not bootstrap OpenSearch index %s: %s", SEGMENTS_INDEX, exc)
+        return False
+
+    _index_ready = True
+    return True
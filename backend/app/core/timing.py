@@ -0,0 +1,133 @@
+"""Per-stage latency timing for search and chat requests.
+
+Code marks stages with `with stage("embed"):`. Each stage duration is
+recorded in a per-stage latency histogram (reported by /api/metrics) and,
+inside a timing scope, collected for the current request. The HTTP
+middleware opens a scope per request and emits the collected stages as a
+Server-Timing header; service entry points open their own scope when
+called outside a request (workers, scripts) so the slow-query log still
+sees their stages.
+
+OpenSearch's own `took` for each search leg is collected alongside with
+record_took, which separates server time from network and client time.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.metrics import Histogram, register_collector
+
+logger = logging.getLogger(__name__)
+
+
+class Timings:
+    """Stage durations and OpenSearch took values collected in one scope."""
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.took: dict[str, int] = {}
+        self.started = time.perf_counter()
+
+    def add(self, name: str, ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """Format as a Server-Timing header value."""
+        entries = [f"{name};dur={ms:.1f}" for name, ms in self.stages.items()]
+        entries += [f"{name}-took;dur={ms}" for name, ms in self.took.items()]
+        return ", ".join(entries)
+
+
+_current: ContextVar[Timings | None] = ContextVar("search_timings", default=None)
+
+_histograms: dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _histogram(name: str) -> Histogram:
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(name, Histogram())
+    return histogram
+
+
+def observe(name: str, ms: float) -> None:
+    """Record a stage duration in its histogram and the current scope."""
+    _histogram(name).observe(ms)
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, ms)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as the named stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - start) * 1000)
+
+
+def record_took(name: str, took_ms: int | None) -> None:
+    """Keep OpenSearch's reported took for a search leg in the current scope."""
+    timings = _current.get()
+    if timings is not None and took_ms is not None:
+        timings.took[name] = timings.took.get(name, 0) + took_ms
+
+
+@contextmanager
+def timing_scope() -> Iterator[Timings]:
+    """Collect stages for the enclosed block, joining any enclosing scope."""
+    timings = _current.get()
+    if timings is not None:
+        yield timings
+        return
+
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def log_if_slow(kind: str, query: str, timings: Timings, elapsed_ms: float) -> None:
+    """Log a call slower than SLOW_QUERY_LOG_MS with its stage breakdown."""
+    threshold = settings.SLOW_QUERY_LOG_MS
+    if threshold and elapsed_ms >= threshold:
+        logger.warning(
+            "Slow %s: %.0f ms query=%r stages=%s took=%s",
+            kind,
+            elapsed_ms,
+            query[:200],
+            {name: round(ms, 1) for name, ms in timings.stages.items()},
+            timings.took,
+        )
+
+
+def json_response(model, status_code: int = 200) -> Response:
+    """Serialize a Pydantic model to a JSON response as a timed stage."""
+    with stage("serialize"):
+        body = model.model_dump_json()
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def _latency_stats() -> dict:
+    with _histograms_lock:
+        histograms = dict(_histograms)
+    return {name: h.stats() for name, h in sorted(histograms.items())}
+
+
+register_collector("stage_latency_ms", _latency_stats)
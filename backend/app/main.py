@@ -1,12 +1,31 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import chat, documents, health, playback, search, videos
+from app.api.routes import chat, documents, health, metrics, playback, search, videos
+from app.core.opensearch import (
+    bootstrap_segments_index,
+    close_async_opensearch_client,
+    close_opensearch_client,
+)
+from app.core.timing import timing_scope
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Bootstrap the search index at startup and release pooled connections on shutdown."""
+    bootstrap_segments_index()
+    yield
+    await close_async_opensearch_client()
+    close_opensearch_client()
+
 
 app = FastAPI(
     title="Whedifaqaui",
     description="Video Knowledge Management System",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend
@@ -18,6 +37,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Report the request's timed stages in a Server-Timing header."""
+    with timing_scope() as timings:
+        response = await call_next(request)
+    if timings.stages:
+        response.headers["Server-Timing"] = (
+            f"{timings.server_timing()}, total;dur={timings.elapsed_ms():.1f}"
+        )
+    return response
+
+
 # Include routers
 app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(videos.router, prefix="/api", tags=["videos"])
@@ -25,6 +57,7 @@ app.include_router(search.router, prefix="/api", tags=["search"])
 app.include_router(playback.router, prefix="/api", tags=["playback"])
 app.include_router(chat.router, prefix="/api", tags=["chat"])
 app.include_router(documents.router, prefix="/api", tags=["documents"])
+app.include_router(metrics.router, prefix="/api", tags=["metrics"])
 
 
 @app.get("/")
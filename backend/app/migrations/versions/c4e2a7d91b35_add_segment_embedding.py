@@ -0,0 +1,26 @@
+"""add segments.embedding
+
+Revision ID: c4e2a7d91b35
+Revises: 96e6a6dfc1ac
+Create Date: 2026-10-16 09:12:03.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e2a7d91b35'
+down_revision: Union[str, None] = '96e6a6dfc1ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('segments', sa.Column('embedding', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('segments', 'embedding')
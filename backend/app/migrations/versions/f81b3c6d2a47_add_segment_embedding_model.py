@@ -0,0 +1,26 @@
+"""add segments.embedding_model
+
+Revision ID: f81b3c6d2a47
+Revises: c4e2a7d91b35
+Create Date: 2026-10-17 10:04:51.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f81b3c6d2a47'
+down_revision: Union[str, None] = 'c4e2a7d91b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('segments', sa.Column('embedding_model', sa.String(length=200), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('segments', 'embedding_model')
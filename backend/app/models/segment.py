@@ -7,6 +7,7 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Index,
+    LargeBinary,
     String,
     Text,
 )
@@ -45,6 +46,11 @@ class Segment(Base):
     embedding_indexed: Mapped[bool] = mapped_column(
         Boolean, server_default=sa_text("false")
     )
+    # float32 bytes of the text's embedding, computed by chunking and
+    # reused by indexing; NULL until the text has been embedded
+    embedding: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # embedding_model_key() of the model and backend that produced embedding
+    embedding_model: Mapped[str | None] = mapped_column(String(200), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=sa_text("now()")
     )
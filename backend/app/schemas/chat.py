@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 
+from app.schemas.search import SearchFilters
+
 
 class Citation(BaseModel):
     """A citation linking to a specific video segment."""
@@ -15,6 +17,7 @@ class ChatRequest(BaseModel):
 
     message: str = Field(..., min_length=1)
     conversation_id: str | None = None
+    filters: SearchFilters | None = None
 
 
 class ChatResponse(BaseModel):
@@ -1,4 +1,25 @@
-from pydantic import BaseModel, Field
+from datetime import date
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class SearchFilters(BaseModel):
+    """Optional restrictions applied inside both search legs."""
+
+    video_ids: list[str] | None = None
+    speakers: list[str] | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+
+    @model_validator(mode="after")
+    def _check_date_range(self) -> "SearchFilters":
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from must not be after date_to")
+        return self
+
+    def is_empty(self) -> bool:
+        """True when no restriction is set."""
+        return not (self.video_ids or self.speakers or self.date_from or self.date_to)
 
 
 class SearchResult(BaseModel):
@@ -14,6 +35,27 @@ class SearchResult(BaseModel):
     recording_date: str | None = None
     score: float
     timestamp_formatted: str
+    rerank_score: float | None = None  # Cross-encoder relevance in [0, 1], when reranked
+    # Fragments with analyzer matches wrapped in <mark> tags (HTML-escaped);
+    # empty when no query term matched, None when the hit came from the
+    # local vector index only
+    highlights: list[str] | None = None
+
+
+class FacetBucket(BaseModel):
+    """One facet value and the number of matching segments."""
+
+    value: str
+    count: int
+    label: str | None = None  # Display name, e.g. the video title for a video_id
+
+
+class SearchFacets(BaseModel):
+    """Match counts per video, speaker and recording month."""
+
+    videos: list[FacetBucket] = Field(default_factory=list)
+    speakers: list[FacetBucket] = Field(default_factory=list)
+    recording_dates: list[FacetBucket] = Field(default_factory=list)  # yyyy-MM
 
 
 class SearchResponse(BaseModel):
@@ -21,3 +63,32 @@ class SearchResponse(BaseModel):
 
     count: int = Field(default=0, ge=0)
     results: list[SearchResult] = Field(default_factory=list)
+    degraded: bool = False  # True when served from the local vector index only
+    partial: bool = False  # True when a search leg failed and contributed no hits
+    facets: SearchFacets | None = None
+
+
+class SearchPageResponse(SearchResponse):
+    """One page of results plus an opaque cursor for the next page."""
+
+    next_cursor: str | None = None
+
+
+class BatchSearchRequest(BaseModel):
+    """Request body for running several searches in one call."""
+
+    queries: list[str] = Field(..., min_length=1, max_length=100)
+    limit: int = Field(default=10, ge=1, le=50)
+    filters: SearchFilters | None = None
+
+
+class BatchSearchResponse(BaseModel):
+    """One SearchResponse per query, in request order."""
+
+    responses: list[SearchResponse] = Field(default_factory=list)
+
+
+class SuggestResponse(BaseModel):
+    """Completions for a partial query."""
+
+    suggestions: list[str] = Field(default_factory=list)
@@ -1,14 +1,19 @@
 import json
 import logging
 import re
+import time
 import uuid
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.timing import log_if_slow, stage, timing_scope
 from app.schemas.chat import ChatResponse, Citation
-from app.schemas.search import SearchResult
+from app.schemas.search import SearchFilters, SearchResult
 from app.services.claude import ClaudeError, claude
+from app.services.context_window import expand_with_neighbours
 from app.services.prompt import QUICK_MODE_PROMPT
-from app.services.search import search
+from app.services.search import HIGHLIGHT_POST_TAG, HIGHLIGHT_PRE_TAG, search
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +22,7 @@ MAX_CONTEXT_CHARS = 32000  # ~8000 tokens, context truncation limit
 
 CITATION_PATTERN = re.compile(r"\[([^\]]+?)\s*@\s*(\d{1,2}:\d{2})\]")
 MIN_RELEVANCE_SCORE = 0.005  # Below single-list RRF min of 1/61 ≈ 0.0164
+MIN_RERANK_SCORE = 0.1  # Cross-encoder relevance below which a segment is dropped
 
 # Common words excluded from keyword overlap check
 _STOP_WORDS = frozenset(
@@ -31,6 +37,28 @@ _STOP_WORDS = frozenset(
 )
 
 
+_HIGHLIGHTED_TERM = re.compile(
+    re.escape(HIGHLIGHT_PRE_TAG) + r"(.+?)" + re.escape(HIGHLIGHT_POST_TAG)
+)
+
+
+def _has_keyword_match(result: SearchResult, query_terms: set[str]) -> bool:
+    """Whether a result matches a query keyword.
+
+    Results from OpenSearch are judged on its analyzer's highlighted
+    matches, so stemmed forms count ("budgets" matches "budget") and a hit
+    with no highlights did not match; stop words are still ignored. Only
+    local vector index hits (highlights None) fall back to a substring scan.
+    """
+    if result.highlights is None:
+        return any(term in result.text.lower() for term in query_terms)
+    matched = {
+        term.lower() for fragment in result.highlights
+        for term in _HIGHLIGHTED_TERM.findall(fragment)
+    }
+    return any(len(term) >= 3 and term not in _STOP_WORDS for term in matched)
+
+
 def _filter_by_keyword_overlap(query: str, results: list[SearchResult]) -> list[SearchResult]:
     """Keep only results where at least one query keyword appears in that result's text.
 
@@ -43,7 +71,19 @@ def _filter_by_keyword_overlap(query: str, results: list[SearchResult]) -> list[
     query_terms = {t for t in query_terms if len(t) >= 3}
     if not query_terms:
         return results  # Only stopwords in query; cannot determine relevance
-    return [r for r in results if any(term in r.text.lower() for term in query_terms)]
+    return [r for r in results if _has_keyword_match(r, query_terms)]
+
+
+def _expand_context(results: list[SearchResult]) -> list[SearchResult]:
+    """Widen hits to CHAT_CONTEXT_WINDOW neighbours; the bare hits on failure."""
+    db = SessionLocal()
+    try:
+        return expand_with_neighbours(db, results, settings.CHAT_CONTEXT_WINDOW)
+    except Exception as exc:
+        logger.warning("Context expansion failed, using hits only: %s", exc)
+        return results
+    finally:
+        db.close()
 
 
 def _mmss_to_seconds(mmss: str) -> float:
@@ -203,13 +243,16 @@ def deduplicate_citations(citations: list[Citation]) -> list[Citation]:
 
 
 def handle_chat_message(
-    message: str, conversation_id: str | None = None
+    message: str,
+    conversation_id: str | None = None,
+    filters: SearchFilters | None = None,
 ) -> ChatResponse:
     """Orchestrate the full chat flow: search → context → Claude → response.
 
     Args:
         message: The user's chat message.
         conversation_id: Optional ID to resume an existing conversation.
+        filters: Optional video/speaker/date restrictions for retrieval.
 
     Returns:
         ChatResponse with Claude's answer, conversation ID, and citations.
@@ -217,11 +260,28 @@ def handle_chat_message(
     Raises:
         ClaudeError: If the Claude CLI invocation fails.
     """
+    start = time.perf_counter()
+    with timing_scope() as timings:
+        try:
+            return _handle_chat_message(message, conversation_id, filters)
+        finally:
+            log_if_slow("chat", message, timings, (time.perf_counter() - start) * 1000)
+
+
+def _handle_chat_message(
+    message: str, conversation_id: str | None, filters: SearchFilters | None
+) -> ChatResponse:
+    """The timed body of handle_chat_message."""
     # 1. Search OpenSearch for relevant segments, filter by relevance
-    search_response = search(message)
+    with stage("search"):
+        search_response = search(message, filters=filters, rerank=True)
     search_results = [r for r in search_response.results if r.score >= MIN_RELEVANCE_SCORE]
-    # Drop individual results where no query keywords appear (false positives)
-    search_results = _filter_by_keyword_overlap(message, search_results)
+    if search_results and search_results[0].rerank_score is not None:
+        # Cross-encoder scores judge each segment against the question directly
+        search_results = [r for r in search_results if r.rerank_score >= MIN_RERANK_SCORE]
+    else:
+        # Drop individual results where no query keywords appear (false positives)
+        search_results = _filter_by_keyword_overlap(message, search_results)
 
     # 2. Short-circuit when no relevant results
     if not search_results:
@@ -233,15 +293,21 @@ def handle_chat_message(
             citations=[],
         )
 
-    # 3. Prepare context file
-    context_path = prepare_context_file(search_results, message)
+    # 3. Prepare context file, with each hit's surrounding segments if enabled
+    context_segments = search_results
+    if settings.CHAT_CONTEXT_WINDOW > 0:
+        with stage("expand"):
+            context_segments = _expand_context(search_results)
+    with stage("context"):
+        context_path = prepare_context_file(context_segments, message)
 
     try:
         # 4. Build prompt
         prompt = build_prompt(message, context_path)
 
         # 5. Call Claude
-        claude_response = claude.query(prompt, conversation_id=conversation_id)
+        with stage("claude"):
+            claude_response = claude.query(prompt, conversation_id=conversation_id)
 
         # 6. Extract and deduplicate citations
         citations = extract_citations(claude_response.result, search_results)
@@ -2,7 +2,7 @@ import logging
 import re
 from collections import Counter
 
-from app.services.embedding import cosine_similarity, generate_embeddings
+from app.services.embedding import consecutive_similarities, generate_embeddings
 
 logger = logging.getLogger(__name__)
 
@@ -42,10 +42,7 @@ def semantic_chunk(
     embeddings = generate_embeddings(texts)
 
     # Step 2: Compute cosine similarity between consecutive segments
-    similarities = []
-    for i in range(len(embeddings) - 1):
-        sim = cosine_similarity(embeddings[i], embeddings[i + 1])
-        similarities.append(sim)
+    similarities = consecutive_similarities(embeddings)
 
     # Step 3: Identify boundary indices where similarity drops below threshold
     boundaries = set()
@@ -0,0 +1,122 @@
+import logging
+import uuid
+from itertools import groupby
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.models.segment import Segment
+from app.schemas.search import SearchResult
+from app.services.search import format_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_neighbours(db: Session, results: list[SearchResult], window: int) -> list:
+    """Fetch every hit plus its window preceding and following segments.
+
+    One query for all hits: segments of the hit videos are numbered by
+    start_time (walking idx_segments_time), and rows within window
+    positions of any hit are returned once, ordered by video and position.
+    Rows carry a pos column so contiguous runs can be detected.
+    """
+    hit_ids = [uuid.UUID(r.segment_id) for r in results]
+    video_ids = list({uuid.UUID(r.video_id) for r in results})
+
+    ordered = (
+        select(
+            Segment.id,
+            Segment.video_id,
+            Segment.start_time,
+            Segment.end_time,
+            Segment.text,
+            Segment.speaker,
+            func.row_number()
+            .over(partition_by=Segment.video_id, order_by=Segment.start_time)
+            .label("pos"),
+        )
+        .where(Segment.video_id.in_(video_ids))
+        .cte("ordered")
+    )
+    hits = select(ordered.c.video_id, ordered.c.pos).where(ordered.c.id.in_(hit_ids)).subquery()
+
+    stmt = (
+        select(ordered)
+        .join(
+            hits,
+            and_(
+                ordered.c.video_id == hits.c.video_id,
+                ordered.c.pos.between(hits.c.pos - window, hits.c.pos + window),
+            ),
+        )
+        .distinct()
+        .order_by(ordered.c.video_id, ordered.c.pos)
+    )
+    return db.execute(stmt).all()
+
+
+def _runs(rows: list) -> list[list]:
+    """Split rows into runs of consecutive positions within one video."""
+    runs = []
+    for _, video_rows in groupby(rows, key=lambda r: r.video_id):
+        for _, run in groupby(enumerate(video_rows), key=lambda ir: ir[1].pos - ir[0]):
+            runs.append([row for _, row in run])
+    return runs
+
+
+def _merge_run(run: list, best: SearchResult) -> SearchResult:
+    """One SearchResult covering a run, carrying its best hit's metadata and scores.
+
+    The result keeps the best hit's start_time and timestamp, so citations
+    point at the hit rather than the start of its window, and each row of
+    the merged text is prefixed with its own [MM:SS] (and speaker, when the
+    run has several) so neighbours can be cited precisely too.
+    """
+    speakers = {row.speaker for row in run}
+    if len(speakers) == 1:
+        lines = (f"[{format_timestamp(row.start_time)}] {row.text}" for row in run)
+    else:
+        lines = (
+            f"[{format_timestamp(row.start_time)}] {row.speaker or 'Unknown'}: {row.text}"
+            for row in run
+        )
+
+    return best.model_copy(update={
+        "text": "\n".join(lines),
+        "speaker": speakers.pop() if len(speakers) == 1 else None,
+    })
+
+
+def expand_with_neighbours(
+    db: Session, results: list[SearchResult], window: int
+) -> list[SearchResult]:
+    """Widen each hit to its neighbouring segments, merging overlapping windows.
+
+    Hits whose windows overlap or touch in the same video become a single
+    result spanning the union, so no text reaches the context twice.
+    Results keep the order of their highest-ranked hit. Hits missing from
+    the database are passed through unchanged.
+    """
+    if window <= 0 or not results:
+        return results
+
+    rows = fetch_neighbours(db, results, window)
+    rank = {r.segment_id: i for i, r in enumerate(results)}
+    by_id = {r.segment_id: r for r in results}
+
+    merged: list[tuple[int, SearchResult]] = []
+    covered: set[str] = set()
+    for run in _runs(rows):
+        run_hits = [by_id[str(row.id)] for row in run if str(row.id) in by_id]
+        if not run_hits:
+            continue
+        best = min(run_hits, key=lambda h: rank[h.segment_id])
+        covered.update(h.segment_id for h in run_hits)
+        merged.append((rank[best.segment_id], _merge_run(run, best)))
+
+    for r in results:
+        if r.segment_id not in covered:
+            merged.append((rank[r.segment_id], r))
+
+    merged.sort(key=lambda item: item[0])
+    return [result for _, result in merged]
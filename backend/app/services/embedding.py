@@ -1,41 +1,243 @@
 import logging
+import sqlite3
+import threading
 
 import numpy as np
 
+from app.core.cache import LRUCache, get_redis_client
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.services.embedding_backends import get_embedding_backend
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_store import embedding_key, get_embedding_store
+
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL_NAME = "BAAI/bge-base-en-v1.5"
+EMBEDDING_DIMENSION = 768
+
 # Module-level cache for loaded model
 _embedding_model = None
 
+# Query vectors keyed by normalized query text
+query_embedding_cache = LRUCache(
+    maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE,
+    ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+)
+_redis_hits = 0
+_redis_misses = 0
+
+_REDIS_KEY_PREFIX = "query_embedding:"
 
-def load_embedding_model(model_name: str = "BAAI/bge-base-en-v1.5"):
-    """Load and cache the BGE sentence-transformer model."""
+
+def load_embedding_model(model_name: str = EMBEDDING_MODEL_NAME, backend: str | None = None):
+    """Load and cache the BGE model on the configured EMBEDDING_BACKEND."""
     global _embedding_model
     if _embedding_model is not None:
         return _embedding_model
 
-    from sentence_transformers import SentenceTransformer
-
-    logger.info("Loading embedding model: %s", model_name)
-    _embedding_model = SentenceTransformer(model_name)
+    backend = backend or settings.EMBEDDING_BACKEND
+    loader = get_embedding_backend(backend)
+    logger.info("Loading embedding model: %s (%s backend)", model_name, backend)
+    _embedding_model = loader(model_name)
     return _embedding_model
 
 
-def generate_embeddings(
-    texts: list[str], model=None
-) -> list[list[float]]:
-    """Batch encode texts into 768-dim float vectors.
+def embedding_model_key() -> str:
+    """Identity of the configured model and backend.
 
-    Loads model automatically if not provided.
+    Stored with every persisted vector (embedding store keys, segment
+    embeddings), so vectors from another backend are never reused;
+    quantized vectors are kept apart.
     """
-    if not texts:
-        return []
+    if settings.EMBEDDING_BACKEND == "torch":
+        return EMBEDDING_MODEL_NAME
+    return f"{EMBEDDING_MODEL_NAME}:{settings.EMBEDDING_BACKEND}"
+
 
+def _encode(texts: list[str], model=None) -> np.ndarray:
     if model is None:
         model = load_embedding_model()
-
     embeddings = model.encode(texts, show_progress_bar=False, normalize_embeddings=True)
-    return [emb.tolist() for emb in embeddings]
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def generate_embeddings(
+    texts: list[str], model=None, use_store: bool = True
+) -> np.ndarray:
+    """Batch encode texts into a contiguous (len(texts), 768) float32 array.
+
+    Rows are unit-normalized. Loads model automatically if not provided.
+    With the default model and an embedding store configured, previously
+    stored vectors are reused and only new texts are encoded (once each)
+    and added to the store.
+    """
+    if not texts:
+        return np.empty((0, EMBEDDING_DIMENSION), dtype=np.float32)
+
+    store = get_embedding_store() if use_store and model is None else None
+    if store is None:
+        return _encode(texts, model)
+
+    model_key = embedding_model_key()
+    keys = [embedding_key(model_key, text) for text in texts]
+    try:
+        found = store.get_many(keys)
+    except sqlite3.Error as exc:
+        logger.warning("Embedding store lookup failed: %s", exc)
+        return _encode(texts)
+
+    missing = {key: text for key, text in zip(keys, texts) if key not in found}
+    if missing:
+        encoded = dict(zip(missing, _encode(list(missing.values()))))
+        try:
+            store.put_many(encoded)
+        except sqlite3.Error as exc:
+            logger.warning("Embedding store write failed: %s", exc)
+        found.update(encoded)
+
+    return np.stack([found[key] for key in keys])
+
+
+def pack_embedding(embedding) -> bytes:
+    """Serialize a vector as float32 bytes for Segment.embedding."""
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def unpack_embedding(raw: bytes) -> np.ndarray:
+    """Read a vector stored by pack_embedding."""
+    return np.frombuffer(raw, dtype=np.float32)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookup.
+
+    Collapses whitespace and lowercases; BGE uses an uncased tokenizer, so
+    both forms produce the same embedding.
+    """
+    return " ".join(query.split()).lower()
+
+
+def _redis_get(key: str) -> np.ndarray | None:
+    """Look up a query vector in the shared Redis tier."""
+    global _redis_hits, _redis_misses
+    try:
+        raw = get_redis_client().get(_REDIS_KEY_PREFIX + key)
+    except Exception as exc:
+        logger.warning("Query embedding Redis lookup failed: %s", exc)
+        return None
+    if raw is None:
+        _redis_misses += 1
+        return None
+    _redis_hits += 1
+    return np.frombuffer(raw, dtype=np.float32)
+
+
+def _redis_set(key: str, embedding: np.ndarray) -> None:
+    """Store a query vector in the shared Redis tier as raw float32 bytes."""
+    try:
+        ttl = int(settings.QUERY_EMBEDDING_CACHE_TTL) or None
+        get_redis_client().set(_REDIS_KEY_PREFIX + key, embedding.tobytes(), ex=ttl)
+    except Exception as exc:
+        logger.warning("Query embedding Redis store failed: %s", exc)
+
+
+def _encode_query_batch(texts: list[str]) -> np.ndarray:
+    # Queries are cached by embed_queries; keep them out of the document store
+    return generate_embeddings(texts, use_store=False)
+
+
+_query_batcher: EmbeddingBatcher | None = None
+_query_batcher_lock = threading.Lock()
+
+
+def get_query_batcher() -> EmbeddingBatcher | None:
+    """Return the process-wide query micro-batcher, or None when disabled."""
+    global _query_batcher
+    if settings.QUERY_EMBEDDING_BATCH_SIZE <= 1:
+        return None
+    if _query_batcher is None:
+        with _query_batcher_lock:
+            if _query_batcher is None:
+                _query_batcher = EmbeddingBatcher(
+                    _encode_query_batch,
+                    max_batch=settings.QUERY_EMBEDDING_BATCH_SIZE,
+                    window_ms=settings.QUERY_EMBEDDING_BATCH_WINDOW_MS,
+                    name="query-embedding-batcher",
+                )
+    return _query_batcher
+
+
+def embed_query(query: str) -> np.ndarray:
+    """Embed a single search query, serving repeats from cache.
+
+    Looks in the in-process LRU first, then (if enabled) the shared Redis
+    tier, and only runs the model on a miss in both.
+    """
+    return embed_queries([query])[0]
+
+
+def embed_queries(queries: list[str]) -> list[np.ndarray]:
+    """Embed several search queries, encoding all cache misses in one batch.
+
+    Returns read-only float32 vectors, shared with the cache; callers
+    building a JSON request body convert them with .tolist() there.
+    """
+    keys = [normalize_query(q) for q in queries]
+    vectors: list[np.ndarray | None] = [query_embedding_cache.get(k) for k in keys]
+
+    if settings.QUERY_EMBEDDING_CACHE_REDIS:
+        for i, vec in enumerate(vectors):
+            if vec is None:
+                vec = _redis_get(keys[i])
+                if vec is not None:
+                    query_embedding_cache.set(keys[i], vec)
+                vectors[i] = vec
+
+    encoded: dict[str, np.ndarray] = {}
+    missing = list(dict.fromkeys(k for k, v in zip(keys, vectors) if v is None))
+    if missing:
+        # Misses from concurrent requests are encoded together by the batcher
+        batcher = get_query_batcher()
+        rows = batcher.encode(missing) if batcher is not None else _encode_query_batch(missing)
+        for key, row in zip(missing, rows):
+            embedding = np.array(row, dtype=np.float32)
+            embedding.flags.writeable = False
+            encoded[key] = embedding
+            query_embedding_cache.set(key, embedding)
+            if settings.QUERY_EMBEDDING_CACHE_REDIS:
+                _redis_set(key, embedding)
+
+    return [v if v is not None else encoded[k] for k, v in zip(keys, vectors)]
+
+
+def _query_cache_stats() -> dict:
+    """Hit/miss counters for both query embedding cache tiers."""
+    stats = query_embedding_cache.stats()
+    stats["redis_hits"] = _redis_hits
+    stats["redis_misses"] = _redis_misses
+    return stats
+
+
+register_collector("query_embedding_cache", _query_cache_stats)
+
+
+def _query_batcher_stats() -> dict:
+    return _query_batcher.stats() if _query_batcher is not None else {}
+
+
+register_collector("query_embedding_batcher", _query_batcher_stats)
+
+
+def consecutive_similarities(embeddings: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each row with the next, for unit-normalized rows.
+
+    generate_embeddings output is already normalized, so this is a row-wise
+    dot product with no norm recomputation or float64 copies.
+    """
+    if len(embeddings) < 2:
+        return np.empty(0, dtype=np.float32)
+    return np.asarray(np.einsum("ij,ij->i", embeddings[:-1], embeddings[1:]))
 
 
 def cosine_similarity(vec_a: list[float], vec_b: list[float]) -> float:
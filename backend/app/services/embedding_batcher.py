@@ -0,0 +1,127 @@
+"""Micro-batching of concurrent embedding requests.
+
+Concurrent searches and chats each need one query vector, and encoding
+them one string at a time leaves the model's batched matrix math unused.
+EmbeddingBatcher queues texts from any thread, and a dedicated thread
+collects them for up to window_ms (or until max_batch are waiting),
+encodes the batch in one call and resolves each caller's Future.
+
+A lone request waits at most window_ms extra; under load the window fills
+quickly and callers share one forward pass.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """Thread that encodes queued texts in batches via encode_fn."""
+
+    def __init__(
+        self,
+        encode_fn: Callable[[list[str]], np.ndarray],
+        max_batch: int = 32,
+        window_ms: float = 2.0,
+        name: str = "embedding-batcher",
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self.name = name
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def submit(self, text: str) -> Future:
+        """Queue text for encoding; the Future resolves to its vector."""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, texts: list[str]) -> list[np.ndarray]:
+        """Submit texts and block until all of their vectors are ready."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def _ensure_started(self) -> None:
+        # Started lazily so forked worker processes get their own thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop the thread once already queued texts are encoded."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(first)
+            self._process(batch)
+            if stop:
+                return
+
+    def _collect(self, first) -> tuple[list, bool]:
+        """Gather up to max_batch items arriving within the window."""
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _process(self, batch: list[tuple[str, Future]]) -> None:
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        unique = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = dict(zip(unique, self.encode_fn(unique)))
+        except Exception as exc:
+            logger.warning("Batch embedding of %d texts failed: %s", len(unique), exc)
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(unique))
+        for text, future in batch:
+            future.set_result(vectors[text])
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
@@ -0,0 +1,212 @@
+"""Persistent, content-addressed store of document embeddings.
+
+Vectors are keyed by sha256(model name, normalized text), so re-running
+chunking or indexing after a failure or a reprocess reuses earlier work
+instead of re-encoding the same texts. The store is a single SQLite file
+in WAL mode: the chunking and indexing workers (and their prefork
+children) can share it on a common volume, with readers never blocked by
+a writer.
+
+Size is capped at EMBEDDING_STORE_MAX_ENTRIES; when exceeded, the least
+recently used tenth is evicted in one statement. The row count is kept in
+a meta row by triggers, so checking the cap never scans the table. Access
+times only order entries for eviction, so reads refresh them at most once
+per touch_interval, and those refreshes are queued and written with the
+next put_many (or once a batch has built up) instead of making every
+lookup take the write lock.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits bound parameters per statement
+_MAX_PARAMS = 500
+
+# Seconds before a read refreshes an entry's access time
+TOUCH_INTERVAL = 3600.0
+
+# Queued access time refreshes that trigger a write on their own
+_TOUCH_BATCH = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key BLOB PRIMARY KEY,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used);
+CREATE TABLE IF NOT EXISTS store_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS embeddings_count_insert AFTER INSERT ON embeddings
+BEGIN
+    UPDATE store_meta SET value = value + 1 WHERE name = 'count';
+END;
+CREATE TRIGGER IF NOT EXISTS embeddings_count_delete AFTER DELETE ON embeddings
+BEGIN
+    UPDATE store_meta SET value = value - 1 WHERE name = 'count';
+END;
+"""
+
+
+def embedding_key(model_name: str, text: str) -> bytes:
+    """Content address of a text's embedding under a model."""
+    normalized = " ".join(text.split()).lower()
+    return hashlib.sha256(f"{model_name}\0{normalized}".encode()).digest()
+
+
+class EmbeddingStore:
+    """SQLite-backed map from embedding_key to a float32 vector."""
+
+    def __init__(self, path: str | Path, max_entries: int, touch_interval: float = TOUCH_INTERVAL):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._pending_touches: dict[bytes, float] = {}
+        self._touch_lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            # Stores created before the meta row are counted once
+            conn.execute(
+                "INSERT OR IGNORE INTO store_meta (name, value) "
+                "SELECT 'count', COUNT(*) FROM embeddings "
+                "WHERE NOT EXISTS (SELECT 1 FROM store_meta WHERE name = 'count')"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite connections are not shareable."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up vectors for keys; missing keys are absent from the result."""
+        found: dict[bytes, np.ndarray] = {}
+        stale: list[bytes] = []
+        now = time.time()
+        unique = list(dict.fromkeys(keys))
+        conn = self._connect()
+        for i in range(0, len(unique), _MAX_PARAMS):
+            chunk = unique[i:i + _MAX_PARAMS]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, vector, last_used FROM embeddings WHERE key IN ({marks})", chunk
+            ).fetchall()
+            for key, vector, last_used in rows:
+                found[key] = np.frombuffer(vector, dtype=np.float32)
+                if now - last_used >= self.touch_interval:
+                    stale.append(key)
+
+        if stale:
+            with self._touch_lock:
+                self._pending_touches.update(dict.fromkeys(stale, now))
+                flush = len(self._pending_touches) >= _TOUCH_BATCH
+            if flush:
+                with self._connect() as conn:
+                    self._flush_touches(conn)
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        """Write queued access times inside the caller's transaction."""
+        with self._touch_lock:
+            pending, self._pending_touches = self._pending_touches, {}
+        conn.executemany(
+            "UPDATE embeddings SET last_used = max(last_used, ?) WHERE key = ?",
+            [(used, key) for key, used in pending.items()],
+        )
+
+    def put_many(self, items: dict[bytes, np.ndarray]) -> None:
+        """Store vectors, then evict least recently used entries over the cap."""
+        if not items:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            self._flush_touches(conn)
+            conn.executemany(
+                "INSERT INTO embeddings (key, vector, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET vector = excluded.vector, "
+                "last_used = excluded.last_used",
+                [
+                    (key, np.asarray(vec, dtype=np.float32).tobytes(), now)
+                    for key, vec in items.items()
+                ],
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        count = len(self)
+        if count <= self.max_entries:
+            return
+        # Evict down to 90% of the cap so inserts do not evict every time
+        excess = count - int(self.max_entries * 0.9)
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        logger.info("Evicted %d embeddings from %s", excess, self.path)
+
+    def __len__(self) -> int:
+        row = self._connect().execute(
+            "SELECT value FROM store_meta WHERE name = 'count'"
+        ).fetchone()
+        return row[0] if row is not None else 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_store: EmbeddingStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore | None:
+    """Return the process-wide store, or None when EMBEDDING_STORE_PATH is unset.
+
+    A store that cannot be opened is logged and treated as disabled, so
+    embedding still works without it.
+    """
+    global _store
+    if not settings.EMBEDDING_STORE_PATH:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = EmbeddingStore(
+                        settings.EMBEDDING_STORE_PATH, settings.EMBEDDING_STORE_MAX_ENTRIES
+                    )
+                except (OSError, sqlite3.Error) as exc:
+                    logger.warning("Embedding store unavailable: %s", exc)
+                    return None
+    return _store
+
+
+def _store_stats() -> dict:
+    return _store.stats() if _store is not None else {}
+
+
+register_collector("embedding_store", _store_stats)
@@ -0,0 +1,247 @@
+"""In-process, memory-mapped vector index of segment embeddings.
+
+Each indexed video is one shard in LOCAL_VECTOR_INDEX_PATH, made of two
+files sharing a version number:
+
+    <video_id>.<version>.npy   embedding matrix, float32 or int8 (row i = segment i)
+    <video_id>.<version>.json  the SEARCH_RESULT_FIELDS of each segment, same order
+
+Shards are written by the indexing task next to the OpenSearch bulk write.
+A version's files are never modified: a rewrite writes a new version and
+publishes it by atomically renaming its matrix into place, after which the
+older versions are deleted. Readers load the newest published version, so
+the ids and the matrix they pair always come from the same write, and
+readers in other processes never see a half written shard. Matrices are
+opened with mmap, leaving residency to the OS page cache. Search is an exact brute-force dot product per shard, which is
+fast enough for the tens of thousands of segments a deployment holds and
+needs no index maintenance.
+
+Hits are shaped like OpenSearch kNN hits ({_id, _score, _source}, score
+(1 + cos) / 2), so they fuse with BM25 hits unchanged.
+
+Usage (from backend/), to backfill from OpenSearch:
+    python -m app.services.local_vector_index --rebuild
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.opensearch import (
+    EMBEDDING_F32_FIELD,
+    SEARCH_RESULT_FIELDS,
+    SEGMENTS_INDEX,
+    decode_f32,
+    get_opensearch_client,
+)
+from app.schemas.search import SearchFilters
+
+logger = logging.getLogger(__name__)
+
+LOCAL_INDEX_DTYPES = ("float32", "int8")
+
+
+class _Shard:
+    """One video's memory-mapped matrix and segment metadata."""
+
+    def __init__(self, video_id: str, matrix: np.ndarray, docs: list[dict], version: int):
+        self.video_id = video_id
+        self.matrix = matrix
+        self.docs = docs
+        self.version = version
+        self.scale = 1.0 / 127.0 if matrix.dtype == np.int8 else 1.0
+        self.speakers = np.array([d.get("speaker") or "" for d in docs])
+        self.dates = np.array([d.get("recording_date") or "" for d in docs])
+
+    def mask(self, filters: SearchFilters | None) -> np.ndarray | None:
+        """Boolean row mask for filters, or None when every row matches."""
+        if filters is None:
+            return None
+        keep = np.ones(len(self.docs), dtype=bool)
+        if filters.video_ids and self.video_id not in filters.video_ids:
+            keep[:] = False
+        if filters.speakers:
+            keep &= np.isin(self.speakers, filters.speakers)
+        if filters.date_from or filters.date_to:
+            keep &= self.dates != ""
+        if filters.date_from:
+            keep &= self.dates >= filters.date_from.isoformat()
+        if filters.date_to:
+            keep &= self.dates <= filters.date_to.isoformat()
+        return keep
+
+
+class LocalVectorIndex:
+    """Directory of per-video shards, reloaded when another process rewrites them."""
+
+    def __init__(self, path: str, dtype: str = "float32"):
+        if dtype not in LOCAL_INDEX_DTYPES:
+            raise ValueError(f"Unknown local index dtype: {dtype}")
+        self.path = Path(path)
+        self.dtype = dtype
+        self._shards: dict[str, _Shard] = {}
+        self._lock = threading.Lock()
+
+    def _files(self, video_id: str, version: int) -> tuple[Path, Path]:
+        stem = f"{video_id}.{version}"
+        return self.path / f"{stem}.npy", self.path / f"{stem}.json"
+
+    def write_video(self, video_id: str, docs: list[dict], embeddings) -> None:
+        """Replace the shard for one video with its segments and embeddings."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if self.dtype == "int8":
+            matrix = np.clip(np.rint(matrix * 127.0), -127, 127).astype(np.int8)
+        rows = [{k: doc.get(k) for k in SEARCH_RESULT_FIELDS} for doc in docs]
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        version = time.time_ns()
+        npy, meta = self._files(video_id, version)
+        tmp_npy = npy.with_suffix(".npy.tmp")
+        # Readers only look for .npy files, so the metadata is in place
+        # before the version becomes visible
+        meta.write_text(json.dumps(rows))
+        with open(tmp_npy, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_npy, npy)
+
+        for old in self.path.glob(f"{video_id}.*"):
+            if old not in (npy, meta):
+                old.unlink(missing_ok=True)
+
+    def _load(self, video_id: str, version: int) -> _Shard | None:
+        npy, meta = self._files(video_id, version)
+        try:
+            matrix = np.load(npy, mmap_mode="r")
+            docs = json.loads(meta.read_text())
+        except (OSError, ValueError) as exc:
+            # Usually a version deleted by a newer write; retried next search
+            logger.warning("Skipping local vector shard %s: %s", npy.name, exc)
+            return None
+        return _Shard(video_id, matrix, docs, version)
+
+    def _published(self) -> dict[str, int]:
+        """Newest published version of each video's shard."""
+        versions: dict[str, int] = {}
+        try:
+            entries = list(os.scandir(self.path))
+        except FileNotFoundError:
+            return versions
+        for entry in entries:
+            if not entry.name.endswith(".npy"):
+                continue
+            video_id, _, version = entry.name[:-4].rpartition(".")
+            if video_id and version.isdigit():
+                versions[video_id] = max(versions.get(video_id, 0), int(version))
+        return versions
+
+    def _current_shards(self) -> list[_Shard]:
+        """Return loaded shards, (re)opening any with a newer version."""
+        published = self._published()
+        with self._lock:
+            for video_id in list(self._shards):
+                if video_id not in published:
+                    del self._shards[video_id]
+            for video_id, version in published.items():
+                shard = self._shards.get(video_id)
+                if shard is None or shard.version != version:
+                    loaded = self._load(video_id, version)
+                    if loaded is not None:
+                        self._shards[video_id] = loaded
+            return list(self._shards.values())
+
+    def __len__(self) -> int:
+        return sum(len(s.docs) for s in self._current_shards())
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int,
+        filters: SearchFilters | None = None,
+        min_score: float = 0.0,
+    ) -> list[dict]:
+        """Return the top k segments by cosine similarity as kNN-style hits."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        candidates: list[tuple[float, dict]] = []
+
+        for shard in self._current_shards():
+            scores = (1.0 + (shard.matrix @ query) * shard.scale) / 2.0
+            mask = shard.mask(filters)
+            if mask is not None:
+                if not mask.any():
+                    continue
+                scores = np.where(mask, scores, -np.inf)
+            top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            for i in top:
+                if scores[i] >= min_score:
+                    candidates.append((float(scores[i]), shard.docs[i]))
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        return [
+            {"_id": doc["id"], "_score": score, "_source": dict(doc)}
+            for score, doc in candidates[:k]
+        ]
+
+
+_local_index: LocalVectorIndex | None = None
+
+
+def get_local_vector_index() -> LocalVectorIndex | None:
+    """Return the process-wide local index, or None if it is not configured."""
+    global _local_index
+    if not settings.LOCAL_VECTOR_INDEX_PATH:
+        return None
+    if _local_index is None:
+        _local_index = LocalVectorIndex(
+            settings.LOCAL_VECTOR_INDEX_PATH, settings.LOCAL_VECTOR_INDEX_DTYPE
+        )
+    return _local_index
+
+
+def rebuild_from_opensearch(index: LocalVectorIndex, client=None) -> int:
+    """Write shards for every video currently in OpenSearch. Returns segment count."""
+    from opensearchpy import helpers
+
+    client = client or get_opensearch_client()
+    by_video: dict[str, tuple[list[dict], list]] = {}
+    fields = SEARCH_RESULT_FIELDS + ["embedding", EMBEDDING_F32_FIELD]
+    for hit in helpers.scan(
+        client, index=SEGMENTS_INDEX, query={"query": {"match_all": {}}, "_source": fields}
+    ):
+        src = hit["_source"]
+        packed = src.get(EMBEDDING_F32_FIELD)
+        vector = decode_f32(packed) if packed is not None else src["embedding"]
+        docs, vectors = by_video.setdefault(src["video_id"], ([], []))
+        docs.append(src)
+        vectors.append(vector)
+
+    for video_id, (docs, vectors) in by_video.items():
+        index.write_video(video_id, docs, vectors)
+    return sum(len(docs) for docs, _ in by_video.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local vector index.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Backfill shards for every video in OpenSearch")
+    args = parser.parse_args()
+
+    index = get_local_vector_index()
+    if index is None:
+        parser.error("LOCAL_VECTOR_INDEX_PATH is not set")
+
+    logging.basicConfig(level=logging.INFO)
+    if args.rebuild:
+        print(f"{rebuild_from_opensearch(index)} segments written to {index.path}")
+    else:
+        print(f"{len(index)} segments in {index.path}")
+
+
+if __name__ == "__main__":
+    main()
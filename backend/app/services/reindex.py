@@ -0,0 +1,202 @@
+"""Blue/green reindexing of the segments index.
+
+Builds a new versioned index from the one currently behind the segments
+alias, then swaps the alias atomically. Documents are copied from the
+existing index (embeddings included), so mapping or vector profile changes
+need no downtime and no re-embedding.
+
+The vector profile must match SEGMENTS_VECTOR_PROFILE, which indexing and
+search read to build documents and queries. To switch profiles, set it
+for every process first (or pass --force and roll the setting out right
+after the swap).
+
+Usage (from backend/):
+    python -m app.services.reindex
+    SEGMENTS_VECTOR_PROFILE=byte python -m app.services.reindex --threads 8 --delete-old
+
+Documents written to the old index while a reindex runs are not copied;
+run it while no videos are being indexed.
+"""
+
+import argparse
+import logging
+import re
+
+from opensearchpy import OpenSearch, helpers
+
+from app.core.config import settings
+from app.core.opensearch import (
+    EMBEDDING_F32_FIELD,
+    SEGMENTS_INDEX,
+    SEGMENTS_INDEX_PREFIX,
+    VECTOR_PROFILES,
+    build_segments_index_body,
+    decode_f32,
+    ensure_segments_index,
+    get_opensearch_client,
+    segments_index_name,
+    vector_fields,
+)
+from app.services.search import bump_index_generation
+
+logger = logging.getLogger(__name__)
+
+_VERSION_RE = re.compile(rf"^{re.escape(SEGMENTS_INDEX_PREFIX)}(\d+)$")
+
+
+def current_segments_index(client: OpenSearch) -> str:
+    """Return the physical index the segments alias points at."""
+    indices = list(client.indices.get_alias(name=SEGMENTS_INDEX))
+    if len(indices) != 1:
+        raise RuntimeError(f"Alias {SEGMENTS_INDEX} points at {len(indices)} indices")
+    return indices[0]
+
+
+def next_segments_index(client: OpenSearch) -> str:
+    """Name for the next index version, above any existing segments_vN."""
+    existing = client.indices.get(index=f"{SEGMENTS_INDEX_PREFIX}*")
+    versions = [
+        int(m.group(1)) for name in existing if (m := _VERSION_RE.match(name))
+    ]
+    return segments_index_name(max(versions, default=0) + 1)
+
+
+def _convert_source(source: dict, profile: str) -> dict:
+    """Rewrite a document's vector fields for the target vector profile."""
+    packed = source.pop(EMBEDDING_F32_FIELD, None)
+    embedding = decode_f32(packed) if packed is not None else source["embedding"]
+    return {**source, **vector_fields(embedding, profile)}
+
+
+def _copy_actions(client: OpenSearch, source: str, target: str, profile: str, batch_size: int):
+    """Stream bulk index actions for every document in source."""
+    for hit in helpers.scan(
+        client, index=source, query={"query": {"match_all": {}}}, size=batch_size
+    ):
+        yield {
+            "_op_type": "index",
+            "_index": target,
+            "_id": hit["_id"],
+            "_source": _convert_source(hit["_source"], profile),
+        }
+
+
+def reindex_segments(
+    client: OpenSearch | None = None,
+    profile: str | None = None,
+    threads: int = 4,
+    batch_size: int = 500,
+    delete_old: bool = False,
+    force: bool = False,
+) -> str:
+    """Rebuild the segments index and swap the alias to it.
+
+    The target is created with refresh disabled and no replicas, filled
+    with parallel bulk requests, then restored to the index body's
+    settings and refreshed. The alias moves in a single update_aliases
+    call, so searches see either the old or the new index, never neither.
+    If the copy comes up short, the new index is deleted and the alias
+    stays where it was.
+
+    A profile other than SEGMENTS_VECTOR_PROFILE is refused unless force
+    is set, since the running indexers and searches would keep writing
+    and querying vectors in the configured profile.
+
+    Returns:
+        The name of the new physical index.
+    """
+    client = client or get_opensearch_client()
+    profile = profile or settings.SEGMENTS_VECTOR_PROFILE
+    if profile != settings.SEGMENTS_VECTOR_PROFILE and not force:
+        raise ValueError(
+            f"Profile {profile!r} differs from SEGMENTS_VECTOR_PROFILE="
+            f"{settings.SEGMENTS_VECTOR_PROFILE!r}; set SEGMENTS_VECTOR_PROFILE "
+            f"first, or force the reindex and update it before indexing resumes"
+        )
+    ensure_segments_index(client)
+
+    source = current_segments_index(client)
+    target = next_segments_index(client)
+    body = build_segments_index_body(profile)
+    replicas = body["settings"]["index"]["number_of_replicas"]
+
+    build_body = {
+        **body,
+        "settings": {
+            "index": {
+                **body["settings"]["index"],
+                "number_of_replicas": 0,
+                "refresh_interval": "-1",
+            }
+        },
+    }
+    client.indices.create(index=target, body=build_body)
+    logger.info("Reindexing %s into %s (profile=%s)", source, target, profile)
+
+    copied = 0
+    for _ in helpers.parallel_bulk(
+        client,
+        _copy_actions(client, source, target, profile, batch_size),
+        thread_count=threads,
+        chunk_size=batch_size,
+    ):
+        copied += 1
+
+    client.indices.put_settings(
+        index=target,
+        body={"index": {"number_of_replicas": replicas, "refresh_interval": None}},
+    )
+    client.indices.refresh(index=target)
+
+    expected = client.count(index=source)["count"]
+    actual = client.count(index=target)["count"]
+    if actual != expected:
+        client.indices.delete(index=target)
+        raise RuntimeError(
+            f"Reindex copied {actual} documents into {target}, expected {expected}; "
+            f"deleted it and left the alias on {source}"
+        )
+
+    client.indices.update_aliases(body={
+        "actions": [
+            {"remove": {"index": source, "alias": SEGMENTS_INDEX}},
+            {"add": {"index": target, "alias": SEGMENTS_INDEX}},
+        ]
+    })
+    logger.info("Alias %s moved from %s to %s (%d documents)", SEGMENTS_INDEX, source, target, copied)
+
+    # Scores may shift under the new mapping; drop cached search results
+    bump_index_generation()
+
+    if delete_old:
+        client.indices.delete(index=source)
+        logger.info("Deleted old index %s", source)
+
+    return target
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the segments index behind its alias.")
+    parser.add_argument("--profile", choices=VECTOR_PROFILES, default=None,
+                        help="Vector profile for the new index (default: SEGMENTS_VECTOR_PROFILE)")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--delete-old", action="store_true",
+                        help="Delete the previous index after the alias swap")
+    parser.add_argument("--force", action="store_true",
+                        help="Allow a --profile other than SEGMENTS_VECTOR_PROFILE")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    target = reindex_segments(
+        profile=args.profile,
+        threads=args.threads,
+        batch_size=args.batch_size,
+        delete_old=args.delete_old,
+        force=args.force,
+    )
+    print(target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.schemas.search import SearchResult
+from app.services.embedding import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Module-level cache for loaded model
+_rerank_model = None
+_model_lock = threading.Lock()
+
+# Cross-encoder scores keyed by (normalized query, segment text)
+rerank_score_cache = LRUCache(maxsize=settings.RERANK_CACHE_SIZE)
+
+# Smoothed per-pair inference cost in ms, learned from completed batches
+_EWMA_ALPHA = 0.2
+_pair_latency_ms: float | None = None
+# Each skipped call shrinks the estimate, so one slow batch (a CPU spike)
+# cannot switch reranking off for good: once the decayed estimate fits the
+# budget, the next call runs and re-measures
+_SKIP_DECAY = 0.9
+# The first predict is cold (lazy allocations, thread pools) and not timed
+_warmed_up = False
+_reranked = 0
+_skipped = 0
+
+
+def rerank_enabled() -> bool:
+    """True when a cross-encoder model is configured."""
+    return bool(settings.RERANK_MODEL)
+
+
+def load_rerank_model(model_name: str | None = None):
+    """Load and cache the cross-encoder model."""
+    global _rerank_model
+    if _rerank_model is not None:
+        return _rerank_model
+
+    with _model_lock:
+        if _rerank_model is None:
+            from sentence_transformers import CrossEncoder
+
+            model_name = model_name or settings.RERANK_MODEL
+            logger.info("Loading rerank model: %s", model_name)
+            _rerank_model = CrossEncoder(model_name, device="cpu")
+    return _rerank_model
+
+
+def _record_latency(pairs: int, elapsed_ms: float) -> None:
+    global _pair_latency_ms
+    per_pair = elapsed_ms / pairs
+    if _pair_latency_ms is None:
+        _pair_latency_ms = per_pair
+    else:
+        _pair_latency_ms += _EWMA_ALPHA * (per_pair - _pair_latency_ms)
+
+
+def _within_budget(pairs: int, budget_ms: float) -> bool:
+    """Whether scoring this many uncached pairs is expected to fit the budget.
+
+    Until a warm batch has been timed there is no estimate, so the first
+    calls always run and calibrate it.
+    """
+    return _pair_latency_ms is None or pairs * _pair_latency_ms <= budget_ms
+
+
+def rerank(
+    query: str, results: list[SearchResult], budget_ms: float | None = None
+) -> list[SearchResult] | None:
+    """Reorder results by cross-encoder relevance to the query.
+
+    All uncached (query, text) pairs are scored in a single CPU batch.
+    Returns new SearchResults sorted by rerank_score, or None when
+    reranking is disabled or would exceed the latency budget, in which case
+    callers keep the fused order.
+    """
+    global _reranked, _skipped, _pair_latency_ms, _warmed_up
+    if not rerank_enabled() or not results:
+        return None
+
+    budget_ms = settings.RERANK_BUDGET_MS if budget_ms is None else budget_ms
+    query_key = normalize_query(query)
+    scores = [rerank_score_cache.get((query_key, r.text)) for r in results]
+    missing = list(dict.fromkeys(r.text for r, s in zip(results, scores) if s is None))
+
+    if missing:
+        if not _within_budget(len(missing), budget_ms):
+            _skipped += 1
+            logger.info(
+                "Skipping rerank: %d pairs at ~%.1f ms each exceeds %.0f ms budget",
+                len(missing), _pair_latency_ms, budget_ms,
+            )
+            _pair_latency_ms *= _SKIP_DECAY
+            return None
+
+        model = load_rerank_model()
+        start = time.perf_counter()
+        predicted = model.predict(
+            [(query, text) for text in missing],
+            batch_size=len(missing),
+            show_progress_bar=False,
+        )
+        if _warmed_up:
+            _record_latency(len(missing), (time.perf_counter() - start) * 1000)
+        _warmed_up = True
+
+        fresh = {text: float(score) for text, score in zip(missing, predicted)}
+        for text, score in fresh.items():
+            rerank_score_cache.set((query_key, text), score)
+        scores = [s if s is not None else fresh[r.text] for r, s in zip(results, scores)]
+
+    _reranked += 1
+    reranked = [r.model_copy(update={"rerank_score": s}) for r, s in zip(results, scores)]
+    reranked.sort(key=lambda r: r.rerank_score, reverse=True)
+    return reranked
+
+
+def _rerank_stats() -> dict:
+    stats = rerank_score_cache.stats()
+    stats["reranked"] = _reranked
+    stats["skipped"] = _skipped
+    stats["pair_latency_ms"] = _pair_latency_ms
+    return stats
+
+
+register_collector("rerank", _rerank_stats)
@@ -1,13 +1,98 @@
+import asyncio
+import contextvars
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from app.core.opensearch import SEGMENTS_INDEX, ensure_segments_index, get_opensearch_client
-from app.schemas.search import SearchResponse, SearchResult
-from app.services.embedding import generate_embeddings
+import numpy as np
+from opensearchpy import ConnectionError as OpenSearchConnectionError
+from opensearchpy import TransportError
+
+from app.core.cache import LRUCache, get_redis_client
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.core.opensearch import (
+    EMBEDDING_F32_FIELD,
+    SEGMENTS_INDEX,
+    get_async_opensearch_client,
+    get_opensearch_client,
+    project_source,
+    quantize_int8,
+)
+from app.core.timing import log_if_slow, record_took, stage, timing_scope
+from app.schemas.search import (
+    FacetBucket,
+    SearchFacets,
+    SearchFilters,
+    SearchResponse,
+    SearchResult,
+)
+from app.services.embedding import embed_queries, embed_query, normalize_query
+from app.services.local_vector_index import LocalVectorIndex, get_local_vector_index
+from app.services.rerank import rerank as rerank_results
+from app.services.rerank import rerank_enabled
 
 logger = logging.getLogger(__name__)
 
+# Lucene cosinesimil scores are (1 + cos) / 2; 0.75 keeps matches with cos >= 0.5
+KNN_MIN_SCORE = 0.75
+
+# Exact cosine score, on the lucene cosinesimil scale, of the little-endian
+# float32 vector in EMBEDDING_F32_FIELD's doc values against params.vector
+EXACT_RESCORE_SCRIPT = (
+    "def ref = doc['" + EMBEDDING_F32_FIELD + "'].value; byte[] b = ref.bytes; "
+    "int o = ref.offset; double dot = 0; "
+    "for (int i = 0; i < params.vector.size(); ++i) { "
+    "int bits = (b[o] & 0xff) | ((b[o + 1] & 0xff) << 8) "
+    "| ((b[o + 2] & 0xff) << 16) | (b[o + 3] << 24); "
+    "dot += Float.intBitsToFloat(bits) * params.vector[i]; o += 4; } "
+    "return (1.0 + dot) / 2.0;"
+)
+
+# Tags wrapping matched terms in SearchResult.highlights
+HIGHLIGHT_PRE_TAG = "<mark>"
+HIGHLIGHT_POST_TAG = "</mark>"
+
+# Redis counter bumped whenever segments are written to the index
+INDEX_GENERATION_KEY = "segments_index:generation"
+
+# Search responses keyed by (index generation, normalized query, limit, ...)
+search_result_cache = LRUCache(
+    maxsize=settings.SEARCH_CACHE_SIZE,
+    ttl=settings.SEARCH_CACHE_TTL,
+)
+register_collector("search_result_cache", search_result_cache.stats)
+
+# Bounded pool so query embedding never blocks the API event loop
+_embedding_executor = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_EMBEDDING_WORKERS,
+    thread_name_prefix="query-embedding",
+)
+
+
+def get_index_generation() -> int | None:
+    """Return the current index generation, or None if Redis is unreachable.
+
+    Without a generation the result cache is bypassed, since there would be
+    no way to tell whether a cached response predates newly indexed videos.
+    """
+    try:
+        value = get_redis_client().get(INDEX_GENERATION_KEY)
+    except Exception as exc:
+        logger.warning("Could not read index generation: %s", exc)
+        return None
+    return int(value) if value is not None else 0
 
-def _format_timestamp(seconds: float) -> str:
+
+def bump_index_generation() -> None:
+    """Invalidate all cached search results after the index changes."""
+    try:
+        get_redis_client().incr(INDEX_GENERATION_KEY)
+    except Exception as exc:
+        logger.warning("Could not bump index generation: %s", exc)
+
+
+def format_timestamp(seconds: float) -> str:
     """Convert seconds to MM:SS format."""
     total_seconds = int(seconds)
     minutes = total_seconds // 60
@@ -15,7 +100,7 @@ def _format_timestamp(seconds: float) -> str:
     return f"{minutes}:{secs:02d}"
 
 
-def build_hybrid_query(query_text: str, query_embedding: list[float], limit: int = 10) -> dict:
+def build_hybrid_query(query_text: str, query_embedding: np.ndarray, limit: int = 10) -> dict:
     """Construct an OpenSearch hybrid query with BM25 + kNN.
 
     Uses a bool/should for the BM25 text match and a top-level knn clause
@@ -32,39 +117,483 @@ def build_hybrid_query(query_text: str, query_embedding: list[float], limit: int
         },
         "knn": {
             "embedding": {
-                "vector": query_embedding,
+                "vector": np.asarray(query_embedding).tolist(),
                 "k": limit,
             }
         },
     }
 
 
-def _apply_rrf(bm25_hits: list[dict], knn_hits: list[dict], k: int = 60) -> list[dict]:
-    """Combine two ranked lists using Reciprocal Rank Fusion.
+def apply_rrf(
+    bm25_hits: list[dict],
+    knn_hits: list[dict],
+    k: int = 60,
+    weights: tuple[float, float] = (1.0, 1.0),
+) -> list[dict]:
+    """Combine two ranked lists using weighted Reciprocal Rank Fusion.
 
-    score(doc) = sum(1 / (k + rank_i)) across all lists where doc appears.
-    Returns docs sorted by combined RRF score descending.
+    score(doc) = sum(weight_i / (k + rank_i)) across all lists where doc appears.
+    Scores are accumulated with numpy so fusion stays cheap for hundreds of
+    candidates. Returns docs sorted by combined RRF score descending; ties
+    keep first-seen order.
     """
-    scores: dict[str, float] = {}
     docs: dict[str, dict] = {}
+    highlights: dict[str, dict] = {}
+    remote: set[str] = set()  # Docs returned by an OpenSearch leg
+    positions: dict[str, int] = {}
+    doc_index = []
+    contributions = []
+
+    for hits, weight in zip((bm25_hits, knn_hits), weights):
+        if not hits:
+            continue
+        for hit in hits:
+            doc_id = hit["_id"]
+            doc_index.append(positions.setdefault(doc_id, len(positions)))
+            docs[doc_id] = hit
+            if not hit.get("_local"):
+                remote.add(doc_id)
+            if hit.get("highlight"):
+                highlights.setdefault(doc_id, hit["highlight"])
+        ranks = np.arange(1, len(hits) + 1, dtype=np.float64)
+        contributions.append(weight / (k + ranks))
+
+    if not positions:
+        return []
+
+    scores = np.bincount(
+        np.asarray(doc_index, dtype=np.intp),
+        weights=np.concatenate(contributions),
+        minlength=len(positions),
+    )
+    order = np.argsort(-scores, kind="stable")
+    ids = list(positions)
+    fused = []
+    for i in order:
+        doc_id = ids[i]
+        hit = {"_id": doc_id, "_source": docs[doc_id]["_source"], "_rrf_score": float(scores[i])}
+        if doc_id in highlights:
+            hit["highlight"] = highlights[doc_id]
+        if doc_id not in remote:
+            hit["_local"] = True
+        fused.append(hit)
+    return fused
+
+
+def _filter_clauses(filters: SearchFilters | None) -> list[dict]:
+    """Translate SearchFilters into OpenSearch filter clauses."""
+    if filters is None:
+        return []
+
+    clauses = []
+    if filters.video_ids:
+        clauses.append({"terms": {"video_id": filters.video_ids}})
+    if filters.speakers:
+        clauses.append({"terms": {"speaker": filters.speakers}})
+    if filters.date_from or filters.date_to:
+        date_range = {}
+        if filters.date_from:
+            date_range["gte"] = filters.date_from.isoformat()
+        if filters.date_to:
+            date_range["lte"] = filters.date_to.isoformat()
+        clauses.append({"range": {"recording_date": date_range}})
+    return clauses
+
+
+def _facet_aggs() -> dict:
+    """Aggregations for per-video, per-speaker and per-month match counts."""
+    size = settings.SEARCH_FACET_SIZE
+    return {
+        "videos": {
+            "terms": {"field": "video_id", "size": size},
+            "aggs": {"title": {"top_hits": {"size": 1, "_source": {"includes": ["video_title"]}}}},
+        },
+        "speakers": {"terms": {"field": "speaker", "size": size}},
+        "recording_dates": {
+            "date_histogram": {
+                "field": "recording_date",
+                "calendar_interval": "month",
+                "format": "yyyy-MM",
+                "min_doc_count": 1,
+            }
+        },
+    }
+
+
+def _highlight(query_text: str | None = None) -> dict:
+    """Unified-highlighter request for the text field.
+
+    Matches are marked with <mark> tags in HTML-escaped text, using the
+    english analyzer's stemmed terms and the offsets stored in the index.
+    query_text supplies a match query for legs whose own query has no
+    terms (kNN).
+    """
+    field = {
+        "type": "unified",
+        "number_of_fragments": settings.SEARCH_HIGHLIGHT_FRAGMENTS,
+        "fragment_size": 200,
+    }
+    if query_text is not None:
+        field["highlight_query"] = {"match": {"text": {"query": query_text}}}
+    return {
+        "pre_tags": [HIGHLIGHT_PRE_TAG],
+        "post_tags": [HIGHLIGHT_POST_TAG],
+        "encoder": "html",
+        "fields": {"text": field},
+    }
+
+
+def bm25_body(
+    query_text: str,
+    limit: int,
+    filters: SearchFilters | None = None,
+    facets: bool = False,
+) -> dict:
+    """Build the BM25 leg of the hybrid search.
+
+    With facets, the leg also carries _facet_aggs, so the counts cover
+    every keyword match rather than only the returned hits.
+    """
+    match = {"match": {"text": {"query": query_text}}}
+    clauses = _filter_clauses(filters)
+    if clauses:
+        query = {"bool": {"must": [match], "filter": clauses}}
+    else:
+        query = match
+    body = {"size": limit, "query": query, "highlight": _highlight()}
+    if facets:
+        body["aggs"] = _facet_aggs()
+    return project_source(body)
+
+
+def _parse_facets(aggregations: dict | None) -> SearchFacets | None:
+    """Convert the BM25 leg's aggregations into SearchFacets."""
+    if not aggregations:
+        return None
+
+    videos = []
+    for bucket in aggregations["videos"]["buckets"]:
+        title_hits = bucket.get("title", {}).get("hits", {}).get("hits", [])
+        label = title_hits[0]["_source"].get("video_title") if title_hits else None
+        videos.append(FacetBucket(value=bucket["key"], count=bucket["doc_count"], label=label))
+
+    return SearchFacets(
+        videos=videos,
+        speakers=[
+            FacetBucket(value=b["key"], count=b["doc_count"])
+            for b in aggregations["speakers"]["buckets"]
+        ],
+        recording_dates=[
+            FacetBucket(value=b["key_as_string"], count=b["doc_count"])
+            for b in aggregations["recording_dates"]["buckets"]
+        ],
+    )
+
+
+def _exact_rescore(query_embedding: np.ndarray, window: int) -> dict:
+    """Rescore clause replacing quantized kNN scores with exact ones.
+
+    Runs EXACT_RESCORE_SCRIPT on the top window candidates, on the node,
+    so their full-precision vectors never leave OpenSearch.
+    """
+    script = {
+        "source": EXACT_RESCORE_SCRIPT,
+        "params": {"vector": np.asarray(query_embedding).tolist()},
+    }
+    return {
+        "window_size": window,
+        "query": {
+            "rescore_query": {
+                "script_score": {"query": {"match_all": {}}, "script": script}
+            },
+            "query_weight": 0.0,
+            "rescore_query_weight": 1.0,
+        },
+    }
+
+
+def knn_body(
+    query_embedding: np.ndarray,
+    limit: int,
+    filters: SearchFilters | None = None,
+    query_text: str | None = None,
+) -> dict:
+    """Build the kNN leg of the hybrid search.
+
+    Filters go inside the knn clause so the lucene engine pre-filters: the
+    ANN search only visits matching vectors instead of trimming a global
+    top-k afterwards. min_score filters out low-relevance vector matches.
+
+    Under the byte vector profile the leg oversamples quantized candidates
+    and rescores them exactly on the server, returning the top limit;
+    min_score would apply before the rescore, so threshold_knn_hits
+    applies the score threshold instead.
+
+    With query_text, semantic-only hits are highlighted against its terms.
+    """
+    if settings.SEGMENTS_VECTOR_PROFILE == "byte":
+        window = limit * settings.SEARCH_RESCORE_OVERSAMPLE
+        knn = {"vector": quantize_int8(query_embedding), "k": window}
+        body = {"size": limit, "rescore": _exact_rescore(query_embedding, window)}
+    else:
+        knn = {"vector": np.asarray(query_embedding).tolist(), "k": limit}
+        body = {"size": limit, "min_score": KNN_MIN_SCORE}
+
+    clauses = _filter_clauses(filters)
+    if clauses:
+        knn["filter"] = {"bool": {"filter": clauses}}
+    body["query"] = {"knn": {"embedding": knn}}
+    if query_text is not None:
+        body["highlight"] = _highlight(query_text)
+    return project_source(body)
+
+
+def threshold_knn_hits(hits: list[dict]) -> list[dict]:
+    """Drop rescored byte-profile kNN hits scoring under KNN_MIN_SCORE.
+
+    A no-op under the float32 profile, where min_score already applies.
+    """
+    if settings.SEGMENTS_VECTOR_PROFILE != "byte":
+        return hits
+    return [hit for hit in hits if hit["_score"] >= KNN_MIN_SCORE]
+
+
+def _msearch_payload(bodies: list[dict]) -> list[dict]:
+    """Interleave empty headers with search bodies for the _msearch API."""
+    payload = []
+    for body in bodies:
+        payload.append({})
+        payload.append(body)
+    return payload
+
+
+def _msearch_legs(response: dict, labels: tuple[str, ...] | None = None) -> list[dict]:
+    """Split an _msearch response into per-leg responses.
+
+    A leg that failed is logged and returned as an empty response that
+    keeps its "error" and "status", so the other legs can still be served;
+    when every leg fails, the first error is raised as a TransportError.
+    With labels, each leg's OpenSearch took is recorded under its label.
+    """
+    responses = []
+    for n, item in enumerate(response["responses"]):
+        if labels is not None:
+            record_took(labels[n], item.get("took"))
+        if "error" in item:
+            logger.error("Search leg failed in _msearch: %s", item["error"])
+            responses.append(
+                {"hits": {"hits": []}, "error": item["error"], "status": item.get("status")}
+            )
+        else:
+            responses.append(item)
+
+    errors = [item for item in response["responses"] if "error" in item]
+    if errors and len(errors) == len(response["responses"]):
+        error = errors[0]["error"]
+        raise TransportError(
+            errors[0].get("status", "N/A"),
+            error.get("type", "unknown") if isinstance(error, dict) else str(error),
+            error,
+        )
+    return responses
+
+
+def msearch_responses(
+    client,
+    bodies: list[dict],
+    index: str | None = SEGMENTS_INDEX,
+    labels: tuple[str, ...] | None = None,
+) -> list[dict]:
+    """Send several search bodies in one _msearch round trip.
+
+    Returns each leg's full response (aggregations included), in order;
+    failed legs are handled by _msearch_legs. Pass index=None for
+    point-in-time searches.
+    """
+    with stage("opensearch"):
+        response = client.msearch(index=index, body=_msearch_payload(bodies))
+    return _msearch_legs(response, labels)
+
+
+async def _msearch_responses_async(
+    client,
+    bodies: list[dict],
+    index: str | None = SEGMENTS_INDEX,
+    labels: tuple[str, ...] | None = None,
+) -> list[dict]:
+    """msearch_responses on AsyncOpenSearch."""
+    with stage("opensearch"):
+        response = await client.msearch(index=index, body=_msearch_payload(bodies))
+    return _msearch_legs(response, labels)
+
 
-    for rank, hit in enumerate(bm25_hits, start=1):
-        doc_id = hit["_id"]
-        scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
-        docs[doc_id] = hit
+def _cache_key(
+    query: str,
+    limit: int,
+    filters: SearchFilters | None,
+    candidate_k: int,
+    rerank: bool = False,
+    per_video: int | None = None,
+    facets: bool = False,
+) -> tuple | None:
+    """Build the result cache key, or None when the cache cannot be used."""
+    if settings.SEARCH_CACHE_SIZE <= 0:
+        return None
+    generation = get_index_generation()
+    if generation is None:
+        return None
+    filter_key = filters.model_dump_json() if filters is not None else None
+    return (
+        generation, normalize_query(query), limit, filter_key, candidate_k,
+        rerank, per_video, facets,
+    )
 
-    for rank, hit in enumerate(knn_hits, start=1):
-        doc_id = hit["_id"]
-        scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
-        docs[doc_id] = hit
 
-    sorted_ids = sorted(scores, key=lambda doc_id: scores[doc_id], reverse=True)
-    return [{"_id": doc_id, "_source": docs[doc_id]["_source"], "_rrf_score": scores[doc_id]} for doc_id in sorted_ids]
+def _candidate_depth(limit: int, candidate_k: int | None) -> int:
+    """Hits to fetch per leg: the configured depth, but never fewer than limit."""
+    return max(limit, candidate_k or settings.SEARCH_CANDIDATE_K)
 
 
-def search(query: str, limit: int = 10) -> SearchResponse:
+def hit_to_result(hit: dict, score: float) -> SearchResult:
+    """Format one OpenSearch hit as a SearchResult."""
+    src = hit["_source"]
+    return SearchResult(
+        segment_id=src.get("id", hit["_id"]),
+        video_id=src["video_id"],
+        video_title=src.get("video_title", ""),
+        text=src["text"],
+        start_time=src["start_time"],
+        end_time=src["end_time"],
+        speaker=src.get("speaker"),
+        recording_date=src.get("recording_date"),
+        score=score,
+        timestamp_formatted=format_timestamp(src["start_time"]),
+        # OpenSearch omits highlight when no term matched; only local index
+        # hits have no analyzer verdict at all
+        highlights=None if hit.get("_local") else hit.get("highlight", {}).get("text", []),
+    )
+
+
+def _collapse_by_video(hits: list[dict], per_video: int) -> list[dict]:
+    """Keep at most per_video hits from each video, preserving rank order."""
+    seen: dict[str, int] = {}
+    kept = []
+    for hit in hits:
+        video_id = hit["_source"]["video_id"]
+        if seen.get(video_id, 0) < per_video:
+            seen[video_id] = seen.get(video_id, 0) + 1
+            kept.append(hit)
+    return kept
+
+
+def _build_response(
+    bm25_hits: list[dict],
+    knn_hits: list[dict],
+    limit: int,
+    per_video: int | None = None,
+) -> SearchResponse:
+    """Fuse both legs with RRF and format the top hits as a SearchResponse.
+
+    With per_video, the fused list is collapsed to the top per_video hits
+    of each video before the cut to limit, so deeper candidates from other
+    videos fill the freed slots.
+    """
+    with stage("fusion"):
+        merged = apply_rrf(
+            bm25_hits,
+            knn_hits,
+            k=settings.SEARCH_RRF_K,
+            weights=(settings.SEARCH_BM25_WEIGHT, settings.SEARCH_KNN_WEIGHT),
+        )
+        if per_video:
+            merged = _collapse_by_video(merged, per_video)
+        merged = merged[:limit]
+
+        results = [hit_to_result(hit, hit["_rrf_score"]) for hit in merged]
+        return SearchResponse(count=len(results), results=results)
+
+
+def _local_knn_hits(
+    local_index: LocalVectorIndex,
+    query_embedding: np.ndarray,
+    candidate_k: int,
+    filters: SearchFilters | None,
+) -> list[dict]:
+    """kNN leg served from the local memory-mapped vector index.
+
+    Hits are tagged _local: they carry no OpenSearch highlight verdict.
+    """
+    with stage("local_knn"):
+        hits = local_index.search(query_embedding, candidate_k, filters, min_score=KNN_MIN_SCORE)
+    for hit in hits:
+        hit["_local"] = True
+    return hits
+
+
+def _serves_knn_locally(local_index: LocalVectorIndex | None) -> bool:
+    return local_index is not None and settings.LOCAL_VECTOR_INDEX_SERVE_KNN
+
+
+def _degraded_response(
+    local_index: LocalVectorIndex,
+    query_embedding: np.ndarray,
+    limit: int,
+    filters: SearchFilters | None,
+    candidate_k: int,
+    per_video: int | None = None,
+) -> SearchResponse:
+    """Vector-only response used while OpenSearch is unreachable."""
+    knn_hits = _local_knn_hits(local_index, query_embedding, candidate_k, filters)
+    response = _build_response([], knn_hits, limit, per_video)
+    response.degraded = True
+    return response
+
+
+def _rerank_response(query: str, response: SearchResponse, limit: int) -> bool:
+    """Rerank a response's results in place and cut them to limit.
+
+    Returns False when reranking was skipped (over the latency budget), so
+    the fused order is served but not cached as a reranked response.
+    """
+    with stage("rerank"):
+        reranked = rerank_results(query, response.results)
+    if reranked is not None:
+        response.results = reranked
+    response.results = response.results[:limit]
+    response.count = len(response.results)
+    return reranked is not None
+
+
+def search(
+    query: str,
+    limit: int = 10,
+    filters: SearchFilters | None = None,
+    candidate_k: int | None = None,
+    rerank: bool = False,
+    per_video: int | None = None,
+    facets: bool = False,
+) -> SearchResponse:
     """Execute hybrid search: embed query, search OpenSearch, rank with RRF.
 
+    The BM25 and kNN legs are sent together in a single _msearch request
+    and fused client-side with Reciprocal Rank Fusion. Responses are cached
+    per index generation, so repeats skip embedding and OpenSearch entirely.
+    Optional filters restrict both legs by video, speaker and date range.
+    Each leg fetches candidate_k hits (SEARCH_CANDIDATE_K by default) so
+    fusion sees deeper lists than the limit returned.
+
+    With LOCAL_VECTOR_INDEX_PATH set, an unreachable OpenSearch degrades to
+    vector-only results from the local index instead of failing.
+
+    With rerank=True and RERANK_MODEL configured, the top RERANK_TOP_N
+    fused results are rescored by a cross-encoder before the cut to limit.
+
+    per_video keeps at most that many results from any one video. facets
+    adds video, speaker and recording month counts of the keyword matches,
+    aggregated by the BM25 leg of the same request.
+
+    Stage timings are recorded (see app.core.timing) and slow calls logged.
+
     Returns empty SearchResponse for empty queries.
     """
     if not query or not query.strip():
@@ -72,55 +601,276 @@ def search(query: str, limit: int = 10) -> SearchResponse:
 
     query = query.strip()
 
-    # Generate embedding for the query text
-    embeddings = generate_embeddings([query])
-    query_embedding = embeddings[0]
+    if filters is not None and filters.is_empty():
+        filters = None
+
+    start = time.perf_counter()
+    with timing_scope() as timings:
+        response = _search(query, limit, filters, candidate_k, rerank, per_video, facets)
+    log_if_slow("search", query, timings, (time.perf_counter() - start) * 1000)
+    return response
+
+
+def _search(
+    query: str,
+    limit: int,
+    filters: SearchFilters | None,
+    candidate_k: int | None,
+    rerank: bool,
+    per_video: int | None,
+    facets: bool,
+) -> SearchResponse:
+    """Cache lookup, hybrid search and optional rerank for search()."""
+    rerank = rerank and rerank_enabled()
+    candidate_k = _candidate_depth(limit, candidate_k)
+    with stage("cache"):
+        cache_key = _cache_key(query, limit, filters, candidate_k, rerank, per_video, facets)
+        cached = search_result_cache.get(cache_key) if cache_key is not None else None
+    if cached is not None:
+        return cached.model_copy(deep=True)
+
+    fetch = max(limit, settings.RERANK_TOP_N) if rerank else limit
+    response = _hybrid_search(query, fetch, filters, candidate_k, per_video, facets)
+    cacheable = not (response.degraded or response.partial)
+    if rerank:
+        cacheable = _rerank_response(query, response, limit) and cacheable
+
+    if cache_key is not None and cacheable:
+        search_result_cache.set(cache_key, response.model_copy(deep=True))
+    return response
+
+
+def _hybrid_search(
+    query: str,
+    limit: int,
+    filters: SearchFilters | None,
+    candidate_k: int,
+    per_video: int | None = None,
+    facets: bool = False,
+) -> SearchResponse:
+    """Run the uncached hybrid search against OpenSearch."""
+    # Embed the query text (served from cache for repeated queries)
+    with stage("embed"):
+        query_embedding = embed_query(query)
 
     client = get_opensearch_client()
-    ensure_segments_index(client)
+    local_index = get_local_vector_index()
 
-    # Run BM25 text search
-    bm25_body = {
-        "size": limit,
-        "query": {"match": {"text": {"query": query}}},
-    }
-    bm25_response = client.search(index=SEGMENTS_INDEX, body=bm25_body)
-    bm25_hits = bm25_response["hits"]["hits"]
+    bm25_request = bm25_body(query, candidate_k, filters, facets)
+    try:
+        if _serves_knn_locally(local_index):
+            leg_responses = msearch_responses(client, [bm25_request], labels=("bm25",))
+            knn_hits = _local_knn_hits(local_index, query_embedding, candidate_k, filters)
+        else:
+            # Run BM25 and kNN legs in one round trip
+            leg_responses = msearch_responses(
+                client,
+                [bm25_request, knn_body(query_embedding, candidate_k, filters, query)],
+                labels=("bm25", "knn"),
+            )
+            knn_hits = threshold_knn_hits(leg_responses[1]["hits"]["hits"])
+    except OpenSearchConnectionError as exc:
+        if local_index is None:
+            raise
+        logger.warning("OpenSearch unavailable, serving local vector results: %s", exc)
+        return _degraded_response(
+            local_index, query_embedding, limit, filters, candidate_k, per_video
+        )
 
-    # Run kNN vector search (min_score filters out low-relevance results)
-    knn_body = {
-        "size": limit,
-        "min_score": 0.75,
-        "query": {
-            "knn": {
-                "embedding": {
-                    "vector": query_embedding,
-                    "k": limit,
-                }
-            }
-        },
-    }
-    knn_response = client.search(index=SEGMENTS_INDEX, body=knn_body)
-    knn_hits = knn_response["hits"]["hits"]
-
-    # Combine with Reciprocal Rank Fusion
-    merged = _apply_rrf(bm25_hits, knn_hits)[:limit]
-
-    # Format results
-    results = []
-    for hit in merged:
-        src = hit["_source"]
-        results.append(SearchResult(
-            segment_id=src.get("id", hit["_id"]),
-            video_id=src["video_id"],
-            video_title=src.get("video_title", ""),
-            text=src["text"],
-            start_time=src["start_time"],
-            end_time=src["end_time"],
-            speaker=src.get("speaker"),
-            recording_date=src.get("recording_date"),
-            score=hit["_rrf_score"],
-            timestamp_formatted=_format_timestamp(src["start_time"]),
-        ))
-
-    return SearchResponse(count=len(results), results=results)
+    bm25_response = leg_responses[0]
+    response = _build_response(bm25_response["hits"]["hits"], knn_hits, limit, per_video)
+    # A failed leg is not cached, so the full result is served once it recovers
+    response.partial = any("error" in leg for leg in leg_responses)
+    if facets:
+        response.facets = _parse_facets(bm25_response.get("aggregations"))
+    return response
+
+
+def search_batch(
+    queries: list[str],
+    limit: int = 10,
+    filters: SearchFilters | None = None,
+    candidate_k: int | None = None,
+) -> list[SearchResponse]:
+    """Run hybrid search for many queries with one embedding batch and one _msearch.
+
+    Cached queries are answered from the result cache; the remaining ones
+    are embedded together and all their BM25 and kNN legs are sent in a
+    single _msearch. Returns one SearchResponse per query, in order.
+    """
+    if filters is not None and filters.is_empty():
+        filters = None
+    candidate_k = _candidate_depth(limit, candidate_k)
+
+    responses: list[SearchResponse | None] = [None] * len(queries)
+    pending: list[tuple[int, str, tuple | None]] = []
+    for i, query in enumerate(queries):
+        if not query or not query.strip():
+            responses[i] = SearchResponse(count=0, results=[])
+            continue
+        query = query.strip()
+        cache_key = _cache_key(query, limit, filters, candidate_k)
+        cached = search_result_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            responses[i] = cached.model_copy(deep=True)
+        else:
+            pending.append((i, query, cache_key))
+
+    if pending:
+        with stage("embed"):
+            embeddings = embed_queries([query for _, query, _ in pending])
+        local_index = get_local_vector_index()
+        local_knn = _serves_knn_locally(local_index)
+        legs = 1 if local_knn else 2
+
+        bodies = []
+        for (_, query, _), embedding in zip(pending, embeddings):
+            bodies.append(bm25_body(query, candidate_k, filters))
+            if not local_knn:
+                bodies.append(knn_body(embedding, candidate_k, filters, query))
+
+        try:
+            leg_responses = msearch_responses(get_opensearch_client(), bodies)
+        except OpenSearchConnectionError as exc:
+            if local_index is None:
+                raise
+            logger.warning("OpenSearch unavailable, serving local vector results: %s", exc)
+            for n, (i, _, _) in enumerate(pending):
+                responses[i] = _degraded_response(
+                    local_index, embeddings[n], limit, filters, candidate_k
+                )
+            return responses
+
+        for n, (i, _, cache_key) in enumerate(pending):
+            legs_of_query = leg_responses[legs * n:legs * (n + 1)]
+            if local_knn:
+                knn_hits = _local_knn_hits(local_index, embeddings[n], candidate_k, filters)
+            else:
+                knn_hits = threshold_knn_hits(legs_of_query[1]["hits"]["hits"])
+            response = _build_response(legs_of_query[0]["hits"]["hits"], knn_hits, limit)
+            response.partial = any("error" in leg for leg in legs_of_query)
+            if cache_key is not None and not response.partial:
+                search_result_cache.set(cache_key, response.model_copy(deep=True))
+            responses[i] = response
+
+    return responses
+
+
+async def search_async(
+    query: str,
+    limit: int = 10,
+    filters: SearchFilters | None = None,
+    candidate_k: int | None = None,
+    per_video: int | None = None,
+    facets: bool = False,
+) -> SearchResponse:
+    """Async variant of search() for the API event loop.
+
+    Shares the result cache and stage timings with search() and supports
+    the same per_video and facets options. Returns empty SearchResponse for
+    empty queries.
+    """
+    if not query or not query.strip():
+        return SearchResponse(count=0, results=[])
+
+    query = query.strip()
+
+    if filters is not None and filters.is_empty():
+        filters = None
+
+    start = time.perf_counter()
+    with timing_scope() as timings:
+        response = await _search_async(query, limit, filters, candidate_k, per_video, facets)
+    log_if_slow("search", query, timings, (time.perf_counter() - start) * 1000)
+    return response
+
+
+def _in_executor(executor, fn, *args):
+    """run_in_executor that carries the caller's context into the worker.
+
+    Stage timings live in a ContextVar, which plain run_in_executor does
+    not copy, so stages timed in the worker would miss the request scope.
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, contextvars.copy_context().run, fn, *args)
+
+
+async def _search_async(
+    query: str,
+    limit: int,
+    filters: SearchFilters | None,
+    candidate_k: int | None,
+    per_video: int | None,
+    facets: bool,
+) -> SearchResponse:
+    """Cache lookup and hybrid search for search_async()."""
+    candidate_k = _candidate_depth(limit, candidate_k)
+    with stage("cache"):
+        # The index generation is a blocking Redis read; keep it off the loop
+        cache_key = await asyncio.to_thread(
+            _cache_key, query, limit, filters, candidate_k, per_video=per_video, facets=facets
+        )
+        cached = search_result_cache.get(cache_key) if cache_key is not None else None
+    if cached is not None:
+        return cached.model_copy(deep=True)
+
+    response = await _hybrid_search_async(query, limit, filters, candidate_k, per_video, facets)
+
+    if cache_key is not None and not (response.degraded or response.partial):
+        search_result_cache.set(cache_key, response.model_copy(deep=True))
+    return response
+
+
+async def _hybrid_search_async(
+    query: str,
+    limit: int,
+    filters: SearchFilters | None,
+    candidate_k: int,
+    per_video: int | None = None,
+    facets: bool = False,
+) -> SearchResponse:
+    """Run the uncached hybrid search on AsyncOpenSearch.
+
+    Mirrors _hybrid_search: the query is embedded on the bounded executor,
+    then both legs go out in one _msearch, and a leg that fails is served
+    as a partial response.
+    """
+    client = get_async_opensearch_client()
+    local_index = get_local_vector_index()
+
+    with stage("embed"):
+        query_embedding = await _in_executor(_embedding_executor, embed_query, query)
+
+    bm25_request = bm25_body(query, candidate_k, filters, facets)
+    try:
+        if _serves_knn_locally(local_index):
+            leg_responses, knn_hits = await asyncio.gather(
+                _msearch_responses_async(client, [bm25_request], labels=("bm25",)),
+                _in_executor(
+                    _embedding_executor,
+                    _local_knn_hits, local_index, query_embedding, candidate_k, filters,
+                ),
+            )
+        else:
+            leg_responses = await _msearch_responses_async(
+                client,
+                [bm25_request, knn_body(query_embedding, candidate_k, filters, query)],
+                labels=("bm25", "knn"),
+            )
+            knn_hits = threshold_knn_hits(leg_responses[1]["hits"]["hits"])
+    except OpenSearchConnectionError as exc:
+        if local_index is None:
+            raise
+        logger.warning("OpenSearch unavailable, serving local vector results: %s", exc)
+        return await _in_executor(
+            _embedding_executor,
+            _degraded_response,
+            local_index, query_embedding, limit, filters, candidate_k, per_video,
+        )
+
+    bm25_response = leg_responses[0]
+    response = _build_response(bm25_response["hits"]["hits"], knn_hits, limit, per_video)
+    response.partial = any("error" in leg for leg in leg_responses)
+    if facets:
+        response.facets = _parse_facets(bm25_response.get("aggregations"))
+    return response
@@ -0,0 +1,197 @@
+import base64
+import hashlib
+import json
+import logging
+
+from opensearchpy import NotFoundError, TransportError
+
+from app.core.config import settings
+from app.core.opensearch import SEGMENTS_INDEX, get_opensearch_client
+from app.schemas.search import SearchFilters, SearchPageResponse, SearchResult
+from app.services.embedding import embed_query, normalize_query
+from app.services.search import (
+    apply_rrf,
+    bm25_body,
+    hit_to_result,
+    knn_body,
+    msearch_responses,
+    threshold_knn_hits,
+)
+
+logger = logging.getLogger(__name__)
+
+PAGE_MODES = ("hybrid", "keyword")
+
+# Error type OpenSearch reports for a point in time that no longer exists
+PIT_MISSING_ERROR = "search_context_missing_exception"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or belongs to a different query."""
+
+
+class CursorExpiredError(Exception):
+    """Raised when the point in time behind a cursor has expired."""
+
+
+def _query_fingerprint(query: str, filters: SearchFilters | None, mode: str) -> str:
+    """Short hash binding a cursor to the query that produced it."""
+    filter_key = filters.model_dump_json() if filters is not None else ""
+    raw = f"{mode}\x00{normalize_query(query)}\x00{filter_key}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def encode_cursor(state: dict) -> str:
+    """Serialize cursor state as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> dict:
+    """Parse a cursor token and check it belongs to this query."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError("Malformed cursor")
+    if not isinstance(state, dict) or state.get("fp") != fingerprint or "pit" not in state:
+        raise InvalidCursorError("Cursor does not match this query")
+    return state
+
+
+def _with_pit(body: dict, pit_id: str) -> dict:
+    """Attach a point in time to a search body (PIT searches take no index)."""
+    body["pit"] = {"id": pit_id, "keep_alive": settings.SEARCH_PIT_KEEP_ALIVE}
+    return body
+
+
+def _pit_missing(status, error) -> bool:
+    """Whether an _msearch leg error means the point in time has expired."""
+    if status == 404:
+        return True
+    if isinstance(error, dict):
+        causes = [error, *error.get("root_cause", [])]
+        return any(cause.get("type") == PIT_MISSING_ERROR for cause in causes)
+    return error == PIT_MISSING_ERROR
+
+
+def _release_pit(client, pit_id: str) -> None:
+    """Free the point in time once the last page has been served."""
+    try:
+        client.delete_pit(body={"pit_id": [pit_id]})
+    except Exception as exc:
+        logger.warning("Could not delete point in time: %s", exc)
+
+
+def _keyword_page(
+    client, query: str, limit: int, filters: SearchFilters | None, state: dict
+) -> tuple[list[SearchResult], dict | None]:
+    """One BM25 page: PIT + search_after, so each page costs the same."""
+    body = _with_pit(bm25_body(query, limit, filters), state["pit"])
+    body["sort"] = [{"_score": "desc"}, {"id": "asc"}]
+    body["track_total_hits"] = False
+    if state.get("after"):
+        body["search_after"] = state["after"]
+
+    hits = client.search(body=body)["hits"]["hits"]
+    results = [hit_to_result(hit, hit["sort"][0]) for hit in hits]
+
+    if len(hits) < limit:
+        return results, None
+    return results, {**state, "after": hits[-1]["sort"]}
+
+
+def _hybrid_page(
+    client, query: str, limit: int, filters: SearchFilters | None, state: dict
+) -> tuple[list[SearchResult], dict | None]:
+    """One page of fused results.
+
+    Both legs are re-run against the same point in time with a fixed
+    window (SEARCH_PAGE_WINDOW), so the fused order is identical on every
+    page and each page costs the same regardless of its offset.
+    """
+    window = settings.SEARCH_PAGE_WINDOW
+    query_embedding = embed_query(query)
+    bodies = [
+        _with_pit(bm25_body(query, window, filters), state["pit"]),
+        _with_pit(knn_body(query_embedding, window, filters, query), state["pit"]),
+    ]
+    try:
+        legs = msearch_responses(client, bodies, index=None)
+    except TransportError as exc:
+        if _pit_missing(exc.status_code, exc.error):
+            raise CursorExpiredError("Search cursor has expired")
+        raise
+    # Legs fail individually inside _msearch; an expired point in time must
+    # not read as an empty last page
+    for leg in legs:
+        if "error" in leg and _pit_missing(leg.get("status"), leg["error"]):
+            raise CursorExpiredError("Search cursor has expired")
+
+    bm25_hits, knn_hits = (leg["hits"]["hits"] for leg in legs)
+    knn_hits = threshold_knn_hits(knn_hits)
+    fused = apply_rrf(
+        bm25_hits,
+        knn_hits,
+        k=settings.SEARCH_RRF_K,
+        weights=(settings.SEARCH_BM25_WEIGHT, settings.SEARCH_KNN_WEIGHT),
+    )
+
+    offset = state.get("offset", 0)
+    page = fused[offset:offset + limit]
+    results = [hit_to_result(hit, hit["_rrf_score"]) for hit in page]
+
+    if offset + limit >= len(fused):
+        return results, None
+    return results, {**state, "offset": offset + limit}
+
+
+def search_page(
+    query: str,
+    limit: int = 10,
+    cursor: str | None = None,
+    filters: SearchFilters | None = None,
+    mode: str = "hybrid",
+) -> SearchPageResponse:
+    """Return one page of search results plus a cursor for the next page.
+
+    mode="keyword" pages through BM25 matches without depth limit using a
+    point in time and search_after. mode="hybrid" pages through fused
+    results within the first SEARCH_PAGE_WINDOW candidates of each leg.
+    The point in time pins the index snapshot, so pages never shift while
+    new videos are indexed. next_cursor is None on the last page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or for another query.
+        CursorExpiredError: If the cursor's point in time has expired.
+    """
+    if mode not in PAGE_MODES:
+        raise ValueError(f"Unknown pagination mode: {mode}")
+    if not query or not query.strip():
+        return SearchPageResponse(count=0, results=[])
+
+    query = query.strip()
+    if filters is not None and filters.is_empty():
+        filters = None
+    fingerprint = _query_fingerprint(query, filters, mode)
+
+    client = get_opensearch_client()
+    if cursor:
+        state = decode_cursor(cursor, fingerprint)
+    else:
+        pit = client.create_pit(
+            index=SEGMENTS_INDEX, keep_alive=settings.SEARCH_PIT_KEEP_ALIVE
+        )
+        state = {"fp": fingerprint, "pit": pit["pit_id"]}
+
+    page_fn = _keyword_page if mode == "keyword" else _hybrid_page
+    try:
+        results, next_state = page_fn(client, query, limit, filters, state)
+    except NotFoundError:
+        raise CursorExpiredError("Search cursor has expired")
+
+    if next_state is None:
+        _release_pit(client, state["pit"])
+        next_cursor = None
+    else:
+        next_cursor = encode_cursor(next_state)
+
+    return SearchPageResponse(count=len(results), results=results, next_cursor=next_cursor)
@@ -0,0 +1,117 @@
+import logging
+import re
+from collections import Counter
+
+from app.core.config import settings
+from app.core.opensearch import SEGMENTS_INDEX, SUGGEST_FIELD, get_async_opensearch_client
+
+logger = logging.getLogger(__name__)
+
+# Suggestion weights: titles rank above speakers, phrases by frequency
+TITLE_WEIGHT = 100
+SPEAKER_WEIGHT = 50
+
+# Words a suggested phrase may not start or end with
+_EDGE_STOP_WORDS = frozenset(
+    "a an the is are was were be been being do does did have has had "
+    "will would shall should can could may might must "
+    "i me my we our us you your he she it they them their "
+    "this that these those what which who whom how when where why "
+    "in on at to for of with by from up out about into over after "
+    "and or but not so if then than too also very just "
+    "um uh yeah okay ok like know think going".split()
+)
+
+_WORD = re.compile(r"[a-z][a-z'-]*")
+
+# Diarization labels ("SPEAKER_00"), stored when no real name is known
+_SPEAKER_LABEL = re.compile(r"SPEAKER_\d+")
+
+# The completion FST rejects inputs longer than this
+_MAX_INPUT_CHARS = 50
+
+
+def frequent_phrases(texts: list[str], top_n: int, min_count: int = 2) -> list[tuple[str, int]]:
+    """Most frequent two- and three-word phrases across texts.
+
+    Phrases may not begin or end with a stop word. Returns
+    (phrase, count) pairs, most frequent first.
+    """
+    counts: Counter[str] = Counter()
+    for text in texts:
+        words = _WORD.findall(text.lower())
+        for n in (2, 3):
+            for i in range(len(words) - n + 1):
+                gram = words[i:i + n]
+                if gram[0] in _EDGE_STOP_WORDS or gram[-1] in _EDGE_STOP_WORDS:
+                    continue
+                counts[" ".join(gram)] += 1
+    return [(p, c) for p, c in counts.most_common(top_n) if c >= min_count]
+
+
+def build_suggest_inputs(video_title: str, segments: list) -> list[list[dict]]:
+    """Completion inputs for each segment of one video, in segment order.
+
+    Each suggestion is stored once per video rather than on every segment,
+    keeping the completion FST small: the title on the first segment, each
+    named speaker on their first segment, and each frequent phrase on the
+    segment where it first occurs. Diarization labels like SPEAKER_00 are
+    not names anyone would type, so they are not suggested.
+    """
+    inputs: list[list[dict]] = [[] for _ in segments]
+    if not segments:
+        return inputs
+
+    if video_title:
+        inputs[0].append({"input": video_title[:_MAX_INPUT_CHARS], "weight": TITLE_WEIGHT})
+
+    seen_speakers = set()
+    for i, seg in enumerate(segments):
+        if (
+            seg.speaker
+            and seg.speaker not in seen_speakers
+            and not _SPEAKER_LABEL.fullmatch(seg.speaker)
+        ):
+            seen_speakers.add(seg.speaker)
+            inputs[i].append({"input": seg.speaker[:_MAX_INPUT_CHARS], "weight": SPEAKER_WEIGHT})
+
+    lowered = [seg.text.lower() for seg in segments]
+    phrases = frequent_phrases(lowered, settings.SUGGEST_PHRASES_PER_VIDEO)
+    for phrase, count in phrases:
+        first = next((i for i, text in enumerate(lowered) if phrase in text), 0)
+        inputs[first].append({"input": phrase, "weight": min(count, SPEAKER_WEIGHT - 1)})
+
+    return inputs
+
+
+def _suggest_body(prefix: str, limit: int) -> dict:
+    return {
+        "_source": False,
+        "suggest": {
+            "completions": {
+                "prefix": prefix,
+                "completion": {
+                    "field": SUGGEST_FIELD,
+                    "size": limit,
+                    "skip_duplicates": True,
+                    "fuzzy": {"fuzziness": "AUTO", "prefix_length": 2},
+                },
+            }
+        },
+    }
+
+
+async def suggest(prefix: str, limit: int = 5) -> list[str]:
+    """Complete a partial query from titles, speakers and frequent phrases.
+
+    A single completion-suggester request against the in-memory FST; no
+    embedding or scoring pass, so it is cheap enough to call per keystroke.
+    """
+    prefix = prefix.strip()
+    if not prefix:
+        return []
+
+    client = get_async_opensearch_client()
+    response = await client.search(index=SEGMENTS_INDEX, body=_suggest_body(prefix, limit))
+    options = response.get("suggest", {}).get("completions", [{}])[0].get("options", [])
+    return [option["text"] for option in options]
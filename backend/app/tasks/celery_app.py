@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import settings
 
@@ -25,3 +26,19 @@ celery_app.conf.update(
     task_time_limit=3600,  # 1 hour max per task
     worker_prefetch_multiplier=1,  # For long-running tasks
 )
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """Create the index once per worker process, after the fork."""
+    from app.core.opensearch import bootstrap_segments_index
+
+    bootstrap_segments_index()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs):
+    """Release the worker's pooled OpenSearch connections."""
+    from app.core.opensearch import close_opensearch_client
+
+    close_opensearch_client()
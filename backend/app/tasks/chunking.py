@@ -5,6 +5,7 @@ from app.core.database import SessionLocal
 from app.models.segment import Segment
 from app.schemas.video import VideoStatus
 from app.services.chunking import semantic_chunk
+from app.services.embedding import embedding_model_key, pack_embedding
 from app.services.video import update_status
 from app.tasks.celery_app import celery_app
 
@@ -61,7 +62,9 @@ def chunk_segments(self, video_id: str) -> dict:
         # Delete initial transcription segments
         db.query(Segment).filter(Segment.video_id == vid).delete()
 
-        # Create new Segment records from chunked output
+        # Create new Segment records from chunked output, keeping the final
+        # chunk embeddings so indexing does not encode the same texts again
+        model_key = embedding_model_key()
         for chunk in chunks:
             db_segment = Segment(
                 transcript_id=transcript_id,
@@ -71,6 +74,8 @@ def chunk_segments(self, video_id: str) -> dict:
                 text=chunk["text"],
                 speaker=chunk.get("speaker", "SPEAKER_00"),
                 chunking_method="embedding",
+                embedding=pack_embedding(chunk["embedding"]) if "embedding" in chunk else None,
+                embedding_model=model_key if "embedding" in chunk else None,
             )
             db.add(db_segment)
 
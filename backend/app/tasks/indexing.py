@@ -2,21 +2,89 @@ import logging
 import uuid
 from datetime import datetime
 
+import numpy as np
+
 from app.core.database import SessionLocal
 from app.core.opensearch import (
     SEGMENTS_INDEX,
-    ensure_segments_index,
+    SUGGEST_FIELD,
+    bootstrap_segments_index,
     get_opensearch_client,
+    vector_fields,
 )
 from app.models.segment import Segment
 from app.schemas.video import VideoStatus
-from app.services.embedding import generate_embeddings
+from app.services.embedding import (
+    EMBEDDING_DIMENSION,
+    embedding_model_key,
+    generate_embeddings,
+    pack_embedding,
+    unpack_embedding,
+)
+from app.services.local_vector_index import get_local_vector_index
+from app.services.search import bump_index_generation
+from app.services.suggest import build_suggest_inputs
 from app.services.video import update_status
 from app.tasks.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
 
+def segment_embeddings(segments: list[Segment]) -> np.ndarray:
+    """Embeddings for segments, reusing vectors stored by chunking.
+
+    A stored embedding is reused only if it was produced by the configured
+    model and backend (embedding_model_key), so switching backends never
+    mixes their vectors in the index. The other segments are encoded in
+    one batch, and their vectors are stored on the segment so a retried
+    run reuses them.
+    """
+    model_key = embedding_model_key()
+    matrix = np.empty((len(segments), EMBEDDING_DIMENSION), dtype=np.float32)
+    missing = []
+    for i, seg in enumerate(segments):
+        if (
+            seg.embedding is not None
+            and seg.embedding_model == model_key
+            and len(seg.embedding) == EMBEDDING_DIMENSION * 4
+        ):
+            matrix[i] = unpack_embedding(seg.embedding)
+        else:
+            missing.append(i)
+
+    if missing:
+        encoded = generate_embeddings([segments[i].text for i in missing])
+        for i, embedding in zip(missing, encoded):
+            matrix[i] = embedding
+            segments[i].embedding = pack_embedding(embedding)
+            segments[i].embedding_model = model_key
+
+    logger.info(
+        "Embeddings: reused %d, encoded %d", len(segments) - len(missing), len(missing)
+    )
+    return matrix
+
+
+def segment_document(seg, video, embedding, suggestions: list[dict] | None = None) -> dict:
+    """Build the segments index document for one segment of a video."""
+    doc = {
+        "id": str(seg.id),
+        "video_id": str(seg.video_id),
+        "video_title": video.title,
+        "transcript_id": str(seg.transcript_id),
+        "text": seg.text,
+        **vector_fields(embedding),
+        "start_time": seg.start_time,
+        "end_time": seg.end_time,
+        "speaker": seg.speaker,
+        "recording_date": video.recording_date.isoformat() if video.recording_date else None,
+        "created_at": seg.created_at.isoformat() if seg.created_at else datetime.now().isoformat(),
+    }
+    if suggestions:
+        doc[SUGGEST_FIELD] = suggestions
+    return doc
+
+
 @celery_app.task(name="app.tasks.indexing.index_segments", bind=True, max_retries=2)
 def index_segments(self, video_id: str) -> dict:
     """Generate embeddings and bulk index segments to OpenSearch."""
@@ -43,32 +111,26 @@ def index_segments(self, video_id: str) -> dict:
         if not segments:
             raise ValueError(f"No segments found for video {video_id}")
 
-        # Generate embeddings for all segment texts
-        texts = [seg.text for seg in segments]
-        embeddings = generate_embeddings(texts)
+        # Reuse chunk embeddings; encode only segments that lack one
+        embeddings = segment_embeddings(segments)
 
-        # Create OpenSearch client and ensure index exists
+        # Shared OpenSearch client; the index is normally created at worker
+        # init, but never bulk-write into an auto-created (unmapped) index
         client = get_opensearch_client()
-        ensure_segments_index(client)
+        if not bootstrap_segments_index(client):
+            raise RuntimeError(f"OpenSearch index {SEGMENTS_INDEX} is not available")
+
+        # Search-as-you-type inputs (title, speakers, frequent phrases)
+        suggest_inputs = build_suggest_inputs(video.title, segments)
 
         # Bulk index documents
         bulk_body = []
-        for seg, embedding in zip(segments, embeddings):
-            doc = {
-                "id": str(seg.id),
-                "video_id": str(seg.video_id),
-                "video_title": video.title,
-                "transcript_id": str(seg.transcript_id),
-                "text": seg.text,
-                "embedding": embedding,
-                "start_time": seg.start_time,
-                "end_time": seg.end_time,
-                "speaker": seg.speaker,
-                "recording_date": video.recording_date.isoformat() if video.recording_date else None,
-                "created_at": seg.created_at.isoformat() if seg.created_at else datetime.now().isoformat(),
-            }
+        docs = []
+        for seg, embedding, suggestions in zip(segments, embeddings, suggest_inputs):
+            doc = segment_document(seg, video, embedding, suggestions)
             bulk_body.append({"index": {"_index": SEGMENTS_INDEX, "_id": str(seg.id)}})
             bulk_body.append(doc)
+            docs.append(doc)
 
         if bulk_body:
             response = client.bulk(body=bulk_body, refresh=True)
@@ -80,6 +142,18 @@ def index_segments(self, video_id: str) -> dict:
                 logger.error("Bulk indexing had %d errors", len(failed))
                 raise RuntimeError(f"Bulk indexing failed for {len(failed)} documents")
 
+            # New documents are searchable; drop cached search results
+            bump_index_generation()
+
+            # Keep the local vector index in step; it is a fallback, so a
+            # failed write must not fail indexing
+            local_index = get_local_vector_index()
+            if local_index is not None:
+                try:
+                    local_index.write_video(str(vid), docs, embeddings)
+                except OSError as exc:
+                    logger.warning("Local vector index write failed for %s: %s", video_id, exc)
+
         # Mark segments as indexed in DB
         for seg in segments:
             seg.embedding_indexed = True
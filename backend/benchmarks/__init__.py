@@ -0,0 +1 @@
+# Search and embedding benchmarks (run as modules from backend/, e.g. python -m benchmarks.payload_projection)
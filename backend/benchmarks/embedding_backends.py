@@ -0,0 +1,87 @@
+"""Compare embedding backends on load time, throughput and query latency.
+
+For each backend (see app.services.embedding_backends) reports:
+
+    load s       time to import the runtime and load the model
+    texts/s      document throughput, encoding --texts segment-sized texts
+                 in batches of --batch-size (the chunking/indexing path)
+    query p50    median latency of a single short query (the search path)
+    query p95
+    cosine min   lowest cosine similarity to the torch vectors, when torch
+                 is among the backends measured
+
+Texts are synthetic meeting sentences, so no corpus is needed. The ONNX
+backends need their files exported to EMBEDDING_ONNX_DIR first.
+
+Usage (from backend/):
+    python -m app.services.embedding_backends --export --quantize
+    python -m benchmarks.embedding_backends --backends torch onnx onnx-int8
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from app.services.embedding import EMBEDDING_MODEL_NAME
+from app.services.embedding_backends import get_embedding_backend
+
+_WORDS = (
+    "budget review deployment migration customer roadmap launch security quarter "
+    "database incident latency release feedback hiring design contract invoice "
+    "we should agree the team next week because after before will need to and"
+).split()
+
+
+def synthetic_texts(n: int, seed: int = 0) -> list[str]:
+    """Segment-like sentences of 8-40 words."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(_WORDS, k=rng.randint(8, 40))) for _ in range(n)]
+
+
+def measure(backend: str, texts: list[str], queries: list[str], batch_size: int):
+    start = time.perf_counter()
+    model = get_embedding_backend(backend)(EMBEDDING_MODEL_NAME)
+    load = time.perf_counter() - start
+
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+    start = time.perf_counter()
+    vectors = np.asarray(model.encode(texts, batch_size=batch_size, normalize_embeddings=True))
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        model.encode([query], normalize_embeddings=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+    p50 = statistics.median(latencies)
+    p95 = float(np.percentile(latencies, 95))
+    return load, throughput, p50, p95, vectors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts)
+    queries = [" ".join(t.split()[:4]) for t in synthetic_texts(args.queries, seed=1)]
+
+    print(f"{args.texts} texts, batch {args.batch_size}, {args.queries} single queries")
+    print(f"{'backend':<12}{'load s':>8}{'texts/s':>10}{'query p50':>11}{'query p95':>11}{'cosine min':>12}")
+    reference = None
+    for backend in args.backends:
+        load, throughput, p50, p95, vectors = measure(backend, texts, queries, args.batch_size)
+        if backend == "torch":
+            reference = vectors
+        cosine = f"{np.einsum('ij,ij->i', vectors, reference).min():.4f}" if reference is not None else "-"
+        print(f"{backend:<12}{load:>8.1f}{throughput:>10.1f}{p50:>11.2f}{p95:>11.2f}{cosine:>12}")
+
+
+if __name__ == "__main__":
+    main()
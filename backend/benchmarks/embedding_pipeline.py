@@ -0,0 +1,85 @@
+"""Compare list-based and ndarray-based handling of document embeddings.
+
+Simulates the chunking steps downstream of model.encode for one meeting:
+holding the segment embeddings and computing consecutive-segment
+similarity (chunking step 2). The model's output is synthesized, since
+encoding costs the same either way. Building the bulk JSON is identical
+in both variants (lists are made there either way) and is not measured.
+
+    lists    the previous pipeline: encode output -> .tolist() per row,
+             cosine_similarity rebuilding float64 arrays and norms
+    ndarray  one float32 (n, 768) array; row-wise dot products of the
+             already-normalized rows
+
+Reports wall time and peak Python heap (tracemalloc) per variant.
+
+Usage (from backend/):
+    python -m benchmarks.embedding_pipeline --segments 2400 --rounds 5
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.services.embedding import EMBEDDING_DIMENSION, consecutive_similarities, cosine_similarity
+
+
+def _encode_output(n: int) -> np.ndarray:
+    """Stand-in for model.encode(..., normalize_embeddings=True)."""
+    vecs = np.random.RandomState(0).randn(n, EMBEDDING_DIMENSION).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def list_pipeline(encoded: np.ndarray) -> list:
+    embeddings = [emb.tolist() for emb in encoded]
+    similarities = [
+        cosine_similarity(embeddings[i], embeddings[i + 1]) for i in range(len(embeddings) - 1)
+    ]
+    return [embeddings, similarities]
+
+
+def ndarray_pipeline(encoded: np.ndarray) -> list:
+    embeddings = np.ascontiguousarray(encoded, dtype=np.float32)
+    similarities = consecutive_similarities(embeddings)
+    return [embeddings, similarities]
+
+
+def _measure(fn, encoded: np.ndarray, rounds: int) -> tuple[float, float]:
+    """Median ms per run and peak traced MiB for one run."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(encoded)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    result = fn(encoded.copy())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return statistics.median(timings), peak / 2**20
+
+
+def run(segments: int, rounds: int) -> None:
+    encoded = _encode_output(segments)
+    print(f"{segments} segments x {EMBEDDING_DIMENSION} dims, {rounds} rounds")
+    print(f"{'variant':<10}{'median ms':>12}{'peak MiB':>12}")
+    for name, fn in (("lists", list_pipeline), ("ndarray", ndarray_pipeline)):
+        ms, mib = _measure(fn, encoded, rounds)
+        print(f"{name:<10}{ms:>12.1f}{mib:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    # ~2 hours of speech at one segment every 3 seconds
+    parser.add_argument("--segments", type=int, default=2400)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.segments, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
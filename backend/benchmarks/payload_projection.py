@@ -0,0 +1,120 @@
+"""Measure the cost of returning embeddings in search hit payloads.
+
+Compares full-_source hits (including the 768-float embedding) against hits
+projected to SEARCH_RESULT_FIELDS: serialized size, gzip size (what crosses
+the wire with http_compress) and decompress + JSON parse time.
+
+Usage (from backend/):
+    python -m benchmarks.payload_projection --hits 20 --rounds 200
+    python -m benchmarks.payload_projection --live --query "database migration"
+
+--live runs the kNN leg against OPENSEARCH_URL both ways and reports
+wall-clock latency and response size as well.
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+import uuid
+
+import numpy as np
+
+from app.core.opensearch import SEARCH_RESULT_FIELDS, SEGMENTS_INDEX, project_source
+
+
+def _synthetic_hit(rng: np.random.RandomState) -> dict:
+    """Build one hit shaped like a segments_index document."""
+    vec = rng.randn(768).astype(np.float32)
+    vec /= np.linalg.norm(vec)
+    return {
+        "_index": SEGMENTS_INDEX,
+        "_id": str(uuid.uuid4()),
+        "_score": 0.9,
+        "_source": {
+            "id": str(uuid.uuid4()),
+            "video_id": str(uuid.uuid4()),
+            "video_title": "Architecture Review Meeting",
+            "transcript_id": str(uuid.uuid4()),
+            "text": " ".join(["discussion"] * 120),
+            "embedding": vec.tolist(),
+            "start_time": 120.5,
+            "end_time": 145.0,
+            "speaker": "SPEAKER_00",
+            "recording_date": "2024-06-15",
+            "created_at": "2024-06-15T10:00:00",
+        },
+    }
+
+
+def _project(hit: dict) -> dict:
+    src = {k: v for k, v in hit["_source"].items() if k in SEARCH_RESULT_FIELDS}
+    return {**hit, "_source": src}
+
+
+def _measure(payload: bytes, rounds: int) -> float:
+    """Median seconds to decompress and parse a gzip payload."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        json.loads(gzip.decompress(payload))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_offline(hits: int, rounds: int) -> None:
+    rng = np.random.RandomState(0)
+    full = {"hits": {"hits": [_synthetic_hit(rng) for _ in range(hits)]}}
+    projected = {"hits": {"hits": [_project(h) for h in full["hits"]["hits"]]}}
+
+    print(f"{hits} hits per response, {rounds} rounds")
+    print(f"{'variant':<12}{'json bytes':>12}{'gzip bytes':>12}{'parse ms':>10}")
+    for name, body in (("full", full), ("projected", projected)):
+        raw = json.dumps(body).encode()
+        packed = gzip.compress(raw)
+        parse_ms = _measure(packed, rounds) * 1000
+        print(f"{name:<12}{len(raw):>12}{len(packed):>12}{parse_ms:>10.3f}")
+
+
+def run_live(query: str, k: int, rounds: int) -> None:
+    from app.core.opensearch import get_opensearch_client
+    from app.services.embedding import embed_query
+
+    client = get_opensearch_client()
+    vector = embed_query(query).tolist()
+    base = {"size": k, "query": {"knn": {"embedding": {"vector": vector, "k": k}}}}
+
+    print(f"live kNN k={k}, {rounds} rounds")
+    print(f"{'variant':<12}{'json bytes':>12}{'p50 ms':>10}{'took ms':>10}")
+    for name, body in (("full", dict(base)), ("projected", project_source(dict(base)))):
+        timings, took = [], []
+        size = 0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            resp = client.search(index=SEGMENTS_INDEX, body=body)
+            timings.append(time.perf_counter() - start)
+            took.append(resp["took"])
+            size = len(json.dumps(resp))
+        print(
+            f"{name:<12}{size:>12}{statistics.median(timings) * 1000:>10.2f}"
+            f"{statistics.median(took):>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hits", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--query", default="database migration")
+    args = parser.parse_args()
+
+    if args.live:
+        run_live(args.query, args.hits, args.rounds)
+    else:
+        run_offline(args.hits, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
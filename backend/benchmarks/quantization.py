@@ -0,0 +1,84 @@
+"""Compare the float32 and byte vector profiles offline.
+
+Builds a synthetic corpus of unit-norm 768-d vectors, runs exact
+(brute-force) kNN as ground truth and reports recall@k for:
+
+    int8            ranking by int8 dot product alone
+    int8+rescore    int8 top k*oversample, re-ranked by exact float32 cosine
+
+plus the raw vector memory of each profile. HNSW approximation is not
+modelled; this isolates the quantization error.
+
+Usage (from backend/):
+    python -m benchmarks.quantization --docs 20000 --queries 200 --k 10
+"""
+
+import argparse
+
+import numpy as np
+
+DIMENSION = 768
+
+
+def _unit_vectors(rng: np.random.RandomState, n: int) -> np.ndarray:
+    vecs = rng.randn(n, DIMENSION).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _quantize(vecs: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(vecs * 127.0), -127, 127).astype(np.int8)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    idx = np.argpartition(-scores, k, axis=1)[:, :k]
+    order = np.take_along_axis(scores, idx, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def run(docs: int, queries: int, k: int, oversample: int) -> None:
+    rng = np.random.RandomState(0)
+    corpus = _unit_vectors(rng, docs)
+    # Queries near corpus points, like real questions about indexed content
+    picks = corpus[rng.randint(0, docs, queries)]
+    query_vecs = picks + 0.3 * _unit_vectors(rng, queries)
+    query_vecs /= np.linalg.norm(query_vecs, axis=1, keepdims=True)
+
+    truth = _top_k(query_vecs @ corpus.T, k)
+
+    corpus_q = _quantize(corpus).astype(np.int32)
+    approx_scores = _quantize(query_vecs).astype(np.int32) @ corpus_q.T
+    int8_only = _top_k(approx_scores, k)
+
+    candidates = _top_k(approx_scores, k * oversample)
+    exact = np.einsum("qd,qcd->qc", query_vecs, corpus[candidates])
+    rescored = np.take_along_axis(candidates, _top_k(exact, k), axis=1)
+
+    print(f"{docs} docs, {queries} queries, k={k}, oversample={oversample}")
+    print(f"{'variant':<16}{'recall@k':>10}")
+    print(f"{'int8':<16}{_recall(int8_only, truth):>10.4f}")
+    print(f"{'int8+rescore':<16}{_recall(rescored, truth):>10.4f}")
+
+    float_mb = docs * DIMENSION * 4 / 2**20
+    byte_mb = docs * DIMENSION / 2**20
+    print(f"\n{'profile':<16}{'knn vector MB':>14}")
+    print(f"{'float32':<16}{float_mb:>14.1f}")
+    print(f"{'byte':<16}{byte_mb:>14.1f}  (+{float_mb:.1f} MB on disk in embedding_f32)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversample", type=int, default=4)
+    args = parser.parse_args()
+    run(args.docs, args.queries, args.k, args.oversample)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Hybrid search load benchmark: synthetic corpus, in-process OpenSearch stand-in, concurrent replay."""
@@ -0,0 +1,172 @@
+"""Load-test services.search.search against a synthetic corpus.
+
+Generates --videos x --segments documents (tasks.indexing document shape),
+bulk loads them, then replays a query set through search() from
+--concurrency threads and reports p50/p95/p99 latency, QPS and recall@k
+against brute-force ground truth over the corpus embeddings:
+
+    above cutoff    share of the exact top-k scoring at least KNN_MIN_SCORE;
+                    what the kNN leg's score threshold leaves to find
+    knn recall      kNN leg alone (as search() sees it, rescoring included)
+                    vs exact top-k above the cutoff; measures HNSW and
+                    quantization loss
+    hybrid overlap  fused search() results vs the same ground truth; how
+                    much of the semantic neighbourhood survives fusion
+                    with BM25
+
+By default the corpus is served by an in-process stand-in (exact kNN, no
+network). --opensearch-url loads into a real node instead; point it only
+at a throwaway local container, e.g.
+
+    docker run -d -p 9201:9200 -e discovery.type=single-node \\
+        -e DISABLE_SECURITY_PLUGIN=true opensearchproject/opensearch:2.11.1
+
+The result cache is disabled so every query reaches the search backend.
+Without --model, queries are embedded by the "hashed" embedding backend
+(see benchmarks.search.corpus), matching the corpus vectors.
+
+Usage (from backend/):
+    python -m benchmarks.search --videos 200 --segments 50 --concurrency 8
+    python -m benchmarks.search --opensearch-url http://localhost:9201 --rounds 3
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import app.services.search as search_module
+from app.core.config import settings
+from app.core.opensearch import SEGMENTS_INDEX, ensure_segments_index, set_opensearch_client
+from benchmarks.search.corpus import Corpus, build_corpus, bulk_actions, hashed_embeddings
+from benchmarks.search.inmemory import InMemoryOpenSearch
+
+
+def load(client, corpus: Corpus, batch_size: int = 500) -> float:
+    """Bulk load the corpus as index_segments would; returns seconds taken."""
+    ensure_segments_index(client)
+    start = time.perf_counter()
+    for i in range(0, len(corpus.docs), batch_size):
+        response = client.bulk(body=bulk_actions(corpus.docs[i:i + batch_size], SEGMENTS_INDEX))
+        if response.get("errors"):
+            raise RuntimeError("Bulk load reported errors")
+    client.indices.refresh(index=SEGMENTS_INDEX)
+    return time.perf_counter() - start
+
+
+def ground_truth(
+    corpus: Corpus, k: int, min_score: float = search_module.KNN_MIN_SCORE
+) -> list[set[str]]:
+    """Exact top-k document ids per query by cosine similarity.
+
+    Like the kNN leg, only documents scoring at least min_score on the
+    lucene cosinesimil scale ((1 + cos) / 2) count, so a query can have
+    fewer than k.
+    """
+    scores = (1.0 + corpus.query_embeddings @ corpus.embeddings.T) / 2.0
+    top = np.argsort(-scores, axis=1)[:, :k]
+    return [
+        {corpus.docs[i]["id"] for i in row if query_scores[i] >= min_score}
+        for row, query_scores in zip(top, scores)
+    ]
+
+
+def overlap(found: list[set[str]], truth: list[set[str]]) -> float:
+    """Share of the ground truth ids that were found."""
+    expected = sum(len(ids) for ids in truth)
+    hits = sum(len(ids & expected_ids) for ids, expected_ids in zip(found, truth))
+    return hits / expected if expected else float("nan")
+
+
+def knn_ids(client, corpus: Corpus, k: int) -> list[set[str]]:
+    """Ids returned by the kNN leg alone for each query."""
+    found = []
+    for vector in corpus.query_embeddings:
+        body = search_module.knn_body(vector, k)
+        hits = client.search(index=SEGMENTS_INDEX, body=body)["hits"]["hits"]
+        hits = search_module.threshold_knn_hits(hits)
+        found.append({hit["_id"] for hit in hits})
+    return found
+
+
+def replay(queries: list[str], concurrency: int, limit: int, rounds: int):
+    """Run every query rounds times through search(); returns (latencies ms, results, wall s)."""
+    def timed(query: str):
+        start = time.perf_counter()
+        response = search_module.search(query, limit=limit)
+        return (time.perf_counter() - start) * 1000, response
+
+    workload = queries * rounds
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, queries[:concurrency]))  # warm up
+        start = time.perf_counter()
+        outcomes = list(pool.map(timed, workload))
+        wall = time.perf_counter() - start
+
+    latencies = np.array([ms for ms, _ in outcomes])
+    results = [response for _, response in outcomes[:len(queries)]]
+    return latencies, results, wall
+
+
+def run(args) -> None:
+    if args.model:
+        from app.services.embedding import generate_embeddings
+
+        embed = lambda texts: np.asarray(generate_embeddings(texts), dtype=np.float32)  # noqa: E731
+    else:
+        embed = hashed_embeddings
+        settings.EMBEDDING_BACKEND = "hashed"
+    settings.SEARCH_CACHE_SIZE = 0
+
+    start = time.perf_counter()
+    corpus = build_corpus(args.videos, args.segments, args.queries, seed=args.seed, embed=embed)
+    print(f"corpus: {len(corpus.docs)} segments, {len(corpus.queries)} queries "
+          f"({time.perf_counter() - start:.1f}s to generate)")
+
+    if args.opensearch_url:
+        settings.OPENSEARCH_URL = args.opensearch_url
+        settings.OPENSEARCH_POOL_MAXSIZE = max(args.concurrency, 10)
+        settings.OPENSEARCH_TIMEOUT = 60
+        backend = args.opensearch_url
+    else:
+        set_opensearch_client(InMemoryOpenSearch(delay_ms=args.delay_ms))
+        backend = f"in-process stand-in (delay {args.delay_ms} ms)"
+    client = search_module.get_opensearch_client()
+
+    print(f"loaded into {backend} in {load(client, corpus):.1f}s")
+
+    truth = ground_truth(corpus, args.k)
+    above_cutoff = sum(len(ids) for ids in truth) / (args.k * len(truth))
+    recall = overlap(knn_ids(client, corpus, args.k), truth)
+    latencies, results, wall = replay(corpus.queries, args.concurrency, args.k, args.rounds)
+    hybrid = overlap([{r.segment_id for r in response.results} for response in results], truth)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+
+    print(f"{len(latencies)} searches, concurrency {args.concurrency}, k={args.k}, "
+          f"profile {settings.SEGMENTS_VECTOR_PROFILE}, min score {search_module.KNN_MIN_SCORE}")
+    print(f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'QPS':>10}"
+          f"{'above cutoff':>14}{'knn recall':>12}{'hybrid overlap':>16}")
+    print(f"{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}{len(latencies) / wall:>10.1f}"
+          f"{above_cutoff:>14.3f}{recall:>12.3f}{hybrid:>16.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100)
+    parser.add_argument("--segments", type=int, default=50, help="Segments per video")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over the query set")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--k", type=int, default=10, help="Results per search and recall depth")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--delay-ms", type=float, default=0.0,
+                        help="Simulated round trip per request for the in-process stand-in")
+    parser.add_argument("--opensearch-url", help="Load into and query a real (throwaway) node")
+    parser.add_argument("--model", action="store_true",
+                        help="Embed with the real model instead of hashed word vectors")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Synthetic corpus of videos and segments shaped like indexed documents.
+
+Each video discusses one topic; its segments mix topic words with filler
+speech. Documents are built with tasks.indexing.segment_document, so the
+benchmark loads exactly what index_segments writes.
+
+Embeddings default to a deterministic hashed bag-of-words (one random unit
+vector per word, summed and normalized). Texts sharing words land close
+together, which gives the kNN leg real neighbourhoods to find without
+loading a model. Pass a model-backed embed function for realistic vectors.
+The same embeddings are registered as the "hashed" embedding backend, so
+search() can embed queries with them without a model.
+"""
+
+import uuid
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import cache
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.embedding_backends import register_embedding_backend
+from app.services.suggest import build_suggest_inputs
+from app.tasks.indexing import segment_document
+
+DIMENSION = 768
+
+TOPICS = {
+    "database": "postgres migration schema index vacuum replica query planner table rollback".split(),
+    "deployment": "kubernetes rollout canary pipeline helm container cluster release staging".split(),
+    "budget": "budget forecast spending quarter revenue invoice approval headcount vendor".split(),
+    "security": "password audit firewall certificate token vulnerability patch access breach".split(),
+    "search": "opensearch ranking relevance embedding vector latency recall shard analyzer".split(),
+    "hiring": "candidate interview offer onboarding recruiter resume salary referral role".split(),
+    "frontend": "react component layout accessibility browser render styling bundle router".split(),
+    "roadmap": "milestone priority feature launch deadline scope estimate backlog sprint".split(),
+}
+
+FILLER = (
+    "so we were thinking that maybe we should look at this again next week "
+    "because the team said it would probably take a bit longer than expected "
+    "and honestly I think that is fine as long as everyone agrees on the plan"
+).split()
+
+SPEAKERS = ["Alice", "Bob", "Carol", "Dan", "Erin", "Frank"]
+
+EmbedFn = Callable[[list[str]], np.ndarray]
+
+
+@cache
+def _word_vector(word: str) -> np.ndarray:
+    vec = np.random.RandomState(zlib.crc32(word.encode())).randn(DIMENSION)
+    return (vec / np.linalg.norm(vec)).astype(np.float32)
+
+
+def hashed_embeddings(texts: list[str]) -> np.ndarray:
+    """Deterministic unit-norm embeddings from hashed word vectors."""
+    out = np.zeros((len(texts), DIMENSION), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in text.lower().split():
+            out[i] += _word_vector(word)
+        norm = np.linalg.norm(out[i])
+        if norm:
+            out[i] /= norm
+    return out
+
+
+class HashedEmbeddingModel:
+    """hashed_embeddings behind SentenceTransformer's encode()."""
+
+    def encode(
+        self,
+        texts: list[str],
+        batch_size: int | None = None,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = True,
+    ) -> np.ndarray:
+        return hashed_embeddings(list(texts))
+
+
+@register_embedding_backend("hashed")
+def _load_hashed(model_name: str) -> HashedEmbeddingModel:
+    return HashedEmbeddingModel()
+
+
+@dataclass
+class Corpus:
+    docs: list[dict]
+    embeddings: np.ndarray  # (len(docs), DIMENSION), row i belongs to docs[i]
+    queries: list[str]
+    query_embeddings: np.ndarray
+    videos: list[SimpleNamespace] = field(default_factory=list)
+
+
+def _segment_text(rng: np.random.RandomState, topic_words: list[str], length: int) -> str:
+    words = [
+        topic_words[rng.randint(len(topic_words))] if rng.rand() < 0.4
+        else FILLER[rng.randint(len(FILLER))]
+        for _ in range(length)
+    ]
+    return " ".join(words).capitalize() + "."
+
+
+def build_corpus(
+    videos: int,
+    segments_per_video: int,
+    queries: int,
+    seed: int = 0,
+    embed: EmbedFn = hashed_embeddings,
+    segment_words: int = 40,
+) -> Corpus:
+    """Generate videos x segments_per_video documents plus a query set.
+
+    Queries are three topic words drawn from a random segment, like a user
+    asking about something that was said in a meeting.
+    """
+    rng = np.random.RandomState(seed)
+    topic_names = list(TOPICS)
+
+    all_videos, docs, texts, topic_of_doc = [], [], [], []
+    segments_by_video = []
+    for v in range(videos):
+        topic = topic_names[rng.randint(len(topic_names))]
+        video = SimpleNamespace(
+            id=uuid.UUID(int=rng.randint(2**31) << 64 | v),
+            title=f"{topic.capitalize()} sync #{v}",
+            recording_date=date(2024, 1, 1) + timedelta(days=v % 365),
+        )
+        transcript_id = uuid.uuid4()
+        segments = [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                video_id=video.id,
+                transcript_id=transcript_id,
+                text=_segment_text(rng, TOPICS[topic], segment_words),
+                start_time=s * 30.0,
+                end_time=s * 30.0 + 30.0,
+                speaker=SPEAKERS[rng.randint(len(SPEAKERS))],
+                created_at=None,
+            )
+            for s in range(segments_per_video)
+        ]
+        all_videos.append(video)
+        segments_by_video.append(segments)
+        texts.extend(seg.text for seg in segments)
+        topic_of_doc.extend([topic] * len(segments))
+
+    embeddings = np.asarray(embed(texts), dtype=np.float32)
+
+    row = 0
+    for video, segments in zip(all_videos, segments_by_video):
+        suggestions = build_suggest_inputs(video.title, segments)
+        for seg, suggest in zip(segments, suggestions):
+            docs.append(segment_document(seg, video, embeddings[row], suggest))
+            row += 1
+
+    query_texts = []
+    for _ in range(queries):
+        words = TOPICS[topic_of_doc[rng.randint(len(docs))]]
+        query_texts.append(" ".join(words[i] for i in rng.choice(len(words), 3, replace=False)))
+
+    return Corpus(
+        docs=docs,
+        embeddings=embeddings,
+        queries=query_texts,
+        query_embeddings=np.asarray(embed(query_texts), dtype=np.float32),
+        videos=all_videos,
+    )
+
+
+def bulk_actions(docs: list[dict], index: str) -> list[dict]:
+    """Bulk API body (action, document pairs) as written by index_segments."""
+    body = []
+    for doc in docs:
+        body.append({"index": {"_index": index, "_id": doc["id"]}})
+        body.append(doc)
+    return body
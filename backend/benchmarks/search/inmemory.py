@@ -0,0 +1,227 @@
+"""In-process stand-in for OpenSearch, covering what the search path sends.
+
+Supports bulk loading, search and _msearch with the query shapes built by
+services.search: match on text (BM25), bool must + filter, knn with a
+pre-filter, terms/range filters, size, min_score, _source includes and
+the byte profile's exact rescore (computed here from embedding_f32).
+kNN is exact (brute force), so recall measured against it isolates the
+effect of fusion and query parameters from HNSW approximation; run against
+a real container to include that.
+
+Highlighting, aggregations, suggesters and point-in-time are not modelled
+and come back empty. An optional per-request delay stands in for the
+network round trip.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from app.core.opensearch import EMBEDDING_F32_FIELD, decode_f32
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset("a an and are as at be by for in is it of on or that the this to was we with".split())
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _tokens(text: str) -> list[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOP_WORDS]
+
+
+class _Indices:
+    def __init__(self):
+        self.names: set[str] = set()
+
+    def exists(self, index: str) -> bool:
+        return index in self.names
+
+    def create(self, index: str, body: dict | None = None) -> dict:
+        self.names.add(index)
+        self.names.update((body or {}).get("aliases", {}))
+        return {"acknowledged": True}
+
+    def put_alias(self, index: str, name: str) -> dict:
+        self.names.add(name)
+        return {"acknowledged": True}
+
+    def put_mapping(self, index: str, body: dict) -> dict:
+        return {"acknowledged": True}
+
+    def refresh(self, index: str | None = None) -> dict:
+        return {}
+
+
+class InMemoryOpenSearch:
+    """Single logical segments index held in process memory."""
+
+    def __init__(self, delay_ms: float = 0.0):
+        self.indices = _Indices()
+        self.delay_ms = delay_ms
+        self._lock = threading.Lock()
+        self._docs: dict[str, dict] = {}
+        self._snapshot = None
+
+    # Writes
+
+    def bulk(self, body: list[dict], refresh=None) -> dict:
+        items = []
+        with self._lock:
+            for action, doc in zip(body[::2], body[1::2]):
+                doc_id = action["index"]["_id"]
+                self._docs[doc_id] = doc
+                items.append({"index": {"_id": doc_id, "status": 201}})
+            self._snapshot = None
+        return {"errors": False, "items": items}
+
+    def count(self, index: str | None = None, body: dict | None = None) -> dict:
+        return {"count": len(self._docs)}
+
+    def _view(self) -> dict:
+        """Immutable arrays and postings over the current documents."""
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            ids = list(self._docs)
+            docs = [self._docs[i] for i in ids]
+
+            postings: dict[str, list[tuple[int, int]]] = {}
+            lengths = np.zeros(len(docs), dtype=np.float32)
+            for n, doc in enumerate(docs):
+                terms = Counter(_tokens(doc.get("text", "")))
+                lengths[n] = sum(terms.values())
+                for term, tf in terms.items():
+                    postings.setdefault(term, []).append((n, tf))
+
+            matrix = np.asarray([doc["embedding"] for doc in docs], dtype=np.float32)
+            if len(docs):
+                matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._snapshot = {
+                "ids": ids,
+                "docs": docs,
+                "postings": postings,
+                "lengths": lengths,
+                "avg_length": float(lengths.mean()) if len(docs) else 0.0,
+                "matrix": matrix,
+            }
+            return self._snapshot
+
+    # Reads
+
+    def search(self, index: str | None = None, body: dict | None = None, **kwargs) -> dict:
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+        return self._search(body or {})
+
+    def msearch(self, body: list[dict], index: str | None = None, **kwargs) -> dict:
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+        return {"responses": [self._search(b) for b in body[1::2]]}
+
+    def _search(self, body: dict) -> dict:
+        start = time.perf_counter()
+        view = self._view()
+        scores = self._query(view, body.get("query", {"match_all": {}}))
+
+        min_score = body.get("min_score")
+        if min_score is not None:
+            scores = np.where(scores >= min_score, scores, -np.inf)
+        size = body.get("size", 10)
+        candidates = np.flatnonzero(np.isfinite(scores))
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        if "rescore" in body:
+            order, scores = self._rescore(view, body["rescore"], order, scores)
+        order = order[:size]
+
+        source = body.get("_source")
+        includes = source.get("includes") if isinstance(source, dict) else None
+        hits = []
+        for n in order:
+            doc = view["docs"][n]
+            src = {k: doc.get(k) for k in includes} if includes else dict(doc)
+            hits.append({"_id": view["ids"][n], "_score": float(scores[n]), "_source": src})
+        took = int((time.perf_counter() - start) * 1000)
+        return {"took": took, "hits": {"total": {"value": len(candidates)}, "hits": hits}}
+
+    def _rescore(self, view: dict, rescore: dict, order: np.ndarray, scores: np.ndarray):
+        """Exact cosine rescore of the top window_size, as EXACT_RESCORE_SCRIPT does."""
+        window = order[:rescore["window_size"]]
+        script = rescore["query"]["rescore_query"]["script_score"]["script"]
+        vector = np.asarray(script["params"]["vector"], dtype=np.float32)
+        scores = scores.copy()
+        for n in window:
+            scores[n] = (1.0 + float(decode_f32(view["docs"][n][EMBEDDING_F32_FIELD]) @ vector)) / 2.0
+        window = window[np.argsort(-scores[window], kind="stable")]
+        return np.concatenate([window, order[len(window):]]), scores
+
+    def _query(self, view: dict, query: dict) -> np.ndarray:
+        """Score every document; -inf marks documents that do not match."""
+        n = len(view["docs"])
+        if "match_all" in query:
+            return np.ones(n, dtype=np.float32)
+        if "match" in query:
+            return self._bm25(view, query["match"]["text"]["query"])
+        if "knn" in query:
+            return self._knn(view, query["knn"]["embedding"])
+        if "bool" in query:
+            must = query["bool"].get("must", [])
+            scores = self._query(view, must[0]) if must else np.zeros(n, dtype=np.float32)
+            mask = self._filter_mask(view, query["bool"].get("filter", []))
+            return np.where(mask, scores, -np.inf)
+        raise ValueError(f"Unsupported query: {list(query)}")
+
+    def _bm25(self, view: dict, text: str) -> np.ndarray:
+        n = len(view["docs"])
+        scores = np.full(n, -np.inf, dtype=np.float32)
+        lengths, avg = view["lengths"], view["avg_length"] or 1.0
+        for term in set(_tokens(text)):
+            posting = view["postings"].get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            docs = np.fromiter((d for d, _ in posting), dtype=np.intp, count=len(posting))
+            tf = np.fromiter((t for _, t in posting), dtype=np.float32, count=len(posting))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[docs] / avg)
+            contribution = idf * tf * (BM25_K1 + 1) / (tf + norm)
+            scores[docs] = np.where(np.isfinite(scores[docs]), scores[docs], 0) + contribution
+        return scores
+
+    def _knn(self, view: dict, knn: dict) -> np.ndarray:
+        n = len(view["docs"])
+        scores = np.full(n, -np.inf, dtype=np.float32)
+        if not n:
+            return scores
+        vector = np.asarray(knn["vector"], dtype=np.float32)
+        cosine = view["matrix"] @ (vector / np.linalg.norm(vector))
+        if "filter" in knn:
+            mask = self._filter_mask(view, knn["filter"]["bool"]["filter"])
+            cosine = np.where(mask, cosine, -np.inf)
+        k = min(knn["k"], n)
+        top = np.argpartition(-cosine, k - 1)[:k]
+        top = top[np.isfinite(cosine[top])]
+        scores[top] = (1.0 + cosine[top]) / 2.0
+        return scores
+
+    def _filter_mask(self, view: dict, clauses: list[dict]) -> np.ndarray:
+        mask = np.ones(len(view["docs"]), dtype=bool)
+        for clause in clauses:
+            if "terms" in clause:
+                (name, values), = clause["terms"].items()
+                allowed = set(values)
+                mask &= np.array([doc.get(name) in allowed for doc in view["docs"]])
+            elif "range" in clause:
+                (name, bounds), = clause["range"].items()
+                values = [doc.get(name) for doc in view["docs"]]
+                lo, hi = bounds.get("gte"), bounds.get("lte")
+                mask &= np.array([
+                    v is not None and (lo is None or v >= lo) and (hi is None or v <= hi)
+                    for v in values
+                ])
+            else:
+                raise ValueError(f"Unsupported filter: {list(clause)}")
+        return mask
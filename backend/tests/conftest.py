@@ -78,6 +78,19 @@ def client(db: Session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def _clear_search_caches():
+    """Keep in-process search caches from leaking results between tests."""
+    from app.services.embedding import query_embedding_cache
+    from app.services.search import search_result_cache
+
+    query_embedding_cache.clear()
+    search_result_cache.clear()
+    yield
+    query_embedding_cache.clear()
+    search_result_cache.clear()
+
+
 # ---------------------------------------------------------------------------
 # File / storage fixtures
 # ---------------------------------------------------------------------------
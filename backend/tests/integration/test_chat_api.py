@@ -144,7 +144,9 @@ class TestChatSearchesOpenSearch:
         resp = client.post("/api/chat", json={"message": "What is the deploy strategy?"})
 
         assert resp.status_code == 200
-        mock_search.assert_called_once_with("What is the deploy strategy?")
+        mock_search.assert_called_once_with(
+            "What is the deploy strategy?", filters=None, rerank=True
+        )
 
 
 # ---------------------------------------------------------------------------
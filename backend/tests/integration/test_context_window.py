@@ -0,0 +1,88 @@
+"""Integration tests for neighbour-window context expansion against Postgres."""
+
+import uuid
+from datetime import date
+
+import pytest
+
+from app.models.segment import Segment
+from app.models.transcript import Transcript
+from app.models.video import Video
+from app.schemas.search import SearchResult
+from app.services.context_window import expand_with_neighbours, fetch_neighbours
+
+
+@pytest.fixture()
+def ten_segments(db):
+    """A video with ten consecutive segments, inserted out of time order."""
+    video = Video(
+        id=uuid.uuid4(),
+        title="Window Test Video",
+        file_path="/data/videos/original/fake.mkv",
+        status="ready",
+        recording_date=date(2024, 3, 1),
+    )
+    db.add(video)
+    db.flush()
+
+    transcript = Transcript(
+        id=uuid.uuid4(), video_id=video.id, full_text="", language="en", word_count=0
+    )
+    db.add(transcript)
+    db.flush()
+
+    segments = []
+    for i in reversed(range(10)):
+        seg = Segment(
+            id=uuid.uuid4(),
+            transcript_id=transcript.id,
+            video_id=video.id,
+            start_time=i * 10.0,
+            end_time=i * 10.0 + 10.0,
+            text=f"segment {i}",
+            speaker="SPEAKER_00",
+        )
+        db.add(seg)
+        segments.append(seg)
+    db.flush()
+    return video, sorted(segments, key=lambda s: s.start_time)
+
+
+def _hit(seg: Segment) -> SearchResult:
+    return SearchResult(
+        segment_id=str(seg.id),
+        video_id=str(seg.video_id),
+        video_title="Window Test Video",
+        text=seg.text,
+        start_time=seg.start_time,
+        end_time=seg.end_time,
+        score=0.03,
+        timestamp_formatted="0:00",
+    )
+
+
+class TestFetchNeighbours:
+    def test_single_query_returns_windows(self, db, ten_segments):
+        _, segs = ten_segments
+        rows = fetch_neighbours(db, [_hit(segs[0]), _hit(segs[5])], 1)
+        assert [r.text for r in rows] == ["segment 0", "segment 1", "segment 4",
+                                          "segment 5", "segment 6"]
+
+    def test_overlap_returned_once(self, db, ten_segments):
+        _, segs = ten_segments
+        rows = fetch_neighbours(db, [_hit(segs[3]), _hit(segs[5])], 2)
+        assert [r.pos for r in rows] == [2, 3, 4, 5, 6, 7, 8]
+
+
+class TestExpandWithNeighbours:
+    def test_merged_window(self, db, ten_segments):
+        _, segs = ten_segments
+        expanded = expand_with_neighbours(db, [_hit(segs[4]), _hit(segs[5])], 1)
+
+        assert len(expanded) == 1
+        assert expanded[0].text == (
+            "[0:30] segment 3\n[0:40] segment 4\n[0:50] segment 5\n[1:00] segment 6"
+        )
+        # The first (best) hit's timestamp is kept
+        assert expanded[0].start_time == 40.0
+        assert expanded[0].end_time == 50.0
@@ -46,10 +46,9 @@ def _fake_embeddings(texts):
     result = []
     for text in texts:
         rng = np.random.RandomState(hash(text) % (2**31))
-        vec = rng.randn(768).astype(np.float64)
-        vec = vec / np.linalg.norm(vec)
-        result.append(vec.tolist())
-    return result
+        vec = rng.randn(768).astype(np.float32)
+        result.append(vec / np.linalg.norm(vec))
+    return np.array(result, dtype=np.float32)
 
 
 @pytest.fixture()
@@ -400,6 +399,8 @@ def test_chunking_creates_segments(
     for seg in new_segments:
         assert seg.transcript_id == transcript.id
         assert seg.chunking_method == "embedding"
+        # Final chunk embedding is kept for indexing
+        assert len(seg.embedding) == 768 * 4
 
 
 # ---------------------------------------------------------------------------
@@ -515,3 +516,35 @@ def test_chunk_embeddings_generated(
     segments = db.query(Segment).filter(Segment.video_id == video.id).all()
     for seg in segments:
         assert seg.embedding_indexed is True
+
+
+@patch("app.tasks.indexing.get_opensearch_client")
+@patch("app.tasks.indexing.generate_embeddings")
+def test_indexing_reuses_chunk_embeddings(
+    mock_generate, mock_get_client, db, chunking_video_with_segments
+):
+    """Segments carrying a chunking embedding are indexed without re-encoding."""
+    from app.services.embedding import pack_embedding
+    from app.tasks.indexing import index_segments
+
+    video, transcript = chunking_video_with_segments
+    segments = db.query(Segment).filter(Segment.video_id == video.id).all()
+    stored = np.zeros(768, dtype=np.float32)
+    stored[0] = 1.0
+    for seg in segments:
+        seg.embedding = pack_embedding(stored)
+    db.flush()
+
+    mock_os_client = MagicMock()
+    mock_os_client.indices.exists.return_value = True
+    mock_os_client.bulk.return_value = {"errors": False, "items": []}
+    mock_get_client.return_value = mock_os_client
+
+    with patch("app.tasks.indexing.SessionLocal", return_value=db), \
+         patch.object(db, "close"):
+        index_segments(str(video.id))
+
+    mock_generate.assert_not_called()
+    bulk_body = mock_os_client.bulk.call_args[1].get("body") or mock_os_client.bulk.call_args[0][0]
+    for doc in bulk_body[1::2]:
+        assert doc["embedding"][0] == 1.0
@@ -17,8 +17,8 @@ from app.services.search import search
 def test_date_in_search_context():
     """V4-I01: Search results include recording_date field from indexed segments."""
     with patch("app.services.search.get_opensearch_client") as mock_client_fn, \
-         patch("app.services.search.generate_embeddings") as mock_embed:
-        mock_embed.return_value = [[0.1] * 768]
+         patch("app.services.search.embed_query") as mock_embed:
+        mock_embed.return_value = [0.1] * 768
         mock_client = MagicMock()
         mock_client_fn.return_value = mock_client
         mock_client.indices.exists.return_value = True
@@ -37,10 +37,12 @@ def test_date_in_search_context():
                 "recording_date": "2024-03-01",
             },
         }
-        mock_client.search.side_effect = [
-            {"hits": {"hits": [hit]}},
-            {"hits": {"hits": [hit]}},
-        ]
+        mock_client.msearch.return_value = {
+            "responses": [
+                {"hits": {"hits": [hit]}},
+                {"hits": {"hits": [hit]}},
+            ]
+        }
 
         result = search("recording dates", limit=5)
 
@@ -59,8 +61,8 @@ def test_date_in_chat_context():
     # Verify indexing task includes recording_date in document
     # (Chat context files are built from indexed segment data)
     import inspect
-    from app.tasks.indexing import index_segments
-    source = inspect.getsource(index_segments)
+    from app.tasks.indexing import segment_document
+    source = inspect.getsource(segment_document)
     assert "recording_date" in source, "indexing task must include recording_date in documents"
 
 
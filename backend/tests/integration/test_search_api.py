@@ -19,7 +19,7 @@ import pytest
 from opensearchpy import OpenSearch
 
 from app.core.opensearch import SEGMENTS_INDEX, get_opensearch_client
-from app.schemas.search import SearchResponse
+from app.schemas.search import SearchFilters, SearchResponse
 
 
 class TestSearchEndpointEmpty:
@@ -74,14 +74,40 @@ class TestSearchEndpointWithResults:
         assert data["results"][0]["segment_id"] == "seg1"
         assert data["results"][0]["video_id"] == "vid1"
         assert data["results"][0]["timestamp_formatted"] == "1:00"
-        mock_search.assert_called_once_with("test query", limit=10)
+        mock_search.assert_called_once_with(
+            "test query", limit=10, filters=SearchFilters(), per_video=None, facets=False
+        )
 
     @patch("app.api.routes.search.search_service")
     def test_respects_limit_param(self, mock_search, client):
         mock_search.return_value = SearchResponse(count=0, results=[])
         resp = client.get("/api/search", params={"q": "hello", "limit": 5})
         assert resp.status_code == 200
-        mock_search.assert_called_once_with("hello", limit=5)
+        mock_search.assert_called_once_with(
+            "hello", limit=5, filters=SearchFilters(), per_video=None, facets=False
+        )
+
+    @patch("app.api.routes.search.search_service")
+    def test_passes_filters(self, mock_search, client):
+        mock_search.return_value = SearchResponse(count=0, results=[])
+        resp = client.get("/api/search", params={
+            "q": "hello",
+            "video_id": ["v1", "v2"],
+            "speaker": "Alice",
+            "date_from": "2024-01-01",
+            "date_to": "2024-02-01",
+        })
+        assert resp.status_code == 200
+        filters = mock_search.call_args.kwargs["filters"]
+        assert filters.video_ids == ["v1", "v2"]
+        assert filters.speakers == ["Alice"]
+        assert str(filters.date_from) == "2024-01-01"
+
+    def test_inverted_date_range_rejected(self, client):
+        resp = client.get("/api/search", params={
+            "q": "hello", "date_from": "2024-02-01", "date_to": "2024-01-01",
+        })
+        assert resp.status_code == 422
 
     def test_limit_validation_min(self, client):
         resp = client.get("/api/search", params={"q": "test", "limit": 0})
@@ -92,6 +118,55 @@ class TestSearchEndpointWithResults:
         assert resp.status_code == 422
 
 
+class TestBatchSearchEndpoint:
+    """POST /api/search/batch runs several queries in one call."""
+
+    @patch("app.api.routes.search.search_batch_service")
+    def test_returns_one_response_per_query(self, mock_batch, client):
+        mock_batch.return_value = [
+            SearchResponse(count=0, results=[]),
+            SearchResponse(count=0, results=[]),
+        ]
+        resp = client.post("/api/search/batch", json={"queries": ["a", "b"], "limit": 3})
+        assert resp.status_code == 200
+        assert len(resp.json()["responses"]) == 2
+        mock_batch.assert_called_once_with(["a", "b"], limit=3, filters=None)
+
+    def test_empty_batch_rejected(self, client):
+        resp = client.post("/api/search/batch", json={"queries": []})
+        assert resp.status_code == 422
+
+
+class TestSearchPageEndpoint:
+    """GET /api/search/page returns a cursor for the next page."""
+
+    @patch("app.api.routes.search.search_page_service")
+    def test_returns_next_cursor(self, mock_page, client):
+        from app.schemas.search import SearchPageResponse
+
+        mock_page.return_value = SearchPageResponse(count=0, results=[], next_cursor="abc")
+        resp = client.get("/api/search/page", params={"q": "hello", "mode": "keyword"})
+        assert resp.status_code == 200
+        assert resp.json()["next_cursor"] == "abc"
+        assert mock_page.call_args.kwargs["mode"] == "keyword"
+
+    @patch("app.api.routes.search.search_page_service")
+    def test_invalid_cursor_returns_400(self, mock_page, client):
+        from app.services.search_pagination import InvalidCursorError
+
+        mock_page.side_effect = InvalidCursorError("Cursor does not match this query")
+        resp = client.get("/api/search/page", params={"q": "hello", "cursor": "zzz"})
+        assert resp.status_code == 400
+
+    @patch("app.api.routes.search.search_page_service")
+    def test_expired_cursor_returns_410(self, mock_page, client):
+        from app.services.search_pagination import CursorExpiredError
+
+        mock_page.side_effect = CursorExpiredError()
+        resp = client.get("/api/search/page", params={"q": "hello", "cursor": "zzz"})
+        assert resp.status_code == 410
+
+
 class TestSearchEndpointErrors:
     """Test error handling in search endpoint."""
 
@@ -120,9 +195,9 @@ def _deterministic_embedding(text: str) -> list[float]:
     return vec.tolist()
 
 
-def _mock_generate_embeddings(texts: list[str]) -> list[list[float]]:
-    """Mock for generate_embeddings that returns deterministic vectors."""
-    return [_deterministic_embedding(t) for t in texts]
+def _mock_embed_query(query: str) -> list[float]:
+    """Mock for embed_query that returns deterministic vectors."""
+    return _deterministic_embedding(query)
 
 
 # ---------------------------------------------------------------------------
@@ -222,7 +297,7 @@ def opensearch_with_docs():
 class TestSearchFindsKeywordMatch:
     """S1-I01: Query with known keyword returns matching segment."""
 
-    @patch("app.services.search.generate_embeddings", side_effect=_mock_generate_embeddings)
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
     def test_search_finds_keyword_match(self, mock_embed, opensearch_with_docs, client):
         resp = client.get("/api/search", params={"q": "Alembic migration"})
         assert resp.status_code == 200
@@ -240,7 +315,7 @@ class TestSearchFindsKeywordMatch:
 class TestSearchFindsSemanticMatch:
     """S1-I02: Conceptual query returns semantically relevant segment."""
 
-    @patch("app.services.search.generate_embeddings", side_effect=_mock_generate_embeddings)
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
     def test_search_finds_semantic_match(self, mock_embed, opensearch_with_docs, client):
         # Query about "database schema changes" should match the Alembic segment
         resp = client.get("/api/search", params={"q": "database schema changes"})
@@ -264,7 +339,7 @@ class TestSearchNoResults:
     To test true "no results", we temporarily clear the index.
     """
 
-    @patch("app.services.search.generate_embeddings", side_effect=_mock_generate_embeddings)
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
     def test_search_no_results(self, mock_embed, opensearch_with_docs, client):
         os_client = opensearch_with_docs
 
@@ -300,7 +375,7 @@ class TestSearchNoResults:
 class TestSearchAcrossVideos:
     """S1-I04: Multi-video search returns results from multiple videos."""
 
-    @patch("app.services.search.generate_embeddings", side_effect=_mock_generate_embeddings)
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
     def test_search_across_videos(self, mock_embed, opensearch_with_docs, client):
         # "Alembic" appears in docs from both Video A and Video B
         resp = client.get("/api/search", params={"q": "Alembic"})
@@ -311,6 +386,32 @@ class TestSearchAcrossVideos:
         assert len(video_ids) >= 2, f"Expected results from multiple videos, got {video_ids}"
 
 
+# ---------------------------------------------------------------------------
+# Filtered search
+# ---------------------------------------------------------------------------
+
+
+class TestSearchWithFilters:
+    """Filters restrict both legs to matching segments."""
+
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
+    def test_video_filter(self, mock_embed, opensearch_with_docs, client):
+        resp = client.get("/api/search", params={"q": "Alembic", "video_id": _VIDEO_B_ID})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] >= 1
+        assert {r["video_id"] for r in data["results"]} == {_VIDEO_B_ID}
+
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
+    def test_date_range_filter(self, mock_embed, opensearch_with_docs, client):
+        resp = client.get("/api/search", params={
+            "q": "Alembic migration", "date_from": "2024-06-18",
+        })
+        assert resp.status_code == 200
+        for result in resp.json()["results"]:
+            assert result["recording_date"] >= "2024-06-18"
+
+
 # ---------------------------------------------------------------------------
 # S1-I05: OpenSearch index mapping (live verification)
 # ---------------------------------------------------------------------------
@@ -321,8 +422,9 @@ class TestOpenSearchIndexMapping:
 
     def test_opensearch_index_mapping(self, opensearch_with_docs):
         client = opensearch_with_docs
+        # TEST_INDEX is an alias; responses are keyed by the physical index
         mapping = client.indices.get_mapping(index=TEST_INDEX)
-        idx_mapping = mapping[TEST_INDEX]["mappings"]
+        idx_mapping = next(iter(mapping.values()))["mappings"]
 
         # kNN vector field
         emb_props = idx_mapping["properties"]["embedding"]
@@ -335,7 +437,7 @@ class TestOpenSearchIndexMapping:
 
         # kNN enabled in settings
         settings_resp = client.indices.get_settings(index=TEST_INDEX)
-        idx_settings = settings_resp[TEST_INDEX]["settings"]["index"]
+        idx_settings = next(iter(settings_resp.values()))["settings"]["index"]
         assert idx_settings["knn"] == "true"
 
 
@@ -347,7 +449,7 @@ class TestOpenSearchIndexMapping:
 class TestSearchResultsIncludeTimestamps:
     """S3-I01: start_time float value present in results."""
 
-    @patch("app.services.search.generate_embeddings", side_effect=_mock_generate_embeddings)
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
     def test_search_results_include_timestamps(self, mock_embed, opensearch_with_docs, client):
         resp = client.get("/api/search", params={"q": "Alembic migration"})
         assert resp.status_code == 200
@@ -369,7 +471,7 @@ class TestSearchResultsIncludeTimestamps:
 class TestSearchResultsIncludeVideoId:
     """S3-I02: video_id UUID present in results."""
 
-    @patch("app.services.search.generate_embeddings", side_effect=_mock_generate_embeddings)
+    @patch("app.services.search.embed_query", side_effect=_mock_embed_query)
     def test_search_results_include_video_id(self, mock_embed, opensearch_with_docs, client):
         resp = client.get("/api/search", params={"q": "Alembic migration"})
         assert resp.status_code == 200
@@ -407,6 +407,37 @@ class TestHandleChatMessage:
         assert "couldn't find any relevant information" in response.message
         mock_claude.query.assert_not_called()
 
+    @patch("app.services.chat.search")
+    @patch("app.services.chat.claude")
+    def test_handle_chat_uses_rerank_scores(self, mock_claude, mock_search, tmp_path, monkeypatch):
+        """Reranked results are filtered by cross-encoder score, not keyword overlap."""
+        monkeypatch.setattr("app.services.chat.TEMP_DIR", tmp_path)
+
+        mock_search.return_value = SearchResponse(count=2, results=[
+            # No literal keyword overlap, but judged relevant by the cross-encoder
+            _make_search_result(segment_id="seg-1", text="We moved sign-in to Cognito.",
+                                rerank_score=0.9),
+            _make_search_result(segment_id="seg-2", text="Lunch order for the offsite.",
+                                rerank_score=0.02),
+        ])
+        mock_claude.query.return_value = MagicMock(result="Cognito.", conversation_id="c")
+
+        captured = {}
+        real_prepare = prepare_context_file
+
+        def _capture(segments, query):
+            captured["ids"] = [s.segment_id for s in segments]
+            return real_prepare(segments, query)
+
+        monkeypatch.setattr("app.services.chat.prepare_context_file", _capture)
+
+        handle_chat_message("Which authentication provider?")
+
+        mock_search.assert_called_once_with(
+            "Which authentication provider?", filters=None, rerank=True
+        )
+        assert captured["ids"] == ["seg-1"]
+
     @patch("app.services.chat.search")
     @patch("app.services.chat.claude")
     def test_handle_chat_cleanup_on_error(self, mock_claude, mock_search, tmp_path, monkeypatch):
@@ -482,6 +513,30 @@ class TestKeywordOverlap:
         assert len(filtered) == 1
         assert filtered[0].segment_id == "seg-1"
 
+    def test_uses_highlighted_analyzer_matches(self):
+        """Stemmed matches count; substring-only matches do not."""
+        results = [
+            _make_search_result(
+                segment_id="seg-1",
+                text="The budgets were approved.",
+                highlights=["The <mark>budgets</mark> were approved."],
+            ),
+            _make_search_result(segment_id="seg-2", text="Parking was approved.", highlights=[]),
+            # OpenSearch found no analyzer match, despite the substring
+            _make_search_result(segment_id="seg-3", text="A budgetary note.", highlights=[]),
+            # Local vector index hit: substring scan
+            _make_search_result(segment_id="seg-4", text="A budget note."),
+        ]
+        filtered = _filter_by_keyword_overlap("budget", results)
+        assert [r.segment_id for r in filtered] == ["seg-1", "seg-4"]
+
+    def test_highlighted_stop_words_ignored(self):
+        results = [_make_search_result(
+            text="We discussed it at the meeting.",
+            highlights=["We discussed it at the <mark>meeting</mark>."],
+        )]
+        assert _filter_by_keyword_overlap("parking meeting", results) == []
+
 
 # ---------------------------------------------------------------------------
 # Utility tests
@@ -19,10 +19,9 @@ def _fake_embeddings(texts):
     result = []
     for text in texts:
         rng = np.random.RandomState(hash(text) % (2**31))
-        vec = rng.randn(768).astype(np.float64)
-        vec = vec / np.linalg.norm(vec)
-        result.append(vec.tolist())
-    return result
+        vec = rng.randn(768).astype(np.float32)
+        result.append(vec / np.linalg.norm(vec))
+    return np.array(result, dtype=np.float32)
 
 
 def _make_segment(text, start_time, end_time, speaker="SPEAKER_00"):
@@ -125,9 +124,9 @@ def test_semantic_boundary_detection(mock_embed):
     """C1-U04: Chunks split at topic boundary when similarity is low."""
     # Two groups of segments on very different topics.
     # We control embeddings so group A is similar to itself and different from group B.
-    vec_a = np.zeros(768)
+    vec_a = np.zeros(768, dtype=np.float32)
     vec_a[0] = 1.0  # unit vector pointing in one direction
-    vec_b = np.zeros(768)
+    vec_b = np.zeros(768, dtype=np.float32)
     vec_b[1] = 1.0  # orthogonal unit vector
 
     # First call: per-segment embeddings; second call: per-chunk re-embeddings
@@ -136,10 +135,10 @@ def test_semantic_boundary_detection(mock_embed):
         result = []
         for t in texts:
             if "cooking" in t.lower() or "recipe" in t.lower():
-                result.append(vec_b.tolist())
+                result.append(vec_b)
             else:
-                result.append(vec_a.tolist())
-        return result
+                result.append(vec_a)
+        return np.array(result)
 
     mock_embed.side_effect = side_effect
 
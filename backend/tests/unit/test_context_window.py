@@ -0,0 +1,92 @@
+"""Unit tests for neighbour-window context expansion."""
+
+import uuid
+from collections import namedtuple
+from unittest.mock import MagicMock, patch
+
+from app.schemas.search import SearchResult
+from app.services.context_window import expand_with_neighbours
+
+Row = namedtuple("Row", "id video_id start_time end_time text speaker pos")
+
+VIDEO_A = uuid.uuid4()
+VIDEO_B = uuid.uuid4()
+IDS = [uuid.uuid4() for _ in range(8)]
+
+
+def _row(i, video=VIDEO_A, speaker="SPEAKER_00"):
+    return Row(IDS[i], video, i * 10.0, i * 10.0 + 10.0, f"s{i}", speaker, i + 1)
+
+
+def _hit(i, video=VIDEO_A, score=0.03):
+    return SearchResult(
+        segment_id=str(IDS[i]),
+        video_id=str(video),
+        video_title="Video",
+        text=f"s{i}",
+        start_time=i * 10.0,
+        end_time=i * 10.0 + 10.0,
+        speaker="SPEAKER_00",
+        recording_date="2024-06-15",
+        score=score,
+        timestamp_formatted=f"{i * 10 // 60}:{i * 10 % 60:02d}",
+    )
+
+
+class TestExpandWithNeighbours:
+    def test_window_zero_is_noop(self):
+        hits = [_hit(1)]
+        assert expand_with_neighbours(MagicMock(), hits, 0) is hits
+
+    @patch("app.services.context_window.fetch_neighbours")
+    def test_overlapping_windows_merge(self, mock_fetch):
+        # Hits at positions 2 and 4 with window 1 cover 1..5 as one run
+        mock_fetch.return_value = [_row(i) for i in range(1, 6)]
+        hits = [_hit(4, score=0.05), _hit(2, score=0.04)]
+
+        expanded = expand_with_neighbours(MagicMock(), hits, 1)
+
+        assert len(expanded) == 1
+        merged = expanded[0]
+        assert merged.text == "[0:10] s1\n[0:20] s2\n[0:30] s3\n[0:40] s4\n[0:50] s5"
+        # Timestamps stay on the best hit, not the start of the window
+        assert merged.start_time == 40.0
+        assert merged.end_time == 50.0
+        assert merged.timestamp_formatted == "0:40"
+        # Carries the highest-ranked hit's id and score
+        assert merged.segment_id == str(IDS[4])
+        assert merged.score == 0.05
+        assert mock_fetch.call_count == 1
+
+    @patch("app.services.context_window.fetch_neighbours")
+    def test_separate_runs_keep_hit_order(self, mock_fetch):
+        mock_fetch.return_value = [
+            _row(0), _row(1),
+            _row(5), _row(6),
+            _row(3, video=VIDEO_B), _row(4, video=VIDEO_B),
+        ]
+        hits = [_hit(4, video=VIDEO_B), _hit(6), _hit(0)]
+
+        expanded = expand_with_neighbours(MagicMock(), hits, 1)
+
+        assert [r.text for r in expanded] == [
+            "[0:30] s3\n[0:40] s4", "[0:50] s5\n[1:00] s6", "[0:00] s0\n[0:10] s1",
+        ]
+
+    @patch("app.services.context_window.fetch_neighbours")
+    def test_mixed_speakers_are_labelled(self, mock_fetch):
+        mock_fetch.return_value = [_row(1, speaker="Alice"), _row(2, speaker="Bob")]
+
+        expanded = expand_with_neighbours(MagicMock(), [_hit(2)], 1)
+
+        assert expanded[0].text == "[0:10] Alice: s1\n[0:20] Bob: s2"
+        assert expanded[0].speaker is None
+
+    @patch("app.services.context_window.fetch_neighbours")
+    def test_missing_hits_pass_through(self, mock_fetch):
+        mock_fetch.return_value = [_row(1), _row(2)]
+        hits = [_hit(7), _hit(2)]
+
+        expanded = expand_with_neighbours(MagicMock(), hits, 1)
+
+        assert [r.text for r in expanded] == ["s7", "[0:10] s1\n[0:20] s2"]
@@ -4,7 +4,18 @@ from unittest.mock import MagicMock, patch
 
 import numpy as np
 
-from app.services.embedding import cosine_similarity, generate_embeddings
+from app.core.cache import LRUCache
+from app.services.embedding import (
+    _redis_get,
+    _redis_set,
+    consecutive_similarities,
+    cosine_similarity,
+    embed_queries,
+    embed_query,
+    generate_embeddings,
+    normalize_query,
+    query_embedding_cache,
+)
 
 
 def _make_mock_model():
@@ -48,20 +59,116 @@ def test_batch_embedding(mock_load):
     texts = ["First sentence", "Second sentence", "Third sentence"]
     embeddings = generate_embeddings(texts)
 
-    assert len(embeddings) == 3
-    for emb in embeddings:
-        assert len(emb) == 768
-        assert all(isinstance(v, float) for v in emb)
+    assert embeddings.shape == (3, 768)
+    assert embeddings.dtype == np.float32
+    assert embeddings.flags["C_CONTIGUOUS"]
 
 
 @patch("app.services.embedding.load_embedding_model")
 def test_embedding_empty_list(mock_load):
-    """generate_embeddings returns empty list for empty input."""
+    """generate_embeddings returns an empty (0, 768) array for empty input."""
     result = generate_embeddings([])
-    assert result == []
+    assert result.shape == (0, 768)
     mock_load.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# Query embedding cache tests
+# ---------------------------------------------------------------------------
+
+
+def test_normalize_query():
+    """Whitespace is collapsed and case folded."""
+    assert normalize_query("  Database   Migration ") == "database migration"
+
+
+@patch("app.services.embedding.load_embedding_model")
+def test_embed_query_cache_hit_skips_model(mock_load):
+    """A repeated query is served from cache without running the model."""
+    query_embedding_cache.clear()
+    model = _make_mock_model()
+    model.encode = MagicMock(side_effect=model.encode)
+    mock_load.return_value = model
+
+    first = embed_query("Database migration")
+    second = embed_query("  database   MIGRATION")
+
+    assert second is first
+    assert first.dtype == np.float32
+    assert first.shape == (768,)
+    assert not first.flags.writeable
+    model.encode.assert_called_once()
+    assert query_embedding_cache.hits == 1
+    assert query_embedding_cache.misses == 1
+    query_embedding_cache.clear()
+
+
+@patch("app.services.embedding.load_embedding_model")
+def test_embed_queries_single_batch(mock_load):
+    """Cache misses are encoded together; duplicates are encoded once."""
+    query_embedding_cache.clear()
+    model = _make_mock_model()
+    model.encode = MagicMock(side_effect=model.encode)
+    mock_load.return_value = model
+
+    embed_query("cached one")
+    vectors = embed_queries(["Cached one", "new one", "NEW one", "other"])
+
+    assert len(vectors) == 4
+    np.testing.assert_array_equal(vectors[1], vectors[2])
+    assert model.encode.call_count == 2
+    assert model.encode.call_args[0][0] == ["new one", "other"]
+    query_embedding_cache.clear()
+
+
+@patch("app.services.embedding._redis_get")
+@patch("app.services.embedding.load_embedding_model")
+def test_embed_query_redis_tier(mock_load, mock_redis_get, monkeypatch):
+    """With the Redis tier enabled, an L1 miss is served from Redis."""
+    query_embedding_cache.clear()
+    monkeypatch.setattr("app.services.embedding.settings.QUERY_EMBEDDING_CACHE_REDIS", True)
+    mock_redis_get.return_value = np.full(768, 0.5, dtype=np.float32)
+
+    np.testing.assert_array_equal(embed_query("shared query"), np.full(768, 0.5))
+    mock_load.assert_not_called()
+    query_embedding_cache.clear()
+
+
+@patch("app.services.embedding.get_redis_client")
+def test_redis_tier_stores_float32_bytes(mock_client):
+    """Vectors round-trip through Redis as raw float32 bytes."""
+    stored = {}
+    mock_client.return_value.set.side_effect = lambda key, value, ex=None: stored.update({key: value})
+    mock_client.return_value.get.side_effect = stored.get
+    vector = np.linspace(-1, 1, 768, dtype=np.float32)
+
+    _redis_set("q", vector)
+
+    assert stored["query_embedding:q"] == vector.tobytes()
+    np.testing.assert_array_equal(_redis_get("q"), vector)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    now[0] += 61
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
 # ---------------------------------------------------------------------------
 # Cosine similarity tests
 # ---------------------------------------------------------------------------
@@ -107,3 +214,17 @@ def test_cosine_similarity_zero_vector():
     zero = [0.0] * 768
     sim = cosine_similarity(vec, zero)
     assert sim == 0.0
+
+
+def test_consecutive_similarities_match_cosine():
+    """Row-wise dot products equal cosine similarity for normalized rows."""
+    rng = np.random.RandomState(0)
+    vecs = rng.randn(5, 768).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+
+    sims = consecutive_similarities(vecs)
+
+    assert sims.shape == (4,)
+    for i, sim in enumerate(sims):
+        assert abs(sim - cosine_similarity(vecs[i], vecs[i + 1])) < 1e-5
+    assert consecutive_similarities(vecs[:1]).shape == (0,)
@@ -0,0 +1,172 @@
+"""Tests for the embedding backend registry and the ONNX Runtime backend."""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+import app.services.embedding as embedding_module
+from app.core.config import settings
+from app.services.embedding import EMBEDDING_MODEL_NAME, embedding_model_key, load_embedding_model
+from app.services.embedding_backends import (
+    _BACKENDS,
+    OnnxEmbeddingModel,
+    export_onnx,
+    get_embedding_backend,
+    register_embedding_backend,
+)
+
+
+@pytest.fixture
+def fresh_model():
+    """Unload the cached model before and after the test."""
+    with patch.object(embedding_module, "_embedding_model", None):
+        yield
+
+
+class TestRegistry:
+    def test_builtin_backends_registered(self):
+        assert {"torch", "onnx", "onnx-int8"} <= set(_BACKENDS)
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown embedding backend 'tf'"):
+            get_embedding_backend("tf")
+
+    def test_register_custom_backend(self):
+        loader = MagicMock()
+        with patch.dict(_BACKENDS):
+            register_embedding_backend("fake")(loader)
+            assert get_embedding_backend("fake") is loader
+        assert "fake" not in _BACKENDS
+
+    def test_load_uses_configured_backend(self, fresh_model):
+        loader = MagicMock()
+        with patch.dict(_BACKENDS, {"fake": loader}), \
+                patch.object(settings, "EMBEDDING_BACKEND", "fake"):
+            model = load_embedding_model()
+
+        loader.assert_called_once_with(EMBEDDING_MODEL_NAME)
+        assert model is loader.return_value
+
+    def test_explicit_backend_overrides_setting(self, fresh_model):
+        loader = MagicMock()
+        with patch.dict(_BACKENDS, {"fake": loader}):
+            load_embedding_model(backend="fake")
+
+        loader.assert_called_once_with(EMBEDDING_MODEL_NAME)
+
+    @pytest.mark.parametrize("backend, flag", [("onnx", ""), ("onnx-int8", " --quantize")])
+    def test_onnx_requires_explicit_export(self, tmp_path, backend, flag):
+        with patch.object(settings, "EMBEDDING_ONNX_DIR", str(tmp_path)):
+            with pytest.raises(FileNotFoundError, match=f"--export{flag}`"):
+                get_embedding_backend(backend)(EMBEDDING_MODEL_NAME)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_store_key_separates_backends(self):
+        with patch.object(settings, "EMBEDDING_BACKEND", "torch"):
+            assert embedding_model_key() == EMBEDDING_MODEL_NAME
+        with patch.object(settings, "EMBEDDING_BACKEND", "onnx-int8"):
+            assert embedding_model_key() == f"{EMBEDDING_MODEL_NAME}:onnx-int8"
+
+
+def _fake_onnx_model(batch_size=2):
+    """OnnxEmbeddingModel over a stub tokenizer and session.
+
+    Token ids are the text lengths; the [CLS] vector is [len, 1, 0, ...].
+    """
+    model = OnnxEmbeddingModel.__new__(OnnxEmbeddingModel)
+    model.batch_size = batch_size
+    model.input_names = {"input_ids", "attention_mask"}
+
+    def encode_batch(texts):
+        width = max(len(t) for t in texts)
+        return [
+            SimpleNamespace(ids=[len(t)] * width, attention_mask=[1] * width, type_ids=[0] * width)
+            for t in texts
+        ]
+
+    def run(_outputs, feed):
+        ids = feed["input_ids"]
+        hidden = np.zeros((ids.shape[0], ids.shape[1], 4), dtype=np.float32)
+        hidden[:, 0, 0] = ids[:, 0]
+        hidden[:, 0, 1] = 1.0
+        return [hidden]
+
+    model.tokenizer = SimpleNamespace(encode_batch=encode_batch)
+    model.session = MagicMock()
+    model.session.run.side_effect = run
+    return model
+
+
+class TestOnnxEmbeddingModel:
+    def test_restores_input_order_across_batches(self):
+        model = _fake_onnx_model(batch_size=2)
+        texts = ["ccc", "a", "bbbbb", "dd"]
+
+        out = model.encode(texts, normalize_embeddings=False)
+
+        np.testing.assert_array_equal(out[:, 0], [3, 1, 5, 2])
+        assert out.dtype == np.float32
+        assert model.session.run.call_count == 2
+
+    def test_feeds_only_declared_inputs(self):
+        model = _fake_onnx_model()
+
+        model.encode(["text"])
+
+        feed = model.session.run.call_args[0][1]
+        assert set(feed) == {"input_ids", "attention_mask"}
+
+    def test_normalizes_rows(self):
+        model = _fake_onnx_model()
+
+        out = model.encode(["ab", "abcdef", "a"])
+
+        np.testing.assert_allclose(np.linalg.norm(out, axis=1), 1.0, rtol=1e-6)
+
+
+class TestParity:
+    """ONNX vectors against the PyTorch reference on the real model.
+
+    Needs onnxruntime, optimum and the model weights; exports into a
+    temporary EMBEDDING_ONNX_DIR unless one is set in the environment.
+    """
+
+    TEXTS = [
+        "Let's review the budget for the third quarter.",
+        "The deployment failed because the database migration timed out.",
+        "ok",
+        "We agreed to move the launch to next Tuesday after the security review "
+        "signs off on the new authentication flow and the load tests pass.",
+    ]
+
+    @pytest.fixture(scope="class")
+    def reference(self):
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("optimum.onnxruntime")
+        sentence_transformers = pytest.importorskip("sentence_transformers")
+        try:
+            model = sentence_transformers.SentenceTransformer(EMBEDDING_MODEL_NAME)
+        except OSError as exc:
+            pytest.skip(f"model weights unavailable: {exc}")
+        return model.encode(self.TEXTS, normalize_embeddings=True)
+
+    @pytest.fixture(scope="class")
+    def onnx_dir(self, reference, tmp_path_factory):
+        onnx_dir = os.environ.get("EMBEDDING_ONNX_DIR") or str(tmp_path_factory.mktemp("onnx"))
+        with patch.object(settings, "EMBEDDING_ONNX_DIR", onnx_dir):
+            export_onnx(EMBEDDING_MODEL_NAME, quantize=True)
+        return onnx_dir
+
+    @pytest.mark.parametrize("backend, min_cosine", [("onnx", 0.9999), ("onnx-int8", 0.99)])
+    def test_matches_torch(self, reference, onnx_dir, backend, min_cosine):
+        with patch.object(settings, "EMBEDDING_ONNX_DIR", onnx_dir):
+            model = get_embedding_backend(backend)(EMBEDDING_MODEL_NAME)
+
+        out = model.encode(self.TEXTS, normalize_embeddings=True)
+
+        assert out.shape == reference.shape
+        cosines = np.einsum("ij,ij->i", out, reference)
+        assert cosines.min() >= min_cosine
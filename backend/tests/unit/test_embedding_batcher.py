@@ -0,0 +1,172 @@
+"""Tests for micro-batching of query embeddings."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import app.services.embedding as embedding_module
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import snapshot
+from app.services.embedding import embed_queries
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+def _vectors(texts):
+    return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+class RecordingEncoder:
+    """encode_fn that records each batch and can be held until released."""
+
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, texts):
+        self.release.wait(5)
+        self.batches.append(list(texts))
+        return _vectors(texts)
+
+
+@pytest.fixture
+def encoder():
+    return RecordingEncoder()
+
+
+@pytest.fixture
+def make_batcher(encoder):
+    batchers = []
+
+    def make(**kwargs):
+        batcher = EmbeddingBatcher(encoder, **kwargs)
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+    encoder.release.set()
+    for batcher in batchers:
+        batcher.close(timeout=5)
+
+
+class TestEmbeddingBatcher:
+    def test_resolves_each_future(self, make_batcher):
+        batcher = make_batcher(window_ms=0)
+
+        vec = batcher.submit("abc").result(timeout=5)
+
+        np.testing.assert_array_equal(vec, [3, 1])
+
+    def test_concurrent_requests_share_a_batch(self, make_batcher, encoder):
+        batcher = make_batcher(max_batch=32, window_ms=200)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+            results = list(pool.map(lambda t: batcher.submit(t).result(timeout=5), texts))
+
+        assert len(encoder.batches) == 1
+        assert sorted(encoder.batches[0]) == texts
+        assert [r[0] for r in results] == [1, 2, 3, 4, 5]
+
+    def test_caps_batch_size(self, make_batcher, encoder):
+        batcher = make_batcher(max_batch=2, window_ms=50)
+        encoder.release.clear()
+        first = batcher.submit("held")  # occupies the thread until released
+
+        futures = [batcher.submit(t) for t in ["a", "b", "c", "d", "e"]]
+        encoder.release.set()
+
+        assert [f.result(timeout=5)[0] for f in futures] == [1, 1, 1, 1, 1]
+        first.result(timeout=5)
+        assert max(len(b) for b in encoder.batches) <= 2
+
+    def test_duplicate_texts_encoded_once(self, make_batcher, encoder):
+        batcher = make_batcher(window_ms=50)
+
+        results = batcher.encode(["same", "same", "other"])
+
+        assert sum(len(b) for b in encoder.batches) == 2
+        np.testing.assert_array_equal(results[0], results[1])
+
+    def test_failure_propagates_to_every_caller(self):
+        batcher = EmbeddingBatcher(lambda texts: 1 / 0, window_ms=50)
+        try:
+            futures = [batcher.submit("a"), batcher.submit("b")]
+            for future in futures:
+                with pytest.raises(ZeroDivisionError):
+                    future.result(timeout=5)
+            # The thread survives a failed batch
+            batcher.encode_fn = _vectors
+            assert batcher.submit("ok").result(timeout=5)[0] == 2
+        finally:
+            batcher.close(timeout=5)
+
+    def test_cancelled_requests_skipped(self, make_batcher, encoder):
+        batcher = make_batcher(window_ms=0)
+        encoder.release.clear()
+        batcher.submit("held")
+
+        cancelled = batcher.submit("cancelled")
+        kept = batcher.submit("kept")
+        assert cancelled.cancel()
+        encoder.release.set()
+
+        kept.result(timeout=5)
+        assert "cancelled" not in sum(encoder.batches, [])
+
+    def test_stats_report_queue_depth(self, make_batcher, encoder):
+        batcher = make_batcher(max_batch=1, window_ms=0)
+        encoder.release.clear()
+        held = batcher.submit("held")
+        waiting = [batcher.submit(t) for t in ["a", "b", "c"]]
+
+        # "held" may still be in the queue if the thread has not picked it up
+        assert batcher.stats()["queue_depth"] >= 3
+
+        encoder.release.set()
+        for future in [held, *waiting]:
+            future.result(timeout=5)
+        stats = batcher.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["items"] == 4
+        assert stats["largest_batch"] == 1
+
+
+@pytest.fixture
+def empty_query_cache():
+    with patch.object(embedding_module, "query_embedding_cache", LRUCache(maxsize=16)), \
+            patch.object(settings, "QUERY_EMBEDDING_CACHE_REDIS", False):
+        yield
+
+
+class TestEmbedQueriesBatching:
+    def test_misses_go_through_batcher(self, empty_query_cache, encoder):
+        batcher = EmbeddingBatcher(encoder, window_ms=50)
+        try:
+            with patch.object(embedding_module, "get_query_batcher", return_value=batcher):
+                vectors = embed_queries(["Budget", "roadmap review"])
+        finally:
+            batcher.close(timeout=5)
+
+        np.testing.assert_array_equal(vectors, [[6.0, 1.0], [14.0, 1.0]])
+        assert encoder.batches == [["budget", "roadmap review"]]
+
+    def test_disabled_batcher_encodes_inline(self, empty_query_cache):
+        with patch.object(settings, "QUERY_EMBEDDING_BATCH_SIZE", 1), \
+                patch.object(embedding_module, "_encode_query_batch", side_effect=_vectors) as enc:
+            vectors = embed_queries(["abc"])
+
+        enc.assert_called_once_with(["abc"])
+        np.testing.assert_array_equal(vectors, [[3.0, 1.0]])
+
+    def test_queue_depth_exposed_as_metric(self, encoder):
+        batcher = EmbeddingBatcher(encoder)
+        with patch.object(embedding_module, "_query_batcher", batcher):
+            metrics = snapshot()["query_embedding_batcher"]
+
+        assert metrics["queue_depth"] == 0
+        assert metrics["batches"] == 0
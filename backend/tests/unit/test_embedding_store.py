@@ -0,0 +1,156 @@
+"""Tests for the persistent content-addressed embedding store."""
+
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+import app.services.embedding_store as store_module
+from app.services.embedding import EMBEDDING_MODEL_NAME, generate_embeddings
+from app.services.embedding_store import EmbeddingStore, embedding_key
+
+
+def _vec(seed: int) -> np.ndarray:
+    v = np.random.RandomState(seed).randn(768).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingStore(tmp_path / "store.db", max_entries=10)
+
+
+class TestEmbeddingKey:
+    def test_normalizes_text(self):
+        assert embedding_key("m", "  Budget   Review ") == embedding_key("m", "budget review")
+
+    def test_model_is_part_of_key(self):
+        assert embedding_key("a", "text") != embedding_key("b", "text")
+
+
+class TestEmbeddingStore:
+    def test_round_trip(self, store):
+        key = embedding_key("m", "text")
+        store.put_many({key: _vec(1)})
+
+        found = store.get_many([key, embedding_key("m", "other")])
+
+        assert list(found) == [key]
+        np.testing.assert_array_equal(found[key], _vec(1))
+        assert store.stats() == {"hits": 1, "misses": 1}
+
+    def test_persists_across_instances(self, tmp_path):
+        key = embedding_key("m", "text")
+        EmbeddingStore(tmp_path / "store.db", 10).put_many({key: _vec(2)})
+
+        found = EmbeddingStore(tmp_path / "store.db", 10).get_many([key])
+
+        np.testing.assert_array_equal(found[key], _vec(2))
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        store = EmbeddingStore(tmp_path / "store.db", max_entries=10, touch_interval=0)
+        keys = [embedding_key("m", str(i)) for i in range(10)]
+        with patch.object(store_module.time, "time", side_effect=range(100, 200)):
+            for i, key in enumerate(keys):
+                store.put_many({key: _vec(i)})
+            store.get_many([keys[0]])  # keys[0] is now the most recent
+            store.put_many({embedding_key("m", "new"): _vec(99)})
+
+        # Over the cap of 10: evicted down to 9, oldest first
+        assert len(store) == 9
+        remaining = store.get_many(keys)
+        assert keys[0] in remaining
+        assert keys[1] not in remaining
+        assert keys[2] not in remaining
+        assert keys[3] in remaining
+
+    def test_recent_reads_do_not_write(self, store):
+        key = embedding_key("m", "text")
+        store.put_many({key: _vec(1)})
+        conn = store._connect()
+        changes = conn.total_changes
+
+        for _ in range(5):
+            store.get_many([key])
+
+        assert conn.total_changes == changes
+        assert not store._pending_touches
+
+    def test_stale_reads_are_batched_into_next_put(self, tmp_path):
+        store = EmbeddingStore(tmp_path / "store.db", max_entries=10, touch_interval=0)
+        key = embedding_key("m", "text")
+        with patch.object(store_module.time, "time", side_effect=[100, 200, 300]):
+            store.put_many({key: _vec(1)})
+            changes = store._connect().total_changes
+            store.get_many([key])  # queued, not written
+            assert store._connect().total_changes == changes
+            store.put_many({embedding_key("m", "other"): _vec(2)})
+
+        last_used = store._connect().execute(
+            "SELECT last_used FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()[0]
+        assert last_used == 200
+
+    def test_count_kept_in_meta_row(self, store):
+        keys = [embedding_key("m", str(i)) for i in range(3)]
+        store.put_many({key: _vec(i) for i, key in enumerate(keys)})
+        store.put_many({keys[0]: _vec(7)})  # overwrite, not a new row
+
+        assert len(store) == 3
+
+    def test_counts_store_created_without_meta_row(self, tmp_path):
+        path = tmp_path / "store.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL, "
+            "last_used REAL NOT NULL) WITHOUT ROWID"
+        )
+        conn.executemany(
+            "INSERT INTO embeddings VALUES (?, ?, 0)",
+            [(embedding_key("m", str(i)), _vec(i).tobytes()) for i in range(4)],
+        )
+        conn.commit()
+        conn.close()
+
+        store = EmbeddingStore(path, 10)
+        store.put_many({embedding_key("m", "new"): _vec(9)})
+
+        assert len(store) == 5
+
+
+class TestGenerateEmbeddingsWithStore:
+    @pytest.fixture
+    def model(self, monkeypatch, store):
+        monkeypatch.setattr(store_module.settings, "EMBEDDING_STORE_PATH", str(store.path))
+        monkeypatch.setattr(store_module, "_store", store)
+        model = MagicMock()
+        model.encode.side_effect = lambda texts, **kw: np.stack([_vec(len(t)) for t in texts])
+        with patch("app.services.embedding.load_embedding_model", return_value=model):
+            yield model
+
+    def test_encodes_only_new_texts(self, model, store):
+        first = generate_embeddings(["alpha", "beta"])
+        assert model.encode.call_args.args[0] == ["alpha", "beta"]
+
+        second = generate_embeddings(["beta", "gamma", "gamma"])
+
+        # Only the unseen text is encoded, once
+        assert model.encode.call_args.args[0] == ["gamma"]
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[1], second[2])
+        assert embedding_key(EMBEDDING_MODEL_NAME, "gamma") in store.get_many(
+            [embedding_key(EMBEDDING_MODEL_NAME, "gamma")]
+        )
+
+    def test_explicit_model_bypasses_store(self, model, store):
+        other = MagicMock()
+        other.encode.return_value = np.stack([_vec(1)])
+
+        generate_embeddings(["alpha"], model=other)
+
+        assert len(store) == 0
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(store_module.settings, "EMBEDDING_STORE_PATH", "")
+        assert store_module.get_embedding_store() is None
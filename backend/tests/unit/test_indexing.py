@@ -0,0 +1,85 @@
+"""Unit tests for embedding reuse in the indexing task."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding import embedding_model_key, pack_embedding, unpack_embedding
+from app.tasks.indexing import segment_embeddings
+
+
+def _vec(seed: int) -> np.ndarray:
+    v = np.random.RandomState(seed).randn(768).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+def test_pack_round_trip():
+    np.testing.assert_array_equal(unpack_embedding(pack_embedding(_vec(1))), _vec(1))
+
+
+@patch("app.tasks.indexing.generate_embeddings")
+def test_reuses_stored_embeddings(mock_generate):
+    segments = [
+        SimpleNamespace(
+            text="stored", embedding=pack_embedding(_vec(1)), embedding_model=embedding_model_key()
+        ),
+        SimpleNamespace(text="new", embedding=None, embedding_model=None),
+    ]
+    mock_generate.return_value = np.stack([_vec(2)])
+
+    matrix = segment_embeddings(segments)
+
+    mock_generate.assert_called_once_with(["new"])
+    np.testing.assert_array_equal(matrix[0], _vec(1))
+    np.testing.assert_allclose(matrix[1], _vec(2))
+    # Newly encoded vectors are kept on the segment for retries
+    np.testing.assert_allclose(unpack_embedding(segments[1].embedding), _vec(2))
+    assert segments[1].embedding_model == embedding_model_key()
+
+
+@patch("app.tasks.indexing.generate_embeddings")
+def test_all_stored_skips_encoding(mock_generate):
+    segments = [
+        SimpleNamespace(text="a", embedding=pack_embedding(_vec(3)), embedding_model=embedding_model_key())
+    ]
+
+    segment_embeddings(segments)
+
+    mock_generate.assert_not_called()
+
+
+@patch("app.tasks.indexing.generate_embeddings")
+def test_wrong_size_embedding_is_recomputed(mock_generate):
+    segments = [SimpleNamespace(text="a", embedding=b"\x00" * 16, embedding_model=embedding_model_key())]
+    mock_generate.return_value = np.stack([_vec(4)])
+
+    segment_embeddings(segments)
+
+    mock_generate.assert_called_once_with(["a"])
+
+
+@patch("app.tasks.indexing.generate_embeddings")
+def test_embedding_from_other_backend_is_recomputed(mock_generate):
+    with patch.object(settings, "EMBEDDING_BACKEND", "torch"):
+        stored_by = embedding_model_key()
+    segments = [SimpleNamespace(text="a", embedding=pack_embedding(_vec(5)), embedding_model=stored_by)]
+    mock_generate.return_value = np.stack([_vec(6)])
+
+    with patch.object(settings, "EMBEDDING_BACKEND", "onnx-int8"):
+        matrix = segment_embeddings(segments)
+
+    mock_generate.assert_called_once_with(["a"])
+    np.testing.assert_allclose(matrix[0], _vec(6))
+    assert segments[0].embedding_model.endswith(":onnx-int8")
+
+
+@patch("app.tasks.indexing.generate_embeddings")
+def test_embedding_without_model_is_recomputed(mock_generate):
+    segments = [SimpleNamespace(text="a", embedding=pack_embedding(_vec(7)), embedding_model=None)]
+    mock_generate.return_value = np.stack([_vec(8)])
+
+    segment_embeddings(segments)
+
+    mock_generate.assert_called_once_with(["a"])
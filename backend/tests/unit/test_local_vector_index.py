@@ -0,0 +1,181 @@
+"""Unit tests for the memory-mapped local vector index and degraded search."""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from opensearchpy import ConnectionError as OpenSearchConnectionError
+
+from app.schemas.search import SearchFilters
+from app.services.local_vector_index import LocalVectorIndex
+from app.services.search import search, search_batch
+
+
+def _doc(seg_id, video_id, speaker="Alice", recording_date="2024-06-15"):
+    return {
+        "id": seg_id,
+        "video_id": video_id,
+        "video_title": "Video",
+        "text": f"text {seg_id}",
+        "start_time": 0.0,
+        "end_time": 5.0,
+        "speaker": speaker,
+        "recording_date": recording_date,
+        "transcript_id": "not stored",
+    }
+
+
+def _unit(*values):
+    vec = np.array(values, dtype=np.float32)
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = LocalVectorIndex(str(tmp_path))
+    idx.write_video(
+        "v1",
+        [_doc("a", "v1"), _doc("b", "v1", speaker="Bob")],
+        [_unit(1, 0, 0), _unit(0, 1, 0)],
+    )
+    idx.write_video(
+        "v2",
+        [_doc("c", "v2", recording_date="2024-07-01")],
+        [_unit(1, 1, 0)],
+    )
+    return idx
+
+
+class TestLocalVectorIndex:
+    def test_search_orders_by_cosine(self, index):
+        hits = index.search(_unit(1, 0, 0), k=3)
+        assert [h["_id"] for h in hits] == ["a", "c", "b"]
+        assert hits[0]["_score"] == pytest.approx(1.0)
+        assert "transcript_id" not in hits[0]["_source"]
+
+    def test_min_score_and_k(self, index):
+        hits = index.search(_unit(1, 0, 0), k=1)
+        assert [h["_id"] for h in hits] == ["a"]
+        hits = index.search(_unit(1, 0, 0), k=3, min_score=0.75)
+        assert [h["_id"] for h in hits] == ["a", "c"]
+
+    def test_filters(self, index):
+        query = _unit(1, 0, 0)
+        assert [h["_id"] for h in index.search(query, 3, SearchFilters(video_ids=["v2"]))] == ["c"]
+        assert [h["_id"] for h in index.search(query, 3, SearchFilters(speakers=["Bob"]))] == ["b"]
+        after = SearchFilters(date_from=date(2024, 7, 1))
+        assert [h["_id"] for h in index.search(query, 3, after)] == ["c"]
+
+    def test_int8_shards(self, tmp_path):
+        idx = LocalVectorIndex(str(tmp_path), dtype="int8")
+        idx.write_video("v1", [_doc("a", "v1"), _doc("b", "v1")], [_unit(1, 0), _unit(0, 1)])
+        (npy,) = tmp_path.glob("v1.*.npy")
+        assert np.load(npy).dtype == np.int8
+        hits = idx.search(_unit(1, 0), k=2)
+        assert [h["_id"] for h in hits] == ["a", "b"]
+        assert hits[0]["_score"] == pytest.approx(1.0)
+
+    def test_sees_rewrites_from_other_processes(self, tmp_path, index):
+        assert len(index) == 3
+        other = LocalVectorIndex(str(tmp_path))
+        other.write_video("v1", [_doc("z", "v1")], [_unit(0, 0, 1)])
+        assert len(index) == 2
+        assert index.search(_unit(0, 0, 1), k=1)[0]["_id"] == "z"
+        # The previous version's files are gone
+        assert len(list(tmp_path.glob("v1.*"))) == 2
+
+    def test_ids_and_matrix_come_from_one_version(self, tmp_path, index):
+        """A reader between a rewrite's two files still sees the old pair."""
+        index.search(_unit(1, 0, 0), k=3)
+        old_npy = next(tmp_path.glob("v1.*.npy"))
+        # New metadata written, matrix not yet published
+        newer = int(old_npy.name.split(".")[1]) + 1
+        (tmp_path / f"v1.{newer}.json").write_text('[{"id": "x"}, {"id": "y"}]')
+
+        hits = index.search(_unit(1, 0, 0), k=3)
+
+        assert [h["_id"] for h in hits] == ["a", "c", "b"]
+
+    def test_missing_directory_is_empty(self, tmp_path):
+        idx = LocalVectorIndex(str(tmp_path / "missing"))
+        assert idx.search(_unit(1, 0), k=5) == []
+
+    def test_unknown_dtype(self, tmp_path):
+        with pytest.raises(ValueError):
+            LocalVectorIndex(str(tmp_path), dtype="float16")
+
+
+class TestDegradedSearch:
+    """search() falls back to the local index when OpenSearch is unreachable."""
+
+    @patch("app.services.search.get_local_vector_index")
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_fallback_on_connection_error(self, mock_embed, mock_client_fn, mock_local, index):
+        mock_embed.return_value = _unit(1, 0, 0)
+        mock_client_fn.return_value.msearch.side_effect = OpenSearchConnectionError(
+            "N/A", "refused", None
+        )
+        mock_local.return_value = index
+
+        with patch("app.services.search.get_index_generation", return_value=1):
+            response = search("question", limit=2)
+            assert response.degraded is True
+            assert [r.segment_id for r in response.results] == ["a", "c"]
+
+            # Degraded responses are not cached
+            mock_client_fn.return_value.msearch.side_effect = None
+            mock_client_fn.return_value.msearch.return_value = {
+                "responses": [{"hits": {"hits": []}}, {"hits": {"hits": []}}]
+            }
+            assert search("question", limit=2).degraded is False
+
+    @patch("app.services.search.get_local_vector_index", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_error_raised_without_local_index(self, mock_embed, mock_client_fn, _):
+        mock_embed.return_value = [0.1] * 3
+        mock_client_fn.return_value.msearch.side_effect = OpenSearchConnectionError(
+            "N/A", "refused", None
+        )
+        with pytest.raises(OpenSearchConnectionError):
+            search("question")
+
+    @patch("app.services.search.get_local_vector_index")
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_serve_knn_locally(self, mock_embed, mock_client_fn, mock_local, index):
+        mock_embed.return_value = _unit(1, 0, 0)
+        mock_local.return_value = index
+        client = MagicMock()
+        client.msearch.return_value = {"responses": [{"hits": {"hits": []}}]}
+        mock_client_fn.return_value = client
+
+        with patch("app.services.search.settings") as mock_settings:
+            mock_settings.LOCAL_VECTOR_INDEX_SERVE_KNN = True
+            mock_settings.SEARCH_CANDIDATE_K = 10
+            mock_settings.SEARCH_CACHE_SIZE = 0
+            mock_settings.SEARCH_RRF_K = 60
+            mock_settings.SEARCH_BM25_WEIGHT = 1.0
+            mock_settings.SEARCH_KNN_WEIGHT = 1.0
+            response = search("question", limit=2)
+
+        # Only the BM25 leg goes to OpenSearch
+        assert len(client.msearch.call_args.kwargs["body"]) == 2
+        assert response.degraded is False
+        assert [r.segment_id for r in response.results] == ["a", "c"]
+
+    @patch("app.services.search.get_local_vector_index")
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_queries")
+    def test_batch_fallback(self, mock_embed, mock_client_fn, mock_local, index):
+        mock_embed.return_value = [_unit(1, 0, 0), _unit(0, 1, 0)]
+        mock_client_fn.return_value.msearch.side_effect = OpenSearchConnectionError(
+            "N/A", "refused", None
+        )
+        mock_local.return_value = index
+
+        responses = search_batch(["first", "second"], limit=1)
+        assert [r.degraded for r in responses] == [True, True]
+        assert [r.results[0].segment_id for r in responses] == ["a", "b"]
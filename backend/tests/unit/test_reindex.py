@@ -0,0 +1,139 @@
+"""Unit tests for blue/green reindexing behind the segments alias."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.opensearch import EMBEDDING_F32_FIELD, SEGMENTS_INDEX, decode_f32, encode_f32
+from app.services.reindex import (
+    _convert_source,
+    current_segments_index,
+    next_segments_index,
+    reindex_segments,
+)
+
+
+def _client(source="segments_v1", source_count=2, target_count=2):
+    client = MagicMock()
+    client.indices.exists.return_value = True
+    client.indices.get_alias.return_value = {source: {"aliases": {SEGMENTS_INDEX: {}}}}
+    client.indices.get.return_value = {source: {}}
+    client.count.side_effect = [{"count": source_count}, {"count": target_count}]
+    return client
+
+
+class TestIndexNames:
+    def test_current_index(self):
+        client = _client()
+        assert current_segments_index(client) == "segments_v1"
+
+    def test_alias_on_several_indices(self):
+        client = MagicMock()
+        client.indices.get_alias.return_value = {"segments_v1": {}, "segments_v2": {}}
+        with pytest.raises(RuntimeError):
+            current_segments_index(client)
+
+    def test_next_version_skips_leftovers(self):
+        client = MagicMock()
+        client.indices.get.return_value = {"segments_v1": {}, "segments_v3": {}, "segments_vx": {}}
+        assert next_segments_index(client) == "segments_v4"
+
+    def test_first_version_from_legacy(self):
+        client = MagicMock()
+        client.indices.get.return_value = {}
+        assert next_segments_index(client) == "segments_v1"
+
+
+class TestConvertSource:
+    def test_float32_to_byte(self):
+        src = {"id": "a", "embedding": [0.5, -0.5]}
+        out = _convert_source(src, "byte")
+        assert out["embedding"] == [64, -64]
+        assert decode_f32(out[EMBEDDING_F32_FIELD]).tolist() == [0.5, -0.5]
+
+    def test_byte_to_float32_uses_full_precision(self):
+        src = {"id": "a", "embedding": [64, -64], EMBEDDING_F32_FIELD: encode_f32([0.5, -0.5])}
+        out = _convert_source(src, "float32")
+        assert out["embedding"] == [0.5, -0.5]
+        assert EMBEDDING_F32_FIELD not in out
+
+
+class TestReindexSegments:
+    @patch("app.services.reindex.bump_index_generation")
+    @patch("app.services.reindex.helpers")
+    def test_builds_then_swaps_alias(self, mock_helpers, mock_bump):
+        client = _client()
+        mock_helpers.scan.return_value = iter([
+            {"_id": "1", "_source": {"id": "1", "embedding": [0.1, 0.2]}},
+            {"_id": "2", "_source": {"id": "2", "embedding": [0.3, 0.4]}},
+        ])
+        mock_helpers.parallel_bulk.side_effect = lambda c, actions, **kw: [
+            (True, a) for a in actions
+        ]
+
+        target = reindex_segments(client, profile="float32", threads=2)
+
+        assert target == "segments_v2"
+        create_body = client.indices.create.call_args.kwargs["body"]
+        assert create_body["settings"]["index"]["refresh_interval"] == "-1"
+        assert create_body["settings"]["index"]["number_of_replicas"] == 0
+        assert mock_helpers.parallel_bulk.call_args.kwargs["thread_count"] == 2
+
+        client.indices.put_settings.assert_called_once()
+        client.indices.update_aliases.assert_called_once_with(body={
+            "actions": [
+                {"remove": {"index": "segments_v1", "alias": SEGMENTS_INDEX}},
+                {"add": {"index": "segments_v2", "alias": SEGMENTS_INDEX}},
+            ]
+        })
+        mock_bump.assert_called_once()
+        client.indices.delete.assert_not_called()
+
+    @patch("app.services.reindex.bump_index_generation")
+    @patch("app.services.reindex.helpers")
+    def test_count_mismatch_keeps_alias(self, mock_helpers, mock_bump):
+        client = _client(source_count=3, target_count=2)
+        mock_helpers.scan.return_value = iter([])
+        mock_helpers.parallel_bulk.return_value = []
+
+        with pytest.raises(RuntimeError):
+            reindex_segments(client, profile="float32")
+
+        client.indices.delete.assert_called_once_with(index="segments_v2")
+        client.indices.update_aliases.assert_not_called()
+        mock_bump.assert_not_called()
+
+    def test_profile_must_match_settings(self):
+        client = _client()
+
+        with patch("app.services.reindex.settings") as mock_settings:
+            mock_settings.SEGMENTS_VECTOR_PROFILE = "float32"
+            with pytest.raises(ValueError, match="SEGMENTS_VECTOR_PROFILE"):
+                reindex_segments(client, profile="byte")
+
+        client.indices.create.assert_not_called()
+
+    @patch("app.services.reindex.bump_index_generation")
+    @patch("app.services.reindex.helpers")
+    def test_force_allows_other_profile(self, mock_helpers, mock_bump):
+        client = _client(source_count=0, target_count=0)
+        mock_helpers.scan.return_value = iter([])
+        mock_helpers.parallel_bulk.return_value = []
+
+        with patch("app.services.reindex.settings") as mock_settings:
+            mock_settings.SEGMENTS_VECTOR_PROFILE = "float32"
+            reindex_segments(client, profile="byte", force=True)
+
+        create_body = client.indices.create.call_args.kwargs["body"]
+        assert create_body["mappings"]["properties"]["embedding"]["data_type"] == "byte"
+
+    @patch("app.services.reindex.bump_index_generation")
+    @patch("app.services.reindex.helpers")
+    def test_delete_old(self, mock_helpers, mock_bump):
+        client = _client(source_count=0, target_count=0)
+        mock_helpers.scan.return_value = iter([])
+        mock_helpers.parallel_bulk.return_value = []
+
+        reindex_segments(client, profile="float32", delete_old=True)
+
+        client.indices.delete.assert_called_once_with(index="segments_v1")
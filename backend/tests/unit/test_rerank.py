@@ -0,0 +1,144 @@
+"""Unit tests for the cross-encoder rerank stage."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import app.services.rerank as rerank_module
+from app.schemas.search import SearchResponse, SearchResult
+from app.services.rerank import rerank, rerank_score_cache
+from app.services.search import search
+
+
+def _result(segment_id: str, text: str, score: float = 0.03) -> SearchResult:
+    return SearchResult(
+        segment_id=segment_id,
+        video_id="vid-1",
+        video_title="Video",
+        text=text,
+        start_time=0.0,
+        end_time=5.0,
+        score=score,
+        timestamp_formatted="0:00",
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_reranker(monkeypatch):
+    """Fresh model, score cache and latency estimate per test."""
+    model = MagicMock()
+    model.predict.side_effect = lambda pairs, **kw: [len(text) / 100 for _, text in pairs]
+    monkeypatch.setattr(rerank_module, "_rerank_model", model)
+    monkeypatch.setattr(rerank_module, "_pair_latency_ms", None)
+    monkeypatch.setattr(rerank_module, "_warmed_up", False)
+    monkeypatch.setattr(rerank_module.settings, "RERANK_MODEL", "test-cross-encoder")
+    rerank_score_cache.clear()
+    yield model
+    rerank_score_cache.clear()
+
+
+class TestRerank:
+    def test_orders_by_cross_encoder_score(self, _reset_reranker):
+        results = [_result("a", "short"), _result("b", "a much longer segment text")]
+
+        reranked = rerank("query", results)
+
+        assert [r.segment_id for r in reranked] == ["b", "a"]
+        assert reranked[0].rerank_score == pytest.approx(0.26)
+        # Fused scores are kept; inputs are not mutated
+        assert reranked[0].score == 0.03
+        assert results[0].rerank_score is None
+
+    def test_single_batch_and_cache(self, _reset_reranker):
+        model = _reset_reranker
+        results = [_result("a", "one"), _result("b", "two"), _result("c", "one")]
+
+        rerank("Query", results)
+        assert model.predict.call_count == 1
+        # Duplicate texts are scored once
+        assert len(model.predict.call_args.args[0]) == 2
+
+        rerank("  query ", results)
+        assert model.predict.call_count == 1
+
+    def test_disabled_without_model(self, monkeypatch):
+        monkeypatch.setattr(rerank_module.settings, "RERANK_MODEL", "")
+        assert rerank("query", [_result("a", "text")]) is None
+
+    def test_skips_over_budget(self, monkeypatch, _reset_reranker):
+        monkeypatch.setattr(rerank_module, "_pair_latency_ms", 20.0)
+
+        assert rerank("query", [_result(str(i), f"text {i}") for i in range(10)], budget_ms=100) is None
+        _reset_reranker.predict.assert_not_called()
+
+        # Within budget it runs
+        assert rerank("query", [_result("a", "text")], budget_ms=100) is not None
+
+    def test_cached_pairs_bypass_budget(self, monkeypatch, _reset_reranker):
+        results = [_result("a", "text")]
+        rerank("query", results)
+        monkeypatch.setattr(rerank_module, "_pair_latency_ms", 1e6)
+
+        assert rerank("query", results, budget_ms=1) is not None
+
+    def test_cold_first_batch_not_timed(self, _reset_reranker):
+        model = _reset_reranker
+        calls = []
+
+        def predict(pairs, **kw):
+            if not calls:
+                time.sleep(0.2)  # cold first batch
+            calls.append(pairs)
+            return [0.5] * len(pairs)
+
+        model.predict.side_effect = predict
+        rerank("query", [_result("a", "text a")])
+        assert rerank_module._pair_latency_ms is None
+
+        rerank("query", [_result("b", "text b")])
+        assert rerank_module._pair_latency_ms < 50
+
+    def test_recovers_after_slow_batch(self, monkeypatch, _reset_reranker):
+        # One slow batch left an estimate of 400 ms for the 20 pairs below
+        monkeypatch.setattr(rerank_module, "_pair_latency_ms", 20.0)
+        monkeypatch.setattr(rerank_module, "_warmed_up", True)
+
+        outcomes = [
+            rerank("query", [_result(f"{n}-{i}", f"text {n} {i}") for i in range(20)], budget_ms=150)
+            for n in range(48)
+        ]
+
+        assert outcomes[0] is None
+        assert _reset_reranker.predict.call_count > 0
+        assert outcomes[-1] is not None
+
+    def test_latency_estimate_is_smoothed(self):
+        rerank_module._record_latency(10, 100.0)
+        assert rerank_module._pair_latency_ms == pytest.approx(10.0)
+        rerank_module._record_latency(10, 200.0)
+        assert rerank_module._pair_latency_ms == pytest.approx(12.0)
+
+
+class TestSearchRerank:
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search._hybrid_search")
+    def test_reranks_top_n_then_cuts_to_limit(self, mock_hybrid, _gen):
+        fused = [_result(str(i), "x" * (i + 1)) for i in range(20)]
+        mock_hybrid.return_value = SearchResponse(count=20, results=fused)
+
+        response = search("query", limit=3, rerank=True)
+
+        assert mock_hybrid.call_args.args[1] == 20  # RERANK_TOP_N
+        assert [r.segment_id for r in response.results] == ["19", "18", "17"]
+        assert response.count == 3
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search._hybrid_search")
+    def test_rerank_off_by_default(self, mock_hybrid, _gen, _reset_reranker):
+        mock_hybrid.return_value = SearchResponse(count=1, results=[_result("a", "x")])
+
+        search("query", limit=3)
+
+        assert mock_hybrid.call_args.args[1] == 3
+        _reset_reranker.predict.assert_not_called()
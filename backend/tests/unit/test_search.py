@@ -1,18 +1,48 @@
 """Unit tests for search: index mapping and query construction (S1-I05, S1-U02, etc.)."""
 
-from unittest.mock import MagicMock, patch
+import threading
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+from opensearchpy import TransportError
+
+import app.core.opensearch as opensearch_module
+from app.core.config import settings
 from app.core.opensearch import (
+    EMBEDDING_F32_FIELD,
+    LEGACY_SEGMENTS_INDEX,
+    SEARCH_RESULT_FIELDS,
     SEGMENTS_INDEX,
     SEGMENTS_INDEX_BODY,
+    bootstrap_segments_index,
+    build_segments_index_body,
+    close_opensearch_client,
+    decode_f32,
+    encode_f32,
     ensure_segments_index,
+    get_opensearch_client,
+    quantize_int8,
+    set_opensearch_client,
+    vector_fields,
 )
-from app.schemas.search import SearchResponse, SearchResult
+from app.core.timing import timing_scope
+from app.schemas.search import SearchFilters, SearchResponse, SearchResult
 from app.services.search import (
-    _apply_rrf,
-    _format_timestamp,
+    EXACT_RESCORE_SCRIPT,
+    _collapse_by_video,
+    _parse_facets,
+    apply_rrf,
+    bm25_body,
     build_hybrid_query,
+    format_timestamp,
+    hit_to_result,
+    knn_body,
     search,
+    search_async,
+    search_batch,
+    search_result_cache,
+    threshold_knn_hits,
 )
 
 
@@ -20,7 +50,7 @@ class TestSegmentsIndexMapping:
     """S1-I05 (partial): Verify segments_index mapping is correct."""
 
     def test_index_name(self):
-        assert SEGMENTS_INDEX == "segments_index"
+        assert SEGMENTS_INDEX == "segments"
 
     def test_knn_enabled(self):
         """Index settings must enable knn."""
@@ -57,23 +87,114 @@ class TestSegmentsIndexMapping:
 
 
 class TestEnsureSegmentsIndex:
-    """Verify ensure_segments_index creates index when missing."""
+    """Verify ensure_segments_index creates the alias and index when missing."""
 
-    def test_creates_index_when_not_exists(self):
+    def test_creates_versioned_index_with_alias(self):
         client = MagicMock()
         client.indices.exists.return_value = False
         ensure_segments_index(client)
         client.indices.create.assert_called_once_with(
-            index=SEGMENTS_INDEX, body=SEGMENTS_INDEX_BODY
+            index="segments_v1",
+            body={**SEGMENTS_INDEX_BODY, "aliases": {SEGMENTS_INDEX: {}}},
         )
 
-    def test_skips_when_index_exists(self):
+    def test_skips_when_alias_exists(self):
+        client = MagicMock()
+        client.indices.exists.return_value = True
+        ensure_segments_index(client)
+        client.indices.create.assert_not_called()
+        client.indices.put_alias.assert_not_called()
+
+    def test_adds_suggest_mapping_to_existing_index(self):
+        client = MagicMock()
+        client.indices.exists.return_value = True
+        ensure_segments_index(client)
+        body = client.indices.put_mapping.call_args.kwargs["body"]
+        assert body["properties"]["suggest"]["type"] == "completion"
+
+    def test_suggest_mapping_failure_is_not_fatal(self):
         client = MagicMock()
         client.indices.exists.return_value = True
+        client.indices.put_mapping.side_effect = RuntimeError("conflict")
+        ensure_segments_index(client)
+
+    def test_adopts_legacy_index(self):
+        client = MagicMock()
+        client.indices.exists.side_effect = lambda index: index == LEGACY_SEGMENTS_INDEX
         ensure_segments_index(client)
+        client.indices.put_alias.assert_called_once_with(
+            index=LEGACY_SEGMENTS_INDEX, name=SEGMENTS_INDEX
+        )
         client.indices.create.assert_not_called()
 
 
+class TestSharedClient:
+    """The OpenSearch client is a lazily created per-process singleton."""
+
+    def teardown_method(self):
+        close_opensearch_client()
+
+    @patch("app.core.opensearch.OpenSearch")
+    def test_client_created_once(self, mock_cls):
+        close_opensearch_client()
+        first = get_opensearch_client()
+        second = get_opensearch_client()
+        assert first is second
+        mock_cls.assert_called_once()
+
+    @patch("app.core.opensearch.OpenSearch")
+    def test_pool_settings_applied(self, mock_cls):
+        close_opensearch_client()
+        get_opensearch_client()
+        kwargs = mock_cls.call_args.kwargs
+        assert kwargs["pool_maxsize"] > 1
+        assert kwargs["timeout"] > 0
+
+    @patch("app.core.opensearch.OpenSearch")
+    def test_close_releases_client(self, mock_cls):
+        close_opensearch_client()
+        client = get_opensearch_client()
+        close_opensearch_client()
+        client.close.assert_called_once()
+        get_opensearch_client()
+        assert mock_cls.call_count == 2
+
+    @patch("app.core.opensearch.OpenSearch")
+    def test_set_client_replaces_shared_client(self, mock_cls):
+        close_opensearch_client()
+        created = get_opensearch_client()
+        replacement = MagicMock()
+
+        set_opensearch_client(replacement)
+
+        created.close.assert_called_once()
+        assert get_opensearch_client() is replacement
+        mock_cls.assert_called_once()
+
+
+class TestBootstrapSegmentsIndex:
+    """The index existence check runs once per process, not per query."""
+
+    def setup_method(self):
+        opensearch_module._index_ready = False
+
+    def teardown_method(self):
+        opensearch_module._index_ready = False
+
+    def test_checks_only_once(self):
+        client = MagicMock()
+        client.indices.exists.return_value = True
+        assert bootstrap_segments_index(client) is True
+        assert bootstrap_segments_index(client) is True
+        client.indices.exists.assert_called_once()
+
+    def test_failure_is_retried(self):
+        client = MagicMock()
+        client.indices.exists.side_effect = [ConnectionError("down"), True]
+        assert bootstrap_segments_index(client) is False
+        assert bootstrap_segments_index(client) is True
+
+
 class TestBuildHybridQuery:
     """S1-U02: test_hybrid_query_construction."""
 
@@ -105,6 +226,147 @@ class TestBuildHybridQuery:
         assert "knn" in query
 
 
+class TestSourceProjection:
+    """Search legs request only the fields a SearchResult needs."""
+
+    def test_legs_exclude_embedding(self):
+        for body in (bm25_body("q", 10), knn_body([0.1] * 768, 10)):
+            includes = body["_source"]["includes"]
+            assert "embedding" not in includes
+            assert set(includes) == set(SEARCH_RESULT_FIELDS)
+
+    def test_result_fields_cover_schema(self):
+        """Every SearchResult source field is projected."""
+        for field in ("video_id", "video_title", "text", "start_time", "end_time",
+                      "speaker", "recording_date"):
+            assert field in SEARCH_RESULT_FIELDS
+
+
+class TestVectorProfiles:
+    """float32 and byte (int8 + exact rescoring) vector storage profiles."""
+
+    def test_float32_body_matches_default(self):
+        assert build_segments_index_body("float32") == SEGMENTS_INDEX_BODY
+
+    def test_byte_body(self):
+        props = build_segments_index_body("byte")["mappings"]["properties"]
+        assert props["embedding"]["data_type"] == "byte"
+        assert props["embedding"]["method"]["engine"] == "lucene"
+        assert props[EMBEDDING_F32_FIELD] == {"type": "binary", "doc_values": True}
+        assert "data_type" not in SEGMENTS_INDEX_BODY["mappings"]["properties"]["embedding"]
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            build_segments_index_body("fp16")
+
+    def test_quantize_int8_range(self):
+        assert quantize_int8([1.0, -1.0, 0.5, 0.0, 2.0]) == [127, -127, 64, 0, 127]
+
+    def test_f32_roundtrip(self):
+        vec = [0.25, -0.5, 0.125]
+        assert decode_f32(encode_f32(vec)).tolist() == vec
+
+    def test_vector_fields(self):
+        assert vector_fields([0.5, -0.5], "float32") == {"embedding": [0.5, -0.5]}
+        fields = vector_fields([0.5, -0.5], "byte")
+        assert fields["embedding"] == [64, -64]
+        assert decode_f32(fields[EMBEDDING_F32_FIELD]).tolist() == [0.5, -0.5]
+
+    def test_byte_knn_body_rescores_on_server(self):
+        with patch("app.services.search.settings") as mock_settings:
+            mock_settings.SEGMENTS_VECTOR_PROFILE = "byte"
+            mock_settings.SEARCH_RESCORE_OVERSAMPLE = 4
+            body = knn_body([0.5, -0.5], 10)
+
+        knn = body["query"]["knn"]["embedding"]
+        assert knn["vector"] == [64, -64]
+        assert knn["k"] == 40
+        assert body["size"] == 10
+        assert "min_score" not in body
+        rescore = body["rescore"]
+        assert rescore["window_size"] == 40
+        assert rescore["query"]["query_weight"] == 0.0
+        script = rescore["query"]["rescore_query"]["script_score"]["script"]
+        assert script["source"] == EXACT_RESCORE_SCRIPT
+        assert script["params"]["vector"] == [0.5, -0.5]
+        # Full-precision vectors stay on the node
+        assert EMBEDDING_F32_FIELD not in body["_source"]["includes"]
+
+    def test_threshold_drops_low_rescored_hits(self):
+        hits = [
+            {"_id": "b", "_score": 1.0, "_source": {"id": "b"}},
+            {"_id": "a", "_score": 0.9, "_source": {"id": "a"}},
+            {"_id": "c", "_score": 0.5, "_source": {"id": "c"}},
+        ]
+        with patch("app.services.search.settings") as mock_settings:
+            mock_settings.SEGMENTS_VECTOR_PROFILE = "byte"
+            kept = threshold_knn_hits(hits)
+
+        # c has cos 0 -> score 0.5, below the kNN threshold
+        assert [h["_id"] for h in kept] == ["b", "a"]
+
+    def test_threshold_noop_for_float32(self):
+        hits = [{"_id": "a", "_score": 0.5, "_source": {}}]
+        assert threshold_knn_hits(hits) is hits
+
+
+class TestSearchFilters:
+    """Filters are pushed into both the BM25 bool filter and the kNN filter."""
+
+    FILTERS = SearchFilters(
+        video_ids=["v1", "v2"],
+        speakers=["Alice"],
+        date_from=date(2024, 1, 1),
+        date_to=date(2024, 6, 30),
+    )
+
+    def test_bm25_bool_filter(self):
+        body = bm25_body("query", 10, self.FILTERS)
+        bool_query = body["query"]["bool"]
+        assert bool_query["must"][0]["match"]["text"]["query"] == "query"
+        assert {"terms": {"video_id": ["v1", "v2"]}} in bool_query["filter"]
+        assert {"terms": {"speaker": ["Alice"]}} in bool_query["filter"]
+        assert {
+            "range": {"recording_date": {"gte": "2024-01-01", "lte": "2024-06-30"}}
+        } in bool_query["filter"]
+
+    def test_knn_prefilter(self):
+        body = knn_body([0.1] * 768, 10, self.FILTERS)
+        knn = body["query"]["knn"]["embedding"]
+        assert len(knn["filter"]["bool"]["filter"]) == 3
+
+    def test_no_filters_keeps_plain_queries(self):
+        assert "match" in bm25_body("q", 10)["query"]
+        assert "filter" not in knn_body([0.1] * 768, 10)["query"]["knn"]["embedding"]
+
+    def test_open_ended_date_range(self):
+        body = bm25_body("q", 10, SearchFilters(date_from=date(2024, 3, 1)))
+        assert body["query"]["bool"]["filter"] == [
+            {"range": {"recording_date": {"gte": "2024-03-01"}}}
+        ]
+
+    def test_inverted_date_range_rejected(self):
+        with pytest.raises(ValueError):
+            SearchFilters(date_from=date(2024, 6, 1), date_to=date(2024, 1, 1))
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_search_passes_filters_to_both_legs(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [0.1] * 768
+        mock_client_fn.return_value.msearch.return_value = {
+            "responses": [{"hits": {"hits": []}}, {"hits": {"hits": []}}]
+        }
+
+        search("query", limit=5, filters=SearchFilters(speakers=["Bob"]))
+
+        payload = mock_client_fn.return_value.msearch.call_args.kwargs["body"]
+        assert payload[1]["query"]["bool"]["filter"] == [{"terms": {"speaker": ["Bob"]}}]
+        assert payload[3]["query"]["knn"]["embedding"]["filter"] == {
+            "bool": {"filter": [{"terms": {"speaker": ["Bob"]}}]}
+        }
+
+
 class TestApplyRRF:
     """S1-U03: test_search_result_ranking - Results sorted by RRF score."""
 
@@ -126,7 +388,7 @@ class TestApplyRRF:
         """Doc appearing in both lists gets higher score than single-list docs."""
         bm25 = [self._hit("a"), self._hit("b")]
         knn = [self._hit("a"), self._hit("c")]
-        merged = _apply_rrf(bm25, knn, k=60)
+        merged = apply_rrf(bm25, knn, k=60)
         ids = [h["_id"] for h in merged]
         # 'a' appears in both lists → highest score
         assert ids[0] == "a"
@@ -135,18 +397,38 @@ class TestApplyRRF:
         """Results are sorted by RRF score in descending order."""
         bm25 = [self._hit("x"), self._hit("y"), self._hit("z")]
         knn = [self._hit("z"), self._hit("x"), self._hit("y")]
-        merged = _apply_rrf(bm25, knn, k=60)
+        merged = apply_rrf(bm25, knn, k=60)
         scores = [h["_rrf_score"] for h in merged]
         assert scores == sorted(scores, reverse=True)
 
     def test_rrf_empty_lists(self):
         """Empty input lists produce empty output."""
-        assert _apply_rrf([], []) == []
+        assert apply_rrf([], []) == []
+
+    def test_rrf_leg_weights(self):
+        """A heavier kNN weight lets a kNN-only doc outrank a BM25-only doc."""
+        bm25 = [self._hit("a")]
+        knn = [self._hit("b")]
+        equal = apply_rrf(bm25, knn, k=60)
+        assert [h["_id"] for h in equal] == ["a", "b"]
+        weighted = apply_rrf(bm25, knn, k=60, weights=(1.0, 2.0))
+        assert [h["_id"] for h in weighted] == ["b", "a"]
+        assert weighted[0]["_rrf_score"] == 2.0 / 61
+
+    def test_rrf_matches_reference_on_deep_lists(self):
+        """Vectorized fusion matches the scalar formula for hundreds of candidates."""
+        bm25 = [self._hit(f"d{i}") for i in range(300)]
+        knn = [self._hit(f"d{i}") for i in range(150, 450)]
+        merged = apply_rrf(bm25, knn, k=60)
+        assert len(merged) == 450
+        scores = {h["_id"]: h["_rrf_score"] for h in merged}
+        assert abs(scores["d200"] - (1 / (60 + 201) + 1 / (60 + 51))) < 1e-12
+        assert abs(scores["d0"] - 1 / 61) < 1e-12
 
     def test_rrf_single_list(self):
         """Works when one list is empty."""
         bm25 = [self._hit("a")]
-        merged = _apply_rrf(bm25, [])
+        merged = apply_rrf(bm25, [])
         assert len(merged) == 1
         assert merged[0]["_id"] == "a"
 
@@ -155,16 +437,16 @@ class TestFormatTimestamp:
     """Timestamp formatting helper."""
 
     def test_zero(self):
-        assert _format_timestamp(0.0) == "0:00"
+        assert format_timestamp(0.0) == "0:00"
 
     def test_seconds_only(self):
-        assert _format_timestamp(45.7) == "0:45"
+        assert format_timestamp(45.7) == "0:45"
 
     def test_minutes_and_seconds(self):
-        assert _format_timestamp(754.0) == "12:34"
+        assert format_timestamp(754.0) == "12:34"
 
     def test_large_value(self):
-        assert _format_timestamp(3661.0) == "61:01"
+        assert format_timestamp(3661.0) == "61:01"
 
 
 class TestSearchFunction:
@@ -183,10 +465,10 @@ class TestSearchFunction:
         assert result.count == 0
 
     @patch("app.services.search.get_opensearch_client")
-    @patch("app.services.search.generate_embeddings")
+    @patch("app.services.search.embed_query")
     def test_search_calls_opensearch(self, mock_embed, mock_client_fn):
         """search() generates embedding, queries OpenSearch, returns results."""
-        mock_embed.return_value = [[0.1] * 768]
+        mock_embed.return_value = [0.1] * 768
 
         mock_client = MagicMock()
         mock_client_fn.return_value = mock_client
@@ -213,10 +495,12 @@ class TestSearchFunction:
             "_source": bm25_hit["_source"],
         }
 
-        mock_client.search.side_effect = [
-            {"hits": {"hits": [bm25_hit]}},
-            {"hits": {"hits": [knn_hit]}},
-        ]
+        mock_client.msearch.return_value = {
+            "responses": [
+                {"hits": {"hits": [bm25_hit]}},
+                {"hits": {"hits": [knn_hit]}},
+            ]
+        }
 
         result = search("transcript text", limit=10)
 
@@ -226,23 +510,578 @@ class TestSearchFunction:
         assert result.results[0].video_id == "vid1"
         assert result.results[0].timestamp_formatted == "1:00"
         assert result.results[0].speaker == "Bob"
-        mock_embed.assert_called_once_with(["transcript text"])
+        mock_embed.assert_called_once_with("transcript text")
+
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_search_single_round_trip(self, mock_embed, mock_client_fn):
+        """Both BM25 and kNN legs are sent in one _msearch request."""
+        mock_embed.return_value = [0.1] * 768
+        mock_client = MagicMock()
+        mock_client_fn.return_value = mock_client
+        mock_client.msearch.return_value = {
+            "responses": [{"hits": {"hits": []}}, {"hits": {"hits": []}}]
+        }
+
+        search("hello world", limit=5, candidate_k=40)
+
+        mock_client.msearch.assert_called_once()
+        mock_client.search.assert_not_called()
+        mock_client.indices.exists.assert_not_called()
+        payload = mock_client.msearch.call_args.kwargs["body"]
+        assert len(payload) == 4
+        assert payload[1]["query"]["match"]["text"]["query"] == "hello world"
+        assert payload[1]["size"] == 40
+        assert payload[3]["query"]["knn"]["embedding"]["k"] == 40
+
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_search_survives_failed_leg(self, mock_embed, mock_client_fn):
+        """A leg that errors inside _msearch contributes no hits."""
+        mock_embed.return_value = [0.1] * 768
+        mock_client = MagicMock()
+        mock_client_fn.return_value = mock_client
+        hit = {
+            "_id": "seg1",
+            "_source": {
+                "video_id": "vid1",
+                "text": "text",
+                "start_time": 1.0,
+                "end_time": 2.0,
+            },
+        }
+        mock_client.msearch.return_value = {
+            "responses": [
+                {"hits": {"hits": [hit]}},
+                {"error": {"type": "illegal_argument_exception"}, "status": 400},
+            ]
+        }
+
+        result = search("text", limit=5)
+        assert result.count == 1
+        assert result.results[0].segment_id == "seg1"
 
+    @patch("app.services.search.get_index_generation", return_value=None)
     @patch("app.services.search.get_opensearch_client")
-    @patch("app.services.search.generate_embeddings")
+    @patch("app.services.search.embed_query")
+    def test_search_raises_when_every_leg_fails(self, mock_embed, mock_client_fn, _gen):
+        """With no leg answering, the error surfaces instead of an empty result."""
+        mock_embed.return_value = [0.1] * 768
+        mock_client = MagicMock()
+        mock_client_fn.return_value = mock_client
+        error = {
+            "error": {"type": "index_not_found_exception", "reason": "no such index [segments]"},
+            "status": 404,
+        }
+        mock_client.msearch.return_value = {"responses": [error, error]}
+
+        with pytest.raises(TransportError) as exc_info:
+            search("text", limit=5)
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.error == "index_not_found_exception"
+
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
     def test_search_no_results(self, mock_embed, mock_client_fn):
         """search() with no matching docs returns count=0."""
-        mock_embed.return_value = [[0.1] * 768]
+        mock_embed.return_value = [0.1] * 768
         mock_client = MagicMock()
         mock_client_fn.return_value = mock_client
         mock_client.indices.exists.return_value = True
-        mock_client.search.return_value = {"hits": {"hits": []}}
+        mock_client.msearch.return_value = {
+            "responses": [{"hits": {"hits": []}}, {"hits": {"hits": []}}]
+        }
 
         result = search("nonexistent xyz", limit=10)
         assert result.count == 0
         assert result.results == []
 
 
+class TestCandidateDepth:
+    """Each leg fetches candidate_k hits; the response is cut to limit."""
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_limit_applied_after_fusion(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [0.1] * 768
+        hits = [
+            {
+                "_id": f"s{i}",
+                "_source": {"video_id": "v", "text": "t", "start_time": 0.0, "end_time": 1.0},
+            }
+            for i in range(30)
+        ]
+        mock_client_fn.return_value.msearch.return_value = {
+            "responses": [{"hits": {"hits": hits}}, {"hits": {"hits": []}}]
+        }
+
+        result = search("deep", limit=3, candidate_k=30)
+
+        assert result.count == 3
+        payload = mock_client_fn.return_value.msearch.call_args.kwargs["body"]
+        assert payload[1]["size"] == 30
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_depth_never_below_limit(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [0.1] * 768
+        mock_client_fn.return_value.msearch.return_value = {
+            "responses": [{"hits": {"hits": []}}, {"hits": {"hits": []}}]
+        }
+
+        search("shallow", limit=20, candidate_k=5)
+
+        payload = mock_client_fn.return_value.msearch.call_args.kwargs["body"]
+        assert payload[3]["query"]["knn"]["embedding"]["k"] == 20
+
+
+class TestSearchBatch:
+    """Batch search embeds once and sends every leg in one _msearch."""
+
+    def _hit(self, doc_id):
+        return {
+            "_id": doc_id,
+            "_source": {"video_id": "v", "text": doc_id, "start_time": 0.0, "end_time": 1.0},
+        }
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_queries")
+    def test_single_embedding_batch_and_msearch(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [[0.1] * 768, [0.2] * 768]
+        mock_client_fn.return_value.msearch.return_value = {
+            "responses": [
+                {"hits": {"hits": [self._hit("a")]}},
+                {"hits": {"hits": []}},
+                {"hits": {"hits": [self._hit("b")]}},
+                {"hits": {"hits": [self._hit("b")]}},
+            ]
+        }
+
+        responses = search_batch(["first", "  ", "second"], limit=5)
+
+        mock_embed.assert_called_once_with(["first", "second"])
+        mock_client_fn.return_value.msearch.assert_called_once()
+        payload = mock_client_fn.return_value.msearch.call_args.kwargs["body"]
+        assert len(payload) == 8
+        assert [r.count for r in responses] == [1, 0, 1]
+        assert responses[0].results[0].segment_id == "a"
+        assert responses[2].results[0].segment_id == "b"
+
+    @patch("app.services.search.get_index_generation", return_value=7)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_queries")
+    def test_cached_queries_skip_msearch(self, mock_embed, mock_client_fn, _gen):
+        search_result_cache.clear()
+        mock_embed.return_value = [[0.1] * 768]
+        mock_client_fn.return_value.msearch.return_value = {
+            "responses": [{"hits": {"hits": [self._hit("a")]}}, {"hits": {"hits": []}}]
+        }
+
+        search_batch(["repeat"], limit=5)
+        responses = search_batch(["repeat"], limit=5)
+
+        assert responses[0].count == 1
+        mock_client_fn.return_value.msearch.assert_called_once()
+        search_result_cache.clear()
+
+
+class TestSearchAsync:
+    """Async search path on AsyncOpenSearch."""
+
+    async def test_empty_query_returns_empty(self):
+        result = await search_async("  ")
+        assert result.count == 0
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_async_opensearch_client")
+    @patch("app.services.search.embed_query")
+    async def test_runs_both_legs(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [0.1] * 768
+        hit = {
+            "_id": "seg1",
+            "_source": {
+                "video_id": "vid1",
+                "text": "async text",
+                "start_time": 65.0,
+                "end_time": 70.0,
+            },
+        }
+        client = MagicMock()
+        client.msearch = AsyncMock(return_value={"responses": [
+            {"hits": {"hits": [hit]}},
+            {"hits": {"hits": [hit]}},
+        ]})
+        mock_client_fn.return_value = client
+
+        result = await search_async("async text", limit=5)
+
+        assert result.count == 1
+        assert result.results[0].timestamp_formatted == "1:05"
+        client.msearch.assert_awaited_once()
+        client.search.assert_not_called()
+        payload = client.msearch.call_args.kwargs["body"]
+        assert "match" in payload[1]["query"]
+        assert payload[3]["query"]["knn"]["embedding"]["vector"] == [0.1] * 768
+        mock_embed.assert_called_once_with("async text")
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_async_opensearch_client")
+    @patch("app.services.search.embed_query", side_effect=RuntimeError("model failed"))
+    async def test_embedding_failure_propagates(self, _embed, mock_client_fn, _gen):
+        client = MagicMock()
+        client.msearch = AsyncMock(return_value={"responses": []})
+        mock_client_fn.return_value = client
+
+        with pytest.raises(RuntimeError):
+            await search_async("boom")
+
+    @patch("app.services.search.get_index_generation", return_value=3)
+    @patch("app.services.search.get_async_opensearch_client")
+    @patch("app.services.search.embed_query", return_value=[0.1] * 768)
+    async def test_failed_knn_leg_serves_partial_bm25(self, _embed, mock_client_fn, _gen):
+        search_result_cache.clear()
+        client = MagicMock()
+        client.msearch = AsyncMock(return_value={"responses": [
+            {"hits": {"hits": [_video_hit("a", "v1")]}},
+            {"error": {"type": "search_phase_execution_exception"}, "status": 500},
+        ]})
+        mock_client_fn.return_value = client
+
+        result = await search_async("partial", limit=5)
+
+        assert [r.segment_id for r in result.results] == ["a"]
+        assert result.partial is True
+        assert len(search_result_cache) == 0
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_async_opensearch_client")
+    @patch("app.services.search.embed_query", return_value=[0.1] * 768)
+    async def test_executor_stages_reach_timing_scope(self, _embed, mock_client_fn, _gen):
+        client = MagicMock()
+        client.msearch = AsyncMock(return_value={"responses": [{"hits": {"hits": []}}]})
+        mock_client_fn.return_value = client
+        local_index = MagicMock()
+        local_index.search.return_value = [_video_hit("a", "v1")]
+
+        with patch("app.services.search.get_local_vector_index", return_value=local_index), \
+                patch.object(settings, "LOCAL_VECTOR_INDEX_SERVE_KNN", True), \
+                timing_scope() as timings:
+            result = await search_async("local", limit=5)
+
+        assert result.count == 1
+        assert {"embed", "local_knn", "opensearch", "fusion"} <= set(timings.stages)
+
+    @patch("app.services.search.get_async_opensearch_client")
+    @patch("app.services.search.embed_query", return_value=[0.1] * 768)
+    async def test_index_generation_read_off_event_loop(self, _embed, mock_client_fn):
+        client = MagicMock()
+        client.msearch = AsyncMock(return_value={"responses": [{"hits": {"hits": []}}] * 2})
+        mock_client_fn.return_value = client
+        loop_thread = threading.get_ident()
+        generation_threads = []
+
+        def get_generation():
+            generation_threads.append(threading.get_ident())
+            return None
+
+        with patch("app.services.search.get_index_generation", side_effect=get_generation):
+            await search_async("off loop")
+
+        assert generation_threads and generation_threads[0] != loop_thread
+
+
+def _video_hit(seg_id: str, video_id: str) -> dict:
+    return {
+        "_id": seg_id,
+        "_score": 1.0,
+        "_source": {
+            "video_id": video_id,
+            "video_title": f"Video {video_id}",
+            "text": f"text {seg_id}",
+            "start_time": 0.0,
+            "end_time": 5.0,
+        },
+    }
+
+
+FACET_AGGREGATIONS = {
+    "videos": {"buckets": [
+        {"key": "v1", "doc_count": 3, "title": {"hits": {"hits": [
+            {"_source": {"video_title": "Council Meeting"}}
+        ]}}},
+        {"key": "v2", "doc_count": 1},
+    ]},
+    "speakers": {"buckets": [{"key": "Alice", "doc_count": 2}]},
+    "recording_dates": {"buckets": [
+        {"key": 1704067200000, "key_as_string": "2024-01", "doc_count": 4}
+    ]},
+}
+
+
+class TestHighlighting:
+    """Unified-highlighter fragments flow from both legs into SearchResult."""
+
+    def _hit(self, doc_id: str, highlight: dict | None = None) -> dict:
+        hit = {
+            "_id": doc_id,
+            "_source": {
+                "video_id": "v1",
+                "text": "budgets approved",
+                "start_time": 0.0,
+                "end_time": 5.0,
+            },
+        }
+        if highlight is not None:
+            hit["highlight"] = highlight
+        return hit
+
+    def test_bm25_leg_requests_highlight(self):
+        highlight = bm25_body("budget", 10)["highlight"]
+        assert highlight["fields"]["text"]["type"] == "unified"
+        assert highlight["encoder"] == "html"
+        assert "highlight_query" not in highlight["fields"]["text"]
+
+    def test_knn_leg_highlights_against_query_text(self):
+        assert "highlight" not in knn_body([0.1] * 768, 10)
+        highlight = knn_body([0.1] * 768, 10, query_text="budget")["highlight"]
+        assert highlight["fields"]["text"]["highlight_query"] == {
+            "match": {"text": {"query": "budget"}}
+        }
+
+    def test_highlights_are_fragments_by_default(self):
+        field = bm25_body("budget", 10)["highlight"]["fields"]["text"]
+        assert field["number_of_fragments"] > 0
+
+    def test_local_only_hits_have_no_highlights(self):
+        local = {**self._hit("b"), "_local": True}
+        fused = apply_rrf([self._hit("a")], [self._hit("a"), local])
+
+        by_id = {hit["_id"]: hit for hit in fused}
+        assert "_local" not in by_id["a"]
+        assert by_id["b"]["_local"] is True
+        assert hit_to_result(by_id["a"], 0.1).highlights == []
+        assert hit_to_result(by_id["b"], 0.1).highlights is None
+
+    def test_text_mapping_stores_offsets(self):
+        props = SEGMENTS_INDEX_BODY["mappings"]["properties"]
+        assert props["text"]["index_options"] == "offsets"
+
+    def test_rrf_keeps_highlight_from_either_leg(self):
+        marked = {"text": ["<mark>budgets</mark> approved"]}
+        fused = apply_rrf([self._hit("a")], [self._hit("a", marked), self._hit("b")])
+
+        by_id = {hit["_id"]: hit for hit in fused}
+        assert by_id["a"]["highlight"] == marked
+        assert "highlight" not in by_id["b"]
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query", return_value=[0.1] * 768)
+    def test_search_returns_highlights(self, _embed, mock_client_fn, _gen):
+        client = MagicMock()
+        mock_client_fn.return_value = client
+        client.msearch.return_value = {"responses": [
+            {"hits": {"hits": [self._hit("a", {"text": ["<mark>budgets</mark> approved"]})]}},
+            {"hits": {"hits": [self._hit("b")]}},
+        ]}
+
+        result = search("budget", limit=5)
+
+        by_id = {r.segment_id: r for r in result.results}
+        assert by_id["a"].highlights == ["<mark>budgets</mark> approved"]
+        # OpenSearch omits highlight for hits without a term match
+        assert by_id["b"].highlights == []
+        knn_request = client.msearch.call_args.kwargs["body"][3]
+        assert "highlight" in knn_request
+
+
+class TestCollapseAndFacets:
+    """Per-video collapsing and facet counts."""
+
+    def test_collapse_keeps_top_hits_per_video(self):
+        hits = [
+            _video_hit("a", "v1"),
+            _video_hit("b", "v1"),
+            _video_hit("c", "v2"),
+            _video_hit("d", "v1"),
+        ]
+        assert [h["_id"] for h in _collapse_by_video(hits, 1)] == ["a", "c"]
+        assert [h["_id"] for h in _collapse_by_video(hits, 2)] == ["a", "b", "c"]
+
+    def test_bm25_body_carries_aggs_only_with_facets(self):
+        assert "aggs" not in bm25_body("q", 10)
+        aggs = bm25_body("q", 10, facets=True)["aggs"]
+        assert set(aggs) == {"videos", "speakers", "recording_dates"}
+        assert aggs["recording_dates"]["date_histogram"]["calendar_interval"] == "month"
+
+    def test_parse_facets(self):
+        facets = _parse_facets(FACET_AGGREGATIONS)
+
+        assert facets.videos[0].value == "v1"
+        assert facets.videos[0].count == 3
+        assert facets.videos[0].label == "Council Meeting"
+        assert facets.videos[1].label is None
+        assert facets.speakers[0].value == "Alice"
+        assert facets.recording_dates[0].value == "2024-01"
+        assert _parse_facets(None) is None
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query", return_value=[0.1] * 768)
+    def test_search_collapses_and_returns_facets(self, _embed, mock_client_fn, _gen):
+        client = MagicMock()
+        mock_client_fn.return_value = client
+        bm25_hits = [_video_hit("a", "v1"), _video_hit("b", "v1"), _video_hit("c", "v2")]
+        client.msearch.return_value = {"responses": [
+            {"hits": {"hits": bm25_hits}, "aggregations": FACET_AGGREGATIONS},
+            {"hits": {"hits": []}},
+        ]}
+
+        result = search("council", limit=5, per_video=1, facets=True)
+
+        assert client.msearch.call_count == 1
+        assert [r.segment_id for r in result.results] == ["a", "c"]
+        assert result.facets.videos[0].count == 3
+        bm25_request = client.msearch.call_args.kwargs["body"][1]
+        assert "aggs" in bm25_request
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query", return_value=[0.1] * 768)
+    def test_facets_off_by_default(self, _embed, mock_client_fn, _gen):
+        client = MagicMock()
+        mock_client_fn.return_value = client
+        client.msearch.return_value = {"responses": [
+            {"hits": {"hits": [_video_hit("a", "v1")]}},
+            {"hits": {"hits": []}},
+        ]}
+
+        result = search("council", limit=5)
+
+        assert result.facets is None
+        assert "aggs" not in client.msearch.call_args.kwargs["body"][1]
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_async_opensearch_client")
+    @patch("app.services.search.embed_query", return_value=[0.1] * 768)
+    async def test_async_collapses_and_returns_facets(self, _embed, mock_client_fn, _gen):
+        client = MagicMock()
+        client.msearch = AsyncMock(return_value={"responses": [
+            {"hits": {"hits": [_video_hit("a", "v1"), _video_hit("b", "v1")]},
+             "aggregations": FACET_AGGREGATIONS},
+            {"hits": {"hits": []}},
+        ]})
+        mock_client_fn.return_value = client
+
+        result = await search_async("council", limit=5, per_video=1, facets=True)
+
+        assert [r.segment_id for r in result.results] == ["a"]
+        assert result.facets.speakers[0].value == "Alice"
+        assert "aggs" in client.msearch.call_args.kwargs["body"][1]
+
+
+class TestSearchResultCache:
+    """Repeated searches are served from cache until the index generation changes."""
+
+    def setup_method(self):
+        search_result_cache.clear()
+
+    def teardown_method(self):
+        search_result_cache.clear()
+
+    def _msearch_response(self):
+        hit = {
+            "_id": "seg1",
+            "_source": {
+                "video_id": "vid1",
+                "text": "cached text",
+                "start_time": 1.0,
+                "end_time": 2.0,
+            },
+        }
+        return {"responses": [{"hits": {"hits": [hit]}}, {"hits": {"hits": []}}]}
+
+    @patch("app.services.search.get_index_generation", return_value=3)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_repeat_query_hits_cache(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [0.1] * 768
+        mock_client_fn.return_value.msearch.return_value = self._msearch_response()
+
+        first = search("Cached text", limit=5)
+        second = search("  cached   TEXT ", limit=5)
+
+        assert first == second
+        mock_embed.assert_called_once()
+        mock_client_fn.return_value.msearch.assert_called_once()
+
+    @patch("app.services.search.get_index_generation")
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_generation_bump_invalidates(self, mock_embed, mock_client_fn, mock_gen):
+        mock_embed.return_value = [0.1] * 768
+        mock_client_fn.return_value.msearch.return_value = self._msearch_response()
+
+        mock_gen.return_value = 1
+        search("cached text", limit=5)
+        mock_gen.return_value = 2
+        search("cached text", limit=5)
+
+        assert mock_client_fn.return_value.msearch.call_count == 2
+
+    @patch("app.services.search.get_index_generation", return_value=None)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_cache_bypassed_without_generation(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [0.1] * 768
+        mock_client_fn.return_value.msearch.return_value = self._msearch_response()
+
+        search("cached text", limit=5)
+        search("cached text", limit=5)
+
+        assert mock_client_fn.return_value.msearch.call_count == 2
+        assert len(search_result_cache) == 0
+
+    @patch("app.services.search.get_index_generation", return_value=3)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_query")
+    def test_partial_response_not_cached(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [0.1] * 768
+        response = self._msearch_response()
+        response["responses"][1] = {
+            "error": {"type": "es_rejected_execution_exception"}, "status": 429,
+        }
+        mock_client_fn.return_value.msearch.return_value = response
+
+        first = search("cached text", limit=5)
+        search("cached text", limit=5)
+
+        assert first.partial is True
+        assert first.count == 1
+        assert mock_client_fn.return_value.msearch.call_count == 2
+        assert len(search_result_cache) == 0
+
+    @patch("app.services.search.get_index_generation", return_value=3)
+    @patch("app.services.search.get_opensearch_client")
+    @patch("app.services.search.embed_queries")
+    def test_batch_partial_response_not_cached(self, mock_embed, mock_client_fn, _gen):
+        mock_embed.return_value = [[0.1] * 768, [0.2] * 768]
+        ok = self._msearch_response()["responses"]
+        failed = {"error": {"type": "es_rejected_execution_exception"}, "status": 429}
+        mock_client_fn.return_value.msearch.return_value = {
+            "responses": [*ok, ok[0], failed],
+        }
+
+        first, second = search_batch(["cached text", "other text"], limit=5)
+
+        assert first.partial is False
+        assert second.partial is True
+        assert len(search_result_cache) == 1
+
+
 class TestSearchResultSchema:
     """Verify SearchResult schema fields."""
 
@@ -0,0 +1,173 @@
+"""Unit tests for cursor pagination over search results."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from opensearchpy import NotFoundError
+
+from app.schemas.search import SearchFilters
+from app.services.search_pagination import (
+    CursorExpiredError,
+    InvalidCursorError,
+    _query_fingerprint,
+    decode_cursor,
+    encode_cursor,
+    search_page,
+)
+
+
+def _hit(doc_id: str, score: float = 1.0) -> dict:
+    return {
+        "_id": doc_id,
+        "_score": score,
+        "sort": [score, doc_id],
+        "_source": {
+            "id": doc_id,
+            "video_id": "vid1",
+            "video_title": "Video",
+            "text": f"text {doc_id}",
+            "start_time": 10.0,
+            "end_time": 20.0,
+        },
+    }
+
+
+def _client() -> MagicMock:
+    client = MagicMock()
+    client.create_pit.return_value = {"pit_id": "pit-1"}
+    return client
+
+
+class TestCursorEncoding:
+
+    def test_round_trip(self):
+        state = {"fp": "abc", "pit": "p", "offset": 10}
+        assert decode_cursor(encode_cursor(state), "abc") == state
+
+    def test_rejects_other_query(self):
+        cursor = encode_cursor({"fp": "abc", "pit": "p"})
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "xyz")
+
+    def test_rejects_garbage(self):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor!!", "abc")
+
+
+class TestKeywordPagination:
+    """BM25 leg pages with a point in time plus search_after."""
+
+    @patch("app.services.search_pagination.get_opensearch_client")
+    def test_first_and_next_page(self, mock_client_fn):
+        client = _client()
+        mock_client_fn.return_value = client
+        client.search.side_effect = [
+            {"hits": {"hits": [_hit("a", 3.0), _hit("b", 2.0)]}},
+            {"hits": {"hits": [_hit("c", 1.0)]}},
+        ]
+
+        first = search_page("alembic", limit=2, mode="keyword")
+        assert [r.segment_id for r in first.results] == ["a", "b"]
+        assert first.next_cursor is not None
+        client.create_pit.assert_called_once()
+
+        body = client.search.call_args.kwargs["body"]
+        assert body["pit"]["id"] == "pit-1"
+        assert "search_after" not in body
+        assert "index" not in client.search.call_args.kwargs
+
+        second = search_page("alembic", limit=2, cursor=first.next_cursor, mode="keyword")
+        body = client.search.call_args.kwargs["body"]
+        assert body["search_after"] == [2.0, "b"]
+        assert [r.segment_id for r in second.results] == ["c"]
+        assert second.next_cursor is None
+        client.create_pit.assert_called_once()
+        client.delete_pit.assert_called_once_with(body={"pit_id": ["pit-1"]})
+
+    @patch("app.services.search_pagination.get_opensearch_client")
+    def test_expired_pit(self, mock_client_fn):
+        client = _client()
+        mock_client_fn.return_value = client
+        client.search.side_effect = NotFoundError(404, "search_context_missing_exception", {})
+        cursor = encode_cursor({"fp": _query_fingerprint("q", None, "keyword"), "pit": "old"})
+
+        with pytest.raises(CursorExpiredError):
+            search_page("q", limit=2, cursor=cursor, mode="keyword")
+
+    @patch("app.services.search_pagination.get_opensearch_client")
+    def test_cursor_bound_to_filters(self, mock_client_fn):
+        client = _client()
+        mock_client_fn.return_value = client
+        client.search.return_value = {"hits": {"hits": [_hit("a"), _hit("b")]}}
+
+        page = search_page("q", limit=2, mode="keyword")
+        with pytest.raises(InvalidCursorError):
+            search_page(
+                "q", limit=2, cursor=page.next_cursor, mode="keyword",
+                filters=SearchFilters(speakers=["Bob"]),
+            )
+
+
+class TestHybridPagination:
+    """Fused results page by offset over a fixed, PIT-pinned window."""
+
+    @patch("app.services.search_pagination.embed_query", return_value=[0.1] * 768)
+    @patch("app.services.search_pagination.get_opensearch_client")
+    def test_pages_are_disjoint_and_stable(self, mock_client_fn, _embed):
+        client = _client()
+        mock_client_fn.return_value = client
+        bm25 = [_hit(f"d{i}") for i in range(5)]
+        client.msearch.return_value = {
+            "responses": [{"hits": {"hits": bm25}}, {"hits": {"hits": []}}]
+        }
+
+        seen = []
+        cursor = None
+        for _ in range(3):
+            page = search_page("q", limit=2, cursor=cursor)
+            seen.extend(r.segment_id for r in page.results)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == ["d0", "d1", "d2", "d3", "d4"]
+        assert cursor is None
+        payload = client.msearch.call_args.kwargs["body"]
+        assert client.msearch.call_args.kwargs["index"] is None
+        assert payload[1]["pit"]["id"] == "pit-1"
+        assert payload[3]["pit"]["id"] == "pit-1"
+
+    @patch("app.services.search_pagination.embed_query", return_value=[0.1] * 768)
+    @patch("app.services.search_pagination.get_opensearch_client")
+    def test_expired_pit(self, mock_client_fn, _embed):
+        client = _client()
+        mock_client_fn.return_value = client
+        expired = {
+            "error": {
+                "type": "search_phase_execution_exception",
+                "root_cause": [{"type": "search_context_missing_exception"}],
+            },
+            "status": 404,
+        }
+        client.msearch.return_value = {"responses": [expired, expired]}
+        cursor = encode_cursor({"fp": _query_fingerprint("q", None, "hybrid"), "pit": "old"})
+
+        with pytest.raises(CursorExpiredError):
+            search_page("q", limit=2, cursor=cursor)
+        client.delete_pit.assert_not_called()
+
+    @patch("app.services.search_pagination.embed_query", return_value=[0.1] * 768)
+    @patch("app.services.search_pagination.get_opensearch_client")
+    def test_expired_pit_on_one_leg(self, mock_client_fn, _embed):
+        client = _client()
+        mock_client_fn.return_value = client
+        client.msearch.return_value = {
+            "responses": [
+                {"hits": {"hits": [_hit("a")]}},
+                {"error": {"type": "search_context_missing_exception"}, "status": 404},
+            ]
+        }
+        cursor = encode_cursor({"fp": _query_fingerprint("q", None, "hybrid"), "pit": "old"})
+
+        with pytest.raises(CursorExpiredError):
+            search_page("q", limit=2, cursor=cursor)
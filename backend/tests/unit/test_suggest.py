@@ -0,0 +1,119 @@
+"""Unit tests for search-as-you-type suggestions."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.core.opensearch import SEGMENTS_INDEX_BODY, SUGGEST_FIELD
+from app.main import app
+from app.services.suggest import (
+    SPEAKER_WEIGHT,
+    TITLE_WEIGHT,
+    build_suggest_inputs,
+    frequent_phrases,
+    suggest,
+)
+
+
+def _segment(text: str, speaker: str | None = None):
+    return SimpleNamespace(text=text, speaker=speaker)
+
+
+class TestFrequentPhrases:
+    def test_counts_repeated_phrases(self):
+        texts = [
+            "the budget committee approved the road repairs",
+            "road repairs start after the budget committee vote",
+        ]
+        phrases = dict(frequent_phrases(texts, top_n=10))
+        assert phrases["budget committee"] == 2
+        assert phrases["road repairs"] == 2
+        # Single occurrences are not suggested
+        assert "committee vote" not in phrases
+
+    def test_skips_stop_word_edges(self):
+        phrases = dict(frequent_phrases(["the budget the budget"], top_n=10))
+        assert "the budget" not in phrases
+        assert "budget the" not in phrases
+
+
+class TestBuildSuggestInputs:
+    def test_each_suggestion_stored_once_per_video(self):
+        segments = [
+            _segment("road repairs on main street", "Alice"),
+            _segment("more road repairs", "Bob"),
+            _segment("road repairs again", "Alice"),
+        ]
+
+        inputs = build_suggest_inputs("City Council", segments)
+
+        assert {"input": "City Council", "weight": TITLE_WEIGHT} in inputs[0]
+        assert {"input": "Alice", "weight": SPEAKER_WEIGHT} in inputs[0]
+        assert {"input": "Bob", "weight": SPEAKER_WEIGHT} in inputs[1]
+        assert inputs[2] == []
+        phrase = next(i for i in inputs[0] if i["input"] == "road repairs")
+        assert phrase["weight"] == 3
+
+    def test_diarization_labels_not_suggested(self):
+        segments = [
+            _segment("budget review", "SPEAKER_00"),
+            _segment("budget review", "SPEAKER_01"),
+            _segment("budget review", "Alice"),
+        ]
+
+        inputs = build_suggest_inputs("", segments)
+
+        speakers = [i["input"] for row in inputs for i in row if i["weight"] == SPEAKER_WEIGHT]
+        assert speakers == ["Alice"]
+
+    def test_no_segments(self):
+        assert build_suggest_inputs("Title", []) == []
+
+    def test_mapping_has_completion_field(self):
+        props = SEGMENTS_INDEX_BODY["mappings"]["properties"]
+        assert props[SUGGEST_FIELD]["type"] == "completion"
+
+
+class TestSuggest:
+    @patch("app.services.suggest.get_async_opensearch_client")
+    async def test_single_completion_request(self, mock_client_fn):
+        client = MagicMock()
+        client.search = AsyncMock(return_value={
+            "suggest": {"completions": [{"options": [
+                {"text": "road repairs"}, {"text": "Roadmap review"},
+            ]}]}
+        })
+        mock_client_fn.return_value = client
+
+        assert await suggest(" roa ", limit=2) == ["road repairs", "Roadmap review"]
+
+        body = client.search.call_args.kwargs["body"]
+        assert body["_source"] is False
+        completion = body["suggest"]["completions"]
+        assert completion["prefix"] == "roa"
+        assert completion["completion"]["size"] == 2
+        assert completion["completion"]["skip_duplicates"] is True
+
+    @patch("app.services.suggest.get_async_opensearch_client")
+    async def test_blank_prefix_skips_opensearch(self, mock_client_fn):
+        assert await suggest("  ") == []
+        mock_client_fn.assert_not_called()
+
+
+class TestSuggestEndpoint:
+    @patch("app.api.routes.search.suggest_service", new_callable=AsyncMock)
+    def test_returns_suggestions(self, mock_suggest):
+        mock_suggest.return_value = ["road repairs"]
+
+        resp = TestClient(app).get("/api/search/suggest", params={"q": "roa", "limit": 3})
+
+        assert resp.status_code == 200
+        assert resp.json() == {"suggestions": ["road repairs"]}
+        mock_suggest.assert_awaited_once_with("roa", limit=3)
+
+    @patch("app.api.routes.search.suggest_service", new_callable=AsyncMock)
+    def test_empty_query(self, mock_suggest):
+        resp = TestClient(app).get("/api/search/suggest", params={"q": ""})
+        assert resp.json() == {"suggestions": []}
+        mock_suggest.assert_not_called()
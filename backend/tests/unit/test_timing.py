@@ -0,0 +1,88 @@
+"""Unit tests for stage timing, Server-Timing headers and latency histograms."""
+
+import logging
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.core import timing
+from app.core.metrics import Histogram, snapshot
+from app.core.timing import log_if_slow, record_took, stage, timing_scope
+from app.main import app
+from app.schemas.search import SearchResponse
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        h = Histogram(buckets=(10, 100))
+        for value in (5, 10, 50, 500):
+            h.observe(value)
+
+        stats = h.stats()
+        assert stats["count"] == 4
+        assert stats["sum"] == 565
+        assert stats["buckets"] == {"10": 2, "100": 3, "+Inf": 4}
+
+
+class TestTimingScope:
+    def test_stages_collected_in_scope(self):
+        with timing_scope() as timings:
+            with stage("embed"):
+                pass
+            with stage("embed"):
+                pass
+            record_took("bm25", 7)
+
+        assert list(timings.stages) == ["embed"]
+        assert timings.took == {"bm25": 7}
+        assert "embed;dur=" in timings.server_timing()
+        assert "bm25-took;dur=7" in timings.server_timing()
+
+    def test_nested_scope_joins_outer(self):
+        with timing_scope() as outer:
+            with timing_scope() as inner:
+                with stage("fusion"):
+                    pass
+        assert inner is outer
+        assert "fusion" in outer.stages
+
+    def test_stage_outside_scope_feeds_histogram(self):
+        with stage("unit-test-stage"):
+            pass
+        assert snapshot()["stage_latency_ms"]["unit-test-stage"]["count"] >= 1
+
+    def test_slow_log(self, caplog):
+        with timing_scope() as timings:
+            record_took("knn", 12)
+        with patch.object(timing.settings, "SLOW_QUERY_LOG_MS", 100.0):
+            with caplog.at_level(logging.WARNING, logger="app.core.timing"):
+                log_if_slow("search", "fast query", timings, 50.0)
+                log_if_slow("search", "slow query", timings, 150.0)
+
+        assert len(caplog.records) == 1
+        assert "slow query" in caplog.records[0].getMessage()
+        assert "'knn': 12" in caplog.records[0].getMessage()
+
+
+class TestServerTimingHeader:
+    @patch("app.api.routes.search.search_service", new_callable=AsyncMock)
+    def test_search_response_has_server_timing(self, mock_search):
+        async def _search(*args, **kwargs):
+            with stage("embed"):
+                pass
+            record_took("bm25", 3)
+            return SearchResponse(count=0, results=[])
+
+        mock_search.side_effect = _search
+
+        resp = TestClient(app).get("/api/search", params={"q": "hello"})
+
+        assert resp.status_code == 200
+        assert resp.json() == {"count": 0, "results": [], "degraded": False, "partial": False, "facets": None}
+        header = resp.headers["Server-Timing"]
+        for name in ("embed;dur=", "serialize;dur=", "bm25-took;dur=3", "total;dur="):
+            assert name in header
+
+    def test_untimed_routes_have_no_header(self):
+        resp = TestClient(app).get("/")
+        assert "Server-Timing" not in resp.headers